@@ -14,7 +14,7 @@ Critical Because:
 Central integration point for Gong - without this, no Gong data can be accessed.
 
 Dependencies:
-- Requires: client
+- Requires: client, rate_limit
 - Used By: app_backend.ingestion.orchestrator, app_backend.api_bridge.server
 
 Author: Julia Evans
@@ -23,8 +23,10 @@ Date: 2025-06-20
 from .client import (
     GongAPIClient,
     GongAPIError,
-    GongRateLimitError
+    GongRateLimitError,
+    GongDeadlineExceededError
 )
+from .rate_limit import SharedRateLimiter
 
 __version__ = "1.0.0"
 __author__ = "CS-Ascension Team"
@@ -32,5 +34,7 @@ __author__ = "CS-Ascension Team"
 __all__ = [
     'GongAPIClient',
     'GongAPIError',
-    'GongRateLimitError'
+    'GongRateLimitError',
+    'GongDeadlineExceededError',
+    'SharedRateLimiter'
 ]
\ No newline at end of file
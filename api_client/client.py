@@ -22,6 +22,7 @@ Date: 2025-06-20
 """
 import json
 import logging
+import threading
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -51,6 +52,11 @@ class GongRateLimitError(Exception):
     pass
 
 
+class GongDeadlineExceededError(GongAPIError):
+    """Raised when a request would start after the caller's deadline"""
+    pass
+
+
 class GongAPIClient:
     """
     Gong API client for data extraction using session tokens.
@@ -76,19 +82,26 @@ class GongAPIClient:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["HEAD", "GET", "OPTIONS"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Pool sized for concurrent extraction stages sharing this client
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=10, pool_maxsize=32)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
-        # Rate limiting
+        # Rate limiting (shared by all threads using this client)
+        self._rate_limit_lock = threading.Lock()
         self.last_request_time = 0
         self.min_request_interval = 0.1  # 100ms between requests
         self.rate_limit_remaining = 1000
         self.rate_limit_reset = datetime.now()
+        self.rate_limiter = None  # Optional SharedRateLimiter replacing per-client spacing
+        self.session_pool = None  # Optional SessionPool rotating requests across identities
         
         # Request timeout
         self.timeout = 30
 
+        # Per-thread request context (e.g. extraction deadlines, bytes received)
+        self._request_context = threading.local()
+
         # Session-related properties (set when session is provided)
         self.base_url = None
         self.user_email = None
@@ -112,6 +125,60 @@ class GongAPIClient:
 
         logger.info(f"Session set for user: {session.user_email}")
     
+    def set_rate_limiter(self, rate_limiter: Optional[Any]) -> None:
+        """
+        Share request spacing with other clients (e.g. backfill worker processes).
+
+        Args:
+            rate_limiter: SharedRateLimiter for the session's cell, or None to
+                go back to this client's own min_request_interval
+        """
+        self.rate_limiter = rate_limiter
+    
+    def set_session_pool(self, session_pool: Optional[Any]) -> None:
+        """
+        Spread requests across several identities of the same workspace.
+
+        While set, every request uses the pool's healthiest session instead
+        of the current session, spacing is tracked per identity rather than
+        per client, and a 401/429 is retried once on each other usable
+        identity before it is raised.
+
+        Args:
+            session_pool: authentication.SessionPool, or None to go back to the current session
+        """
+        self.session_pool = session_pool
+        if session_pool is not None and len(session_pool):
+            self.base_url = self.auth_manager.get_base_url(session_pool.sessions()[0])
+            self.cell_id = session_pool.cell_id
+            self.workspace_id = session_pool.workspace_id
+    
+    def set_request_deadline(self, deadline: Optional[Any]) -> None:
+        """
+        Set the deadline for requests made from the current thread.
+
+        While set, request timeouts are clamped to the time remaining and
+        requests that would start after the deadline raise
+        GongDeadlineExceededError. Other threads sharing the client are
+        unaffected.
+
+        Args:
+            deadline: Object with remaining() -> seconds (extraction.Deadline), or None to clear
+        """
+        self._request_context.deadline = deadline
+
+    def get_request_deadline(self) -> Optional[Any]:
+        """Get the deadline for requests made from the current thread"""
+        return getattr(self._request_context, 'deadline', None)
+
+    def get_bytes_received(self) -> int:
+        """Total response bytes received by requests made from the current thread"""
+        return getattr(self._request_context, 'bytes_received', 0)
+
+    def add_bytes_received(self, count: int) -> None:
+        """Credit bytes received on other threads (e.g. a worker pool) to the current thread"""
+        self._request_context.bytes_received = self.get_bytes_received() + count
+
     def _make_request(
         self, 
         method: str, 
@@ -136,74 +203,142 @@ class GongAPIClient:
         Raises:
             GongAPIError: If request fails
             GongRateLimitError: If rate limited
-        """
-        # Rate limiting
-        self._handle_rate_limiting()
-        
-        # Get session and headers
-        session = self.auth_manager.get_current_session()
-        if not session:
-            raise GongAuthenticationError("No active session")
-        
-        headers = self.auth_manager.get_session_headers(session)
-        base_url = self.auth_manager.get_base_url(session)
-        
-        # Build full URL
-        if endpoint.startswith('http'):
-            url = endpoint
-        else:
-            url = f"{base_url}{endpoint}"
-        
-        # Add JSON content type if sending JSON
-        if json_data:
-            headers['Content-Type'] = 'application/json'
-        
-        try:
-            logger.debug(f"Making {method} request to {url}")
-            
-            response = self.session.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                data=data,
-                json=json_data,
-                timeout=self.timeout
-            )
-            
-            # Update rate limiting info
-            self._update_rate_limit_info(response)
-            
-            # Handle response
-            if response.status_code == 429:
-                raise GongRateLimitError("Rate limit exceeded")
-            
-            if response.status_code == 401:
-                raise GongAuthenticationError("Authentication failed - session may be expired")
-            
-            if not response.ok:
-                raise GongAPIError(f"API request failed: {response.status_code} - {response.text}")
-            
-            # Parse JSON response
+            GongDeadlineExceededError: If the thread's request deadline has passed
+        """
+        # Without a pool there is one identity, so one attempt
+        attempts = max(1, self.session_pool.usable_count()) if self.session_pool is not None else 1
+        
+        for attempt in range(attempts):
+            pooled = None
+            recorded = False
+            deadline = self.get_request_deadline()
+            if self.session_pool is not None:
+                # Per-identity spacing replaces this client's own spacing
+                pooled, delay = self.session_pool.acquire()
             try:
-                return response.json()
-            except json.JSONDecodeError:
-                # Some endpoints return non-JSON responses
-                return {"text": response.text, "status_code": response.status_code}
-                
-        except requests.exceptions.RequestException as e:
-            raise GongAPIError(f"Request failed: {e}")
+                if pooled is not None:
+                    if deadline is not None:
+                        # Don't sleep past the deadline; the check below raises instead
+                        delay = min(delay, max(0.0, deadline.remaining()))
+                    if delay > 0:
+                        time.sleep(delay)
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.wait()
+                else:
+                    # Rate limiting
+                    self._handle_rate_limiting()
+
+                timeout = self.timeout
+                if deadline is not None:
+                    remaining = deadline.remaining()
+                    if remaining <= 0:
+                        raise GongDeadlineExceededError(f"Deadline exceeded before {method} {endpoint}")
+                    timeout = min(timeout, remaining)
+
+                # Get session and headers
+                session = pooled.session if pooled is not None else self.auth_manager.get_current_session()
+                if not session:
+                    raise GongAuthenticationError("No active session")
+
+                headers = self.auth_manager.get_session_headers(session)
+                base_url = self.auth_manager.get_base_url(session)
+
+                # Build full URL
+                if endpoint.startswith('http'):
+                    url = endpoint
+                else:
+                    url = f"{base_url}{endpoint}"
+
+                # Add JSON content type if sending JSON
+                if json_data:
+                    headers['Content-Type'] = 'application/json'
+
+                logger.debug(f"Making {method} request to {url}")
+
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    data=data,
+                    json=json_data,
+                    timeout=timeout
+                )
+
+                if pooled is not None:
+                    self.session_pool.record(pooled, response.status_code, response.headers)
+                    recorded = True
+                    if response.status_code in (401, 429) and attempt + 1 < attempts:
+                        logger.info(f"{response.status_code} for {session.user_email}; "
+                                    f"retrying on another pooled session")
+                        continue
+
+                # Update rate limiting info
+                self._update_rate_limit_info(response)
+                self._record_bytes_received(response)
+
+                # Handle response
+                if response.status_code == 429:
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.penalize(self._retry_after(response))
+                    raise GongRateLimitError("Rate limit exceeded")
+
+                if response.status_code == 401:
+                    raise GongAuthenticationError("Authentication failed - session may be expired")
+
+                if not response.ok:
+                    raise GongAPIError(f"API request failed: {response.status_code} - {response.text}")
+
+                # Parse JSON response
+                try:
+                    return response.json()
+                except json.JSONDecodeError:
+                    # Some endpoints return non-JSON responses
+                    return {"text": response.text, "status_code": response.status_code}
+
+            except requests.exceptions.RequestException as e:
+                raise GongAPIError(f"Request failed: {e}")
+            finally:
+                # Release the pooled identity however the attempt ended
+                if pooled is not None and not recorded:
+                    self.session_pool.record(pooled)
+    
+    def _record_bytes_received(self, response: requests.Response) -> None:
+        """Add a response body size to the current thread's byte counter"""
+        try:
+            size = len(response.content)
+        except TypeError:
+            return
+        self.add_bytes_received(size)
     
     def _handle_rate_limiting(self) -> None:
-        """Handle rate limiting between requests"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
+        """
+        Handle rate limiting between requests.
+
+        Each caller reserves the next request slot under a lock, so concurrent
+        threads are spaced min_request_interval apart instead of racing. With a
+        shared rate limiter the slot is reserved across processes instead.
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait()
+            return
+
+        with self._rate_limit_lock:
+            current_time = time.time()
+            next_slot = max(current_time, self.last_request_time + self.min_request_interval)
+            self.last_request_time = next_slot
+
+        sleep_time = next_slot - current_time
+        if sleep_time > 0:
             time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+    
+    @staticmethod
+    def _retry_after(response: requests.Response, default: float = 1.0) -> float:
+        """Seconds to back off after a 429, from the Retry-After header when present"""
+        try:
+            return max(0.0, float(response.headers.get('Retry-After', default)))
+        except (TypeError, ValueError):
+            return default
     
     def _update_rate_limit_info(self, response: requests.Response) -> None:
         """Update rate limiting information from response headers"""
@@ -528,29 +663,85 @@ class GongAPIClient:
                                     json_data=data)
         return response
     
-    def get_user_stats(self, metric: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+    def get_user_stats(self, metric: str, user_id: Optional[str] = None,
+                       period: Optional[str] = None) -> Dict[str, Any]:
         """
         Get user statistics for a specific metric.
         
         Args:
             metric: Metric name
             user_id: Optional user ID (defaults to current user)
+            period: Optional time period ('week', 'month', 'quarter')
             
         Returns:
             User statistics data
         """
-        logger.info(f"Fetching user stats for {metric} (user_id={user_id})")
+        logger.info(f"Fetching user stats for {metric} (user_id={user_id}, period={period})")
         
         data = {
             'metric': metric
         }
         if user_id:
             data['user_id'] = user_id
+        if period:
+            data['period'] = period
         
         response = self._make_request('POST', f'/stats/ajax/v2/team/activity/users/{metric}',
                                     json_data=data)
         return response
     
+    def get_topic_models(self, period: str = 'week') -> Dict[str, Any]:
+        """
+        Get team topic models (topics discussed across calls).
+        
+        Args:
+            period: Time period ('week', 'month', 'quarter')
+            
+        Returns:
+            Topic model data
+        """
+        logger.info(f"Fetching topic models ({period})")
+        
+        response = self._make_request('POST', '/stats/ajax/v2/team/topics/topicModels',
+                                    json_data={'period': period})
+        return response
+    
+    def get_trackers(self, period: str = 'week') -> Dict[str, Any]:
+        """
+        Get team tracker (keyword) statistics.
+        
+        Args:
+            period: Time period ('week', 'month', 'quarter')
+            
+        Returns:
+            Tracker statistics data
+        """
+        logger.info(f"Fetching trackers ({period})")
+        
+        response = self._make_request('POST', '/stats/ajax/v2/team/trackers/all',
+                                    json_data={'period': period})
+        return response
+    
+    def get_user_trackers(self, period: str = 'week', user_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get tracker statistics per user.
+        
+        Args:
+            period: Time period ('week', 'month', 'quarter')
+            user_id: Optional user ID (defaults to all users)
+            
+        Returns:
+            Per-user tracker statistics data
+        """
+        logger.info(f"Fetching user trackers ({period}, user_id={user_id})")
+        
+        data = {'period': period}
+        if user_id:
+            data['user_id'] = user_id
+        
+        response = self._make_request('POST', '/stats/ajax/v2/team/trackers/users', json_data=data)
+        return response
+    
     # ============================================================================
     # Utility Methods
     # ============================================================================
@@ -0,0 +1,121 @@
+"""
+Module: rate_limit
+Type: Internal Module
+
+Purpose:
+Per-cell request rate limit shared across processes. The next free request
+slot for a cell is kept in a small state file guarded by an exclusive file
+lock, so every process (and thread) talking to the same cell is spaced
+min_request_interval apart.
+
+Data Flow:
+- Input: Cell ID, minimum request interval, optional state directory
+- Processing: Lock file → read next slot → reserve slot → write back
+- Output: Time to wait before the caller's request
+
+Critical Because:
+Each backfill worker process has its own GongAPIClient; without a shared
+limit their per-client spacing adds up and trips 429s for the whole cell.
+
+Dependencies:
+- Requires: fcntl (POSIX; falls back to a per-process lock elsewhere), struct, tempfile
+- Used By: api_client.GongAPIClient, extraction.backfill
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import logging
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: slots are only coordinated within this process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_SLOT = struct.Struct('<d')
+
+# Serializes threads of one process before they take the file lock
+_process_locks = {}
+_process_locks_guard = threading.Lock()
+
+
+def _process_lock(path: str) -> threading.Lock:
+    with _process_locks_guard:
+        return _process_locks.setdefault(path, threading.Lock())
+
+
+class SharedRateLimiter:
+    """
+    Cross-process request spacing for one Gong cell.
+
+    Instances only hold the state file path and interval, so they can be
+    pickled into worker processes; every instance for the same cell and
+    directory shares one limit.
+    """
+
+    def __init__(self, cell_id: str, min_request_interval: float = 0.1,
+                 directory: Optional[Union[str, Path]] = None):
+        """
+        Create a limiter for a cell.
+
+        Args:
+            cell_id: Gong cell the requests go to (e.g. us-12345)
+            min_request_interval: Seconds between requests across all processes
+            directory: Directory for the state file (default: system temp)
+        """
+        if min_request_interval < 0:
+            raise ValueError("min_request_interval must be non-negative")
+        self.cell_id = cell_id
+        self.min_request_interval = min_request_interval
+        directory = Path(directory) if directory is not None else Path(tempfile.gettempdir())
+        directory.mkdir(parents=True, exist_ok=True)
+        safe_cell = re.sub(r'[^A-Za-z0-9_.-]', '_', cell_id)
+        self.path = directory / f"gong_rate_limit_{safe_cell}.slot"
+        if fcntl is None:
+            logger.warning("fcntl unavailable; rate limit is only shared within this process")
+
+    def _update(self, update) -> float:
+        """Store update(reserved slot, now) as the next slot under the lock; returns the reserved slot"""
+        with _process_lock(str(self.path)):
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                raw = os.read(fd, _SLOT.size)
+                next_slot = _SLOT.unpack(raw)[0] if len(raw) == _SLOT.size else 0.0
+                now = time.time()
+                reserved = max(now, next_slot)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, _SLOT.pack(update(reserved, now)))
+                return reserved
+            finally:
+                os.close(fd)  # Closing releases the flock
+
+    def reserve(self) -> float:
+        """
+        Reserve the cell's next request slot.
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        reserved = self._update(lambda slot, now: slot + self.min_request_interval)
+        return max(0.0, reserved - time.time())
+
+    def wait(self) -> None:
+        """Reserve a slot and sleep until it arrives"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def penalize(self, seconds: float) -> None:
+        """Push the cell's next slot back (e.g. after a 429 with Retry-After)"""
+        self._update(lambda slot, now: max(slot, now + seconds))
@@ -14,7 +14,7 @@ Critical Because:
 Central integration point for Gong - without this, no Gong data can be accessed.
 
 Dependencies:
-- Requires: auth_manager
+- Requires: auth_manager, har_compaction, har_stream, harvest, jwt_cache, session_cache, session_pool, session_store, source_cache
 - Used By: app_backend.ingestion.orchestrator, app_backend.api_bridge.server
 
 Author: Julia Evans
@@ -25,6 +25,14 @@ from .auth_manager import (
     GongAuthenticationError,
     GongSessionExpiredError
 )
+from .har_compaction import HARCompactionResult, compact_har, compact_entry
+from .har_stream import HARStreamError, iter_har_entries, open_har
+from .harvest import HarvestedSession, find_session_sources, harvest_session_sources, rank_sessions
+from .jwt_cache import JWTDecodeCache
+from .session_cache import SessionCache
+from .session_pool import PooledSession, SessionPool
+from .session_store import SessionStore, SessionStoreError, generate_store_key
+from .source_cache import SessionSourceCache, SourceFingerprint, source_fingerprint
 
 __version__ = "1.0.0"
 __author__ = "CS-Ascension Team"
@@ -32,5 +40,25 @@ __author__ = "CS-Ascension Team"
 __all__ = [
     'GongAuthenticationManager',
     'GongAuthenticationError', 
-    'GongSessionExpiredError'
-]
\ No newline at end of file
+    'GongSessionExpiredError',
+    'HARCompactionResult',
+    'compact_har',
+    'compact_entry',
+    'HARStreamError',
+    'iter_har_entries',
+    'open_har',
+    'HarvestedSession',
+    'find_session_sources',
+    'harvest_session_sources',
+    'rank_sessions',
+    'JWTDecodeCache',
+    'SessionCache',
+    'PooledSession',
+    'SessionPool',
+    'SessionStore',
+    'SessionStoreError',
+    'generate_store_key',
+    'SessionSourceCache',
+    'SourceFingerprint',
+    'source_fingerprint'
+]
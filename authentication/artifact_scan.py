@@ -0,0 +1,120 @@
+"""
+Module: artifact_scan
+Type: Internal Module
+
+Purpose:
+Single-pass collection of Gong session artifacts. Classifies cookie names
+(HAR) and artifact types (godcapture analysis) through precomputed,
+memoized lookups and gathers JWT tokens and session cookies together, so
+every extraction input is walked once.
+
+Data Flow:
+- Input: HAR cookies or analysis artifacts, one at a time
+- Processing: CookieClassifier (exact JWT names, one compiled pattern for
+              session-name substrings, memo per name) → ArtifactScan
+              (dedupe JWTs by value before building tokens, keep the last
+              value of each session cookie)
+- Output: Unique GongAuthenticationTokens and a session cookie dict
+
+Critical Because:
+JWTs and session cookies were collected in separate walks over the HAR,
+and every cookie was tested against each session cookie name in turn.
+
+Dependencies:
+- Requires: re
+- Used By: auth_manager.GongAuthenticationManager
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+JWT_COOKIE = 'jwt'
+SESSION_COOKIE = 'session'
+
+# Analysis artifact types are 'cookie_<kind>'
+ANALYSIS_JWT_TYPES = ('last_login_jwt', 'cell_jwt')
+ANALYSIS_SESSION_TYPES = ('gong_session', 'aws_alb', 'aws_albtg', 'gong_user_id', 'gong_group_id')
+
+# Upper bound on memoized cookie names, for captures with unbounded name churn
+MAX_CLASSIFIED_NAMES = 4096
+
+
+class CookieClassifier:
+    """
+    Maps a cookie name to JWT_COOKIE, SESSION_COOKIE or None.
+
+    JWT cookies match by exact name; session cookies match when any
+    session cookie name occurs in the name (so AWSALBCORS counts as
+    AWSALB). Both checks are compiled once and each name is classified once.
+    """
+
+    def __init__(self, jwt_cookie_names: Iterable[str], session_cookie_names: Iterable[str]):
+        self.jwt_cookie_names = frozenset(jwt_cookie_names)
+        session_cookie_names = tuple(session_cookie_names)
+        self._session_pattern = (re.compile('|'.join(map(re.escape, session_cookie_names)))
+                                 if session_cookie_names else None)
+        self._kinds: Dict[str, Optional[str]] = {}
+        self._artifact_kinds = {f'cookie_{kind}': JWT_COOKIE for kind in ANALYSIS_JWT_TYPES}
+        self._artifact_kinds.update({f'cookie_{kind}': SESSION_COOKIE for kind in ANALYSIS_SESSION_TYPES})
+
+    def classify(self, name: str) -> Optional[str]:
+        """Kind of a HAR cookie name"""
+        try:
+            return self._kinds[name]
+        except KeyError:
+            pass
+        if name in self.jwt_cookie_names:
+            kind = JWT_COOKIE
+        elif self._session_pattern is not None and self._session_pattern.search(name):
+            kind = SESSION_COOKIE
+        else:
+            kind = None
+        if len(self._kinds) < MAX_CLASSIFIED_NAMES:
+            self._kinds[name] = kind
+        return kind
+
+    def classify_artifact(self, artifact_type: str) -> Optional[str]:
+        """Kind of an analysis artifact type (e.g. 'cookie_cell_jwt')"""
+        return self._artifact_kinds.get(artifact_type)
+
+
+class ArtifactScan:
+    """
+    Accumulates JWT tokens and session cookies from one extraction input.
+
+    A JWT value is handed to its token builder only the first time it is
+    seen, since the same token rides on most requests of a capture.
+    """
+
+    def __init__(self):
+        self.session_cookies: Dict[str, str] = {}
+        self.items_scanned = 0
+        self._tokens: Dict[str, Any] = {}  # raw token → GongAuthenticationToken
+        self._seen_token_values: Set[str] = set()
+        self._unexpired_token_types: Set[str] = set()
+
+    def add_jwt(self, token_value: str, build: Callable[[Any], Optional[Any]], source: Any) -> None:
+        """Record a JWT occurrence; build(source) makes its token (or None) on first sight"""
+        if token_value in self._seen_token_values:
+            return
+        self._seen_token_values.add(token_value)
+        token = build(source)
+        if token is not None:
+            self._tokens[token.raw_token] = token
+            if not token.is_expired:
+                self._unexpired_token_types.add(token.token_type)
+
+    def add_session_cookie(self, name: str, value: str) -> None:
+        self.session_cookies[name] = value
+
+    @property
+    def tokens(self) -> List[Any]:
+        """Unique tokens in first-seen order"""
+        return list(self._tokens.values())
+
+    def is_sufficient(self, jwt_cookie_names: Iterable[str], required_session_cookie_names: Iterable[str]) -> bool:
+        """True once every JWT cookie name has an unexpired token and the required session cookies are set"""
+        return (all(name in self._unexpired_token_types for name in jwt_cookie_names)
+                and all(self.session_cookies.get(name) for name in required_session_cookie_names))
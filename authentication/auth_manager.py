@@ -14,7 +14,7 @@ Critical Because:
 Central integration point for Gong - without this, no Gong data can be accessed.
 
 Dependencies:
-- Requires: logging, data_models, decoders.jwt_decoder, _godcapture.core.har_compression, gzip
+- Requires: logging, data_models, decoders.jwt_decoder, artifact_scan, har_compaction, har_stream, harvest, jwt_cache, session_cache, session_store, source_cache
 - Used By: app_backend.ingestion.orchestrator, app_backend.api_bridge.server
 
 Author: Julia Evans
@@ -23,9 +23,10 @@ Date: 2025-06-20
 import json
 import logging
 import sys
+from contextlib import closing
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 
 # Import data models
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -37,6 +38,15 @@ from data_models import (
 # Import JWT decoder from _godcapture
 from app_backend.agent_tools._godcapture.decoders.jwt_decoder import JWTDecoder
 
+from .artifact_scan import JWT_COOKIE, SESSION_COOKIE, ArtifactScan, CookieClassifier
+from .har_compaction import HARCompactionResult, compact_har
+from .har_stream import HARStreamError, iter_har_entries
+from .harvest import HarvestedSession, find_session_sources, harvest_session_sources, rank_sessions
+from .jwt_cache import JWTDecodeCache
+from .session_cache import DEFAULT_MAX_CACHED_SESSIONS, SessionCache
+from .session_store import SessionStore
+from .source_cache import SessionSourceCache, SourceFingerprint
+
 logger = logging.getLogger(__name__)
 
 
@@ -58,11 +68,27 @@ class GongAuthenticationManager:
     Validates JWT tokens and manages session state.
     """
     
-    def __init__(self):
-        """Initialize the authentication manager"""
+    def __init__(self, source_cache: Optional[SessionSourceCache] = None,
+                 jwt_cache: Optional[JWTDecodeCache] = None,
+                 max_cached_sessions: int = DEFAULT_MAX_CACHED_SESSIONS,
+                 session_store: Optional[SessionStore] = None):
+        """
+        Initialize the authentication manager
+        
+        Args:
+            source_cache: Optional persistent cache of sessions keyed by source file fingerprint
+            jwt_cache: Decoded-JWT LRU (default: a new one per manager; pass one
+                instance to share decodes across managers)
+            max_cached_sessions: Sessions kept in session_cache before LRU eviction
+            session_store: Optional on-disk store shared with sibling processes;
+                refreshes go through it so each identity is refreshed once
+        """
         self.jwt_decoder = JWTDecoder()
+        self.jwt_cache = jwt_cache if jwt_cache is not None else JWTDecodeCache()
         self.current_session: Optional[GongSession] = None
-        self.session_cache: Dict[str, GongSession] = {}
+        self.session_cache = SessionCache(max_cached_sessions)
+        self.source_cache = source_cache
+        self.session_store = session_store
         
         # Gong-specific patterns from HAR analysis
         self.gong_domains = [
@@ -86,13 +112,31 @@ class GongAuthenticationManager:
             'ajs_user_id',
             'ajs_group_id'
         ]
+        
+        # Session cookies that, with an unexpired token per JWT cookie name,
+        # are enough to stop scanning a HAR early. All of session_cookie_names,
+        # so an early stop never drops a cookie a full scan would return;
+        # captures missing any of them are scanned to the end.
+        self.required_session_cookie_names = list(self.session_cookie_names)
+        
+        # Built from the name lists above on first scan
+        self._classifier: Optional[CookieClassifier] = None
+        self._classifier_key: Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]] = None
     
-    def extract_session_from_har(self, har_file_path: Path) -> GongSession:
+    def extract_session_from_har(self, har_file_path: Path, early_exit: bool = True) -> GongSession:
         """
         Extract Gong session from HAR capture file.
         
+        Entries are streamed one at a time (plain or gzip-compressed) and
+        scanned once for JWTs and session cookies together; with early_exit
+        the scan stops at the first entry after which _has_sufficient_artifacts holds.
+        A cookie set more than once keeps its latest value among the entries
+        read, so a session cookie rotated after the stopping point is only
+        picked up with early_exit=False.
+        
         Args:
             har_file_path: Path to HAR file from _godcapture
+            early_exit: Stop reading once unexpired JWTs and session cookies are found
             
         Returns:
             GongSession with extracted authentication data
@@ -102,61 +146,23 @@ class GongAuthenticationManager:
         """
         logger.info(f"Extracting Gong session from HAR: {har_file_path}")
         
-        # Use _godcapture's load_har which handles compression automatically
+        cached_session, fingerprint = self._load_cached_session(har_file_path)
+        if cached_session is not None:
+            return cached_session
+        
+        # Stream entries instead of loading the whole capture; response bodies are never kept
         try:
-            # Import here to avoid circular dependency
-            import sys
-            from pathlib import Path
-            sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-            from _godcapture.core.har_compression import load_har
-            har_data = load_har(har_file_path)
+            with closing(iter_har_entries(har_file_path)) as har_entries:
+                scan = self._scan_har_stream(har_entries, early_exit=early_exit)
         except FileNotFoundError:
             raise GongAuthenticationError(f"HAR file not found: {har_file_path}")
-        except ImportError:
-            # Fallback to standard loading if _godcapture not available
-            import gzip
-            if har_file_path.suffix == '.gz' or har_file_path.name.endswith('.har.gz'):
-                with gzip.open(har_file_path, 'rt', encoding='utf-8') as f:
-                    har_data = json.load(f)
-            else:
-                with open(har_file_path, 'r', encoding='utf-8') as f:
-                    har_data = json.load(f)
         except Exception as e:
             raise GongAuthenticationError(f"Failed to load HAR file: {e}")
         
-        entries = har_data.get('log', {}).get('entries', [])
-        
-        # Extract authentication artifacts
-        jwt_tokens = self._extract_jwt_tokens(entries)
-        session_cookies = self._extract_session_cookies(entries)
-        user_info = self._extract_user_info(jwt_tokens)
-        
-        if not jwt_tokens:
-            raise GongAuthenticationError("No JWT tokens found in HAR data")
-        
-        if not user_info:
-            raise GongAuthenticationError("No user information found in JWT tokens")
-        
-        # Create session
-        session = GongSession(
-            session_id=f"gong_session_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            user_email=user_info['email'],
-            cell_id=user_info['cell_id'],
-            company_id=user_info.get('company_id'),
-            workspace_id=user_info.get('workspace_id'),
-            authentication_tokens=jwt_tokens,
-            session_cookies=session_cookies,
-            created_at=datetime.now(),
-            last_activity=datetime.now(),
-            is_active=True
-        )
-        
-        # Validate session
-        self._validate_session(session)
+        logger.debug(f"Scanned {scan.items_scanned} HAR entries")
+        session = self._build_session(scan, 'gong_session', "HAR data")
         
-        # Cache session
-        self.current_session = session
-        self.session_cache[session.session_id] = session
+        self._save_cached_session(fingerprint, session)
         
         logger.info(f"Successfully extracted Gong session for {session.user_email}")
         logger.info(f"Cell ID: {session.cell_id}, Tokens: {len(session.authentication_tokens)}")
@@ -180,56 +186,13 @@ class GongAuthenticationManager:
 
         return self._extract_session_from_artifacts(analysis_data['artifacts'])
 
-    def _extract_session_from_artifacts(self, artifacts: List[Dict[str, Any]]) -> GongSession:
+    def _extract_session_from_artifacts(self, artifacts: List[Dict[str, Any]],
+                                        session_prefix: str = 'gong_artifacts',
+                                        source_label: str = 'artifacts') -> GongSession:
         """Extract session from artifacts list"""
-        jwt_tokens = []
-        session_cookies = {}
-
-        for artifact in artifacts:
-            if artifact.get('type', '').startswith('cookie_'):
-                cookie_type = artifact['type'].replace('cookie_', '')
-
-                if cookie_type in ['last_login_jwt', 'cell_jwt']:
-                    # Process JWT token
-                    jwt_token = self._process_jwt_artifact(artifact)
-                    if jwt_token:
-                        jwt_tokens.append(jwt_token)
+        session = self._build_session(self._scan_artifacts(artifacts), session_prefix, source_label)
 
-                elif cookie_type in ['gong_session', 'aws_alb', 'aws_albtg', 'gong_user_id', 'gong_group_id']:
-                    # Process session cookie
-                    session_cookies[artifact.get('name', cookie_type)] = artifact.get('value', '')
-
-        if not jwt_tokens:
-            raise GongAuthenticationError("No JWT tokens found in artifacts")
-
-        # Extract user info from JWT tokens
-        user_info = self._extract_user_info(jwt_tokens)
-
-        if not user_info:
-            raise GongAuthenticationError("No user information found in JWT tokens")
-
-        # Create session
-        session = GongSession(
-            session_id=f"gong_artifacts_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            user_email=user_info['email'],
-            cell_id=user_info['cell_id'],
-            company_id=user_info.get('company_id'),
-            workspace_id=user_info.get('workspace_id'),
-            authentication_tokens=jwt_tokens,
-            session_cookies=session_cookies,
-            created_at=datetime.now(),
-            last_activity=datetime.now(),
-            is_active=True
-        )
-
-        # Validate session
-        self._validate_session(session)
-
-        # Cache session
-        self.current_session = session
-        self.session_cache[session.session_id] = session
-
-        logger.info(f"Successfully extracted Gong session from artifacts for {session.user_email}")
+        logger.info(f"Successfully extracted Gong session from {source_label} for {session.user_email}")
 
         return session
 
@@ -247,33 +210,34 @@ class GongAuthenticationManager:
 
         if not analysis_file_path.exists():
             raise GongAuthenticationError(f"Analysis file not found: {analysis_file_path}")
+        
+        cached_session, fingerprint = self._load_cached_session(analysis_file_path)
+        if cached_session is not None:
+            return cached_session
 
         # Load analysis data
         with open(analysis_file_path, 'r', encoding='utf-8') as f:
             analysis_data = json.load(f)
         
-        artifacts = analysis_data.get('artifacts', [])
+        session = self._extract_session_from_artifacts(
+            analysis_data.get('artifacts', []), 'gong_analysis', "analysis data"
+        )
         
-        # Extract JWT tokens from artifacts
-        jwt_tokens = []
-        session_cookies = {}
+        self._save_cached_session(fingerprint, session)
         
-        for artifact in artifacts:
-            if artifact.get('type', '').startswith('cookie_'):
-                cookie_type = artifact['type'].replace('cookie_', '')
-                
-                if cookie_type in ['last_login_jwt', 'cell_jwt']:
-                    # Process JWT token
-                    jwt_token = self._process_jwt_artifact(artifact)
-                    if jwt_token:
-                        jwt_tokens.append(jwt_token)
-                
-                elif cookie_type in ['gong_session', 'aws_alb', 'aws_albtg', 'gong_user_id', 'gong_group_id']:
-                    # Process session cookie
-                    session_cookies[artifact.get('name', cookie_type)] = artifact.get('value', '')
+        return session
+    
+    def _build_session(self, scan: ArtifactScan, session_prefix: str, source_label: str) -> GongSession:
+        """
+        Turn a finished scan into a validated session and make it current.
         
+        Raises:
+            GongAuthenticationError: If the scan found no usable JWT
+            GongSessionExpiredError: If every token has expired
+        """
+        jwt_tokens = scan.tokens
         if not jwt_tokens:
-            raise GongAuthenticationError("No JWT tokens found in analysis data")
+            raise GongAuthenticationError(f"No JWT tokens found in {source_label}")
         
         # Extract user info from JWT tokens
         user_info = self._extract_user_info(jwt_tokens)
@@ -283,13 +247,13 @@ class GongAuthenticationManager:
         
         # Create session
         session = GongSession(
-            session_id=f"gong_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            session_id=f"{session_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
             user_email=user_info['email'],
             cell_id=user_info['cell_id'],
             company_id=user_info.get('company_id'),
             workspace_id=user_info.get('workspace_id'),
             authentication_tokens=jwt_tokens,
-            session_cookies=session_cookies,
+            session_cookies=scan.session_cookies,
             created_at=datetime.now(),
             last_activity=datetime.now(),
             is_active=True
@@ -302,60 +266,90 @@ class GongAuthenticationManager:
         self.current_session = session
         self.session_cache[session.session_id] = session
         
-        logger.info(f"Successfully extracted Gong session from analysis for {session.user_email}")
-        
         return session
     
-    def _extract_jwt_tokens(self, har_entries: List[Dict]) -> List[GongAuthenticationToken]:
-        """Extract JWT tokens from HAR entries"""
-        jwt_tokens = []
+    def _load_cached_session(self, source_path: Path) -> Tuple[Optional[GongSession], Optional[SourceFingerprint]]:
+        """
+        Look up source_path in the source cache.
         
-        for entry in har_entries:
-            request = entry.get('request', {})
-            response = entry.get('response', {})
-            
-            # Check request cookies
-            for cookie in request.get('cookies', []):
-                if cookie.get('name') in self.jwt_cookie_names:
-                    jwt_token = self._process_jwt_cookie(cookie)
-                    if jwt_token:
-                        jwt_tokens.append(jwt_token)
-            
-            # Check response cookies
-            for cookie in response.get('cookies', []):
-                if cookie.get('name') in self.jwt_cookie_names:
-                    jwt_token = self._process_jwt_cookie(cookie)
-                    if jwt_token:
-                        jwt_tokens.append(jwt_token)
-        
-        # Remove duplicates based on token value
-        unique_tokens = {}
-        for token in jwt_tokens:
-            unique_tokens[token.raw_token] = token
+        Returns:
+            (cached session or None, fingerprint to save a fresh extraction under or None)
+        """
+        if self.source_cache is None:
+            return None, None
         
-        return list(unique_tokens.values())
+        try:
+            fingerprint = self.source_cache.fingerprint(source_path)
+        except OSError:
+            # Let the extraction path report missing or unreadable sources
+            return None, None
+        
+        session = self.source_cache.load(fingerprint)
+        if session is not None:
+            self.current_session = session
+            self.session_cache[session.session_id] = session
+            logger.info(f"Loaded cached Gong session for {session.user_email} from {source_path}")
+        return session, fingerprint
+    
+    def _save_cached_session(self, fingerprint: Optional[SourceFingerprint], session: GongSession) -> None:
+        """Store a freshly extracted session in the source cache"""
+        if self.source_cache is not None and fingerprint is not None:
+            self.source_cache.save(fingerprint, session)
     
-    def _extract_session_cookies(self, har_entries: List[Dict]) -> Dict[str, str]:
-        """Extract session cookies from HAR entries"""
-        session_cookies = {}
+    def _cookie_classifier(self) -> CookieClassifier:
+        """Classifier for the current cookie name lists (rebuilt if they are changed)"""
+        key = (tuple(self.jwt_cookie_names), tuple(self.session_cookie_names))
+        if self._classifier_key != key:
+            self._classifier = CookieClassifier(*key)
+            self._classifier_key = key
+        return self._classifier
+    
+    def _scan_har_stream(self, har_entries: Iterable[Dict], early_exit: bool = True) -> ArtifactScan:
+        """
+        Collect JWT tokens and session cookies from HAR entries in one pass.
+        
+        Each distinct JWT value is decoded once; each cookie name is
+        classified once per classifier.
+        """
+        classify = self._cookie_classifier().classify
+        scan = ArtifactScan()
         
         for entry in har_entries:
-            request = entry.get('request', {})
-            response = entry.get('response', {})
-            
-            # Check request cookies
-            for cookie in request.get('cookies', []):
-                name = cookie.get('name', '')
-                if any(session_name in name for session_name in self.session_cookie_names):
-                    session_cookies[name] = cookie.get('value', '')
+            scan.items_scanned += 1
+            for message in (entry.get('request', {}), entry.get('response', {})):
+                for cookie in message.get('cookies', []):
+                    name = cookie.get('name', '')
+                    kind = classify(name)
+                    if kind == JWT_COOKIE:
+                        scan.add_jwt(cookie.get('value', ''), self._process_jwt_cookie, cookie)
+                    elif kind == SESSION_COOKIE:
+                        scan.add_session_cookie(name, cookie.get('value', ''))
             
-            # Check response cookies
-            for cookie in response.get('cookies', []):
-                name = cookie.get('name', '')
-                if any(session_name in name for session_name in self.session_cookie_names):
-                    session_cookies[name] = cookie.get('value', '')
+            if early_exit and self._has_sufficient_artifacts(scan):
+                logger.info(f"Found unexpired Gong tokens and session cookies after {scan.items_scanned} HAR entries")
+                break
         
-        return session_cookies
+        return scan
+    
+    def _scan_artifacts(self, artifacts: Iterable[Dict[str, Any]]) -> ArtifactScan:
+        """Collect JWT tokens and session cookies from godcapture analysis artifacts in one pass"""
+        classify_artifact = self._cookie_classifier().classify_artifact
+        scan = ArtifactScan()
+        
+        for artifact in artifacts:
+            scan.items_scanned += 1
+            artifact_type = artifact.get('type', '')
+            kind = classify_artifact(artifact_type)
+            if kind == JWT_COOKIE:
+                scan.add_jwt(artifact.get('value', ''), self._process_jwt_artifact, artifact)
+            elif kind == SESSION_COOKIE:
+                scan.add_session_cookie(artifact.get('name', artifact_type[len('cookie_'):]), artifact.get('value', ''))
+        
+        return scan
+    
+    def _has_sufficient_artifacts(self, scan: ArtifactScan) -> bool:
+        """True once every JWT cookie name has an unexpired token and the required session cookies are set"""
+        return scan.is_sufficient(self.jwt_cookie_names, self.required_session_cookie_names)
     
     def _process_jwt_cookie(self, cookie: Dict) -> Optional[GongAuthenticationToken]:
         """Process a JWT cookie into a GongAuthenticationToken"""
@@ -366,8 +360,8 @@ class GongAuthenticationManager:
             if not token_value or not token_value.startswith('eyJ'):
                 return None
             
-            # Decode JWT
-            decoded_jwt = self.jwt_decoder.decode(token_value)
+            # Decode JWT (memoized by raw token value)
+            decoded_jwt = self.jwt_cache.decode(token_value, self.jwt_decoder.decode)
             
             if not decoded_jwt or 'payload' not in decoded_jwt:
                 return None
@@ -391,7 +385,6 @@ class GongAuthenticationManager:
                 payload=jwt_payload,
                 expires_at=datetime.fromtimestamp(payload_data.get('exp', 0)),
                 issued_at=datetime.fromtimestamp(payload_data.get('iat', 0)),
-                is_expired=datetime.now().timestamp() > payload_data.get('exp', 0),
                 cell_id=payload_data.get('cell'),
                 user_email=payload_data.get('gu')
             )
@@ -434,7 +427,6 @@ class GongAuthenticationManager:
                 payload=jwt_payload,
                 expires_at=datetime.fromtimestamp(payload_data.get('exp', 0)),
                 issued_at=datetime.fromtimestamp(payload_data.get('iat', 0)),
-                is_expired=datetime.now().timestamp() > payload_data.get('exp', 0),
                 cell_id=payload_data.get('cell'),
                 user_email=payload_data.get('gu')
             )
@@ -477,10 +469,8 @@ class GongAuthenticationManager:
         if not session.authentication_tokens:
             raise GongAuthenticationError("Session has no authentication tokens")
         
-        # Check if any tokens are still valid
-        valid_tokens = [token for token in session.authentication_tokens if not token.is_expired]
-        
-        if not valid_tokens:
+        # Check if any tokens are still valid (constant time via precomputed expiry bounds)
+        if not session.has_valid_token():
             raise GongSessionExpiredError("All session tokens have expired")
         
         # Validate user email format
@@ -540,8 +530,9 @@ class GongAuthenticationManager:
         cookie_parts = []
         
         # Add JWT tokens
+        now = datetime.now()
         for token in session.authentication_tokens:
-            if not token.is_expired:
+            if token.expires_at >= now:
                 cookie_parts.append(f"{token.token_type}={token.raw_token}")
         
         # Add session cookies
@@ -642,13 +633,9 @@ class GongAuthenticationManager:
             # For now, we'll validate the session and mark it as refreshed
 
             # Check if any tokens are still valid
-            valid_tokens = [
-                token for token in target_session.authentication_tokens
-                if not token.is_expired
-            ]
-
-            if valid_tokens:
-                logger.info(f"Found {len(valid_tokens)} valid tokens, session still usable")
+            if target_session.has_valid_token():
+                valid_count = len(target_session.authentication_tokens) - target_session.expired_token_count()
+                logger.info(f"Found {valid_count} valid tokens, session still usable")
                 target_session.last_activity = datetime.now()
                 return target_session
 
@@ -657,30 +644,67 @@ class GongAuthenticationManager:
             # 2. Update session with new tokens
             # 3. Persist updated session
 
-            # For HAR-based development, we simulate refresh by extending expiry
-            logger.warning("HAR-based session refresh: extending token validity for testing")
-
-            for token in target_session.authentication_tokens:
-                if token.is_expired:
-                    # Extend expiry by 1 hour for testing
-                    token.expires_at = datetime.now() + timedelta(hours=1)
-                    logger.info(f"Extended {token.token_type} token expiry to {token.expires_at}")
+            # A sibling process may already have refreshed this identity
+            if self.session_store is not None:
+                refreshed = self.session_store.refresh(target_session, self._extend_token_expiry)
+            else:
+                refreshed = self._extend_token_expiry(target_session)
 
-            target_session.last_activity = datetime.now()
-            target_session.is_active = True
+            refreshed.last_activity = datetime.now()
+            refreshed.is_active = True
 
             # Update cache
-            self.session_cache[target_session.session_id] = target_session
-            if target_session == self.current_session:
-                self.current_session = target_session
+            self.session_cache[refreshed.session_id] = refreshed
+            if target_session is self.current_session:
+                self.current_session = refreshed
 
-            logger.info(f"Session refresh completed for {target_session.user_email}")
-            return target_session
+            logger.info(f"Session refresh completed for {refreshed.user_email}")
+            return refreshed
 
         except Exception as e:
             logger.error(f"Session refresh failed: {e}")
             raise GongAuthenticationError(f"Failed to refresh session: {e}")
 
+    def _extend_token_expiry(self, session: GongSession) -> GongSession:
+        """Simulated refresh: push expired tokens' expiry an hour out"""
+        # For HAR-based development, we simulate refresh by extending expiry
+        logger.warning("HAR-based session refresh: extending token validity for testing")
+
+        for token in session.authentication_tokens:
+            if token.is_expired:
+                # Extend expiry by 1 hour for testing
+                token.expires_at = datetime.now() + timedelta(hours=1)
+                logger.info(f"Extended {token.token_type} token expiry to {token.expires_at}")
+        session.refresh_expiry_bounds()
+        return session
+
+    def sync_from_store(self, session: Optional[GongSession] = None) -> Optional[GongSession]:
+        """
+        Swap in a fresher copy of a session published by a sibling process.
+
+        Costs one stat of the store file unless the store has changed.
+
+        Args:
+            session: Session to check (uses current_session if None)
+
+        Returns:
+            The stored session if its tokens outlast session's, else session
+        """
+        target_session = session or self.current_session
+        if self.session_store is None or target_session is None:
+            return target_session
+
+        stored = self.session_store.get(target_session.user_email, target_session.cell_id)
+        if stored is None or stored is target_session or not stored.has_valid_token():
+            return target_session
+        if target_session.latest_expiry is not None and stored.latest_expiry <= target_session.latest_expiry:
+            return target_session
+
+        self.session_cache[stored.session_id] = stored
+        if target_session is self.current_session:
+            self.current_session = stored
+        return stored
+
     def is_session_expired(self, session: Optional[GongSession] = None) -> bool:
         """
         Check if a session is expired.
@@ -704,12 +728,12 @@ class GongAuthenticationManager:
         if not target_session.authentication_tokens:
             return True
 
-        expired_tokens = [token for token in target_session.authentication_tokens if token.is_expired]
+        expired_tokens = target_session.expired_token_count()
         total_tokens = len(target_session.authentication_tokens)
 
         # If more than 50% of tokens are expired, consider session expired
-        if len(expired_tokens) > (total_tokens / 2):
-            logger.warning(f"Session considered expired: {len(expired_tokens)}/{total_tokens} tokens expired")
+        if expired_tokens > (total_tokens / 2):
+            logger.warning(f"Session considered expired: {expired_tokens}/{total_tokens} tokens expired")
             return True
 
         return False
@@ -732,6 +756,7 @@ class GongAuthenticationManager:
         if not target_session:
             raise GongAuthenticationError("No session available for auto-refresh")
 
+        target_session = self.sync_from_store(target_session)
         if self.is_session_expired(target_session):
             logger.info("Session expired, attempting auto-refresh")
             return self.refresh_session(target_session)
@@ -776,4 +801,85 @@ class GongAuthenticationManager:
             if cookie_parts:
                 headers['Cookie'] = '; '.join(cookie_parts)
 
-        return headers
\ No newline at end of file
+        return headers
+
+    # ============================================================================
+    # Multi-capture Harvesting
+    # ============================================================================
+
+    def harvest_sessions(self, directory: Path, per_cell: bool = False, limit: Optional[int] = None,
+                         workers: Optional[int] = None, recursive: bool = False,
+                         early_exit: bool = True, mp_context: Optional[Any] = None) -> List[HarvestedSession]:
+        """
+        Extract sessions from every capture in a directory and rank them.
+
+        HARs (.har, .har.gz) and analysis files (*analysis*.json) are extracted in a
+        process pool, sharing this manager's source cache if it has one.
+        Files that fail or hold only expired tokens are logged and skipped.
+
+        Args:
+            directory: Directory of GodCapture captures
+            per_cell: Keep only the freshest session per cell
+            limit: Maximum number of sessions to return
+            workers: Worker processes (default: CPU count)
+            recursive: Also scan subdirectories
+            early_exit: Passed to extract_session_from_har
+            mp_context: multiprocessing context (default: the platform default)
+
+        Returns:
+            HarvestedSession list, longest remaining token lifetime first
+            (one per user and cell)
+        """
+        sources = find_session_sources(directory, recursive=recursive)
+        logger.info(f"Harvesting Gong sessions from {len(sources)} captures in {directory}")
+
+        harvested, errors = harvest_session_sources(
+            sources, workers=workers, early_exit=early_exit,
+            source_cache=self.source_cache, mp_context=mp_context
+        )
+        ranked = rank_sessions(harvested, per_cell=per_cell, limit=limit)
+
+        if ranked:
+            best = ranked[0]
+            logger.info(f"Freshest session: {best.session.user_email} on {best.cell_id} "
+                        f"({int(best.remaining_seconds)}s remaining, {best.source_path.name})")
+        elif errors:
+            logger.warning(f"No usable sessions in {directory}: {len(errors)} captures failed")
+
+        return ranked
+
+    # ============================================================================
+    # HAR Compaction
+    # ============================================================================
+
+    def compact_har(self, har_file_path: Path, output_path: Optional[Path] = None,
+                    compress: Optional[bool] = None) -> HARCompactionResult:
+        """
+        Shrink a HAR capture to the entries and fields session extraction reads.
+
+        Entries for gong_domains are kept, as are entries on other hosts that
+        carry a JWT or session cookie, so extracting from the compacted file
+        yields the same session.
+
+        Args:
+            har_file_path: Capture to compact (.har or .har.gz)
+            output_path: Destination (default: <name>.compact.har[.gz] next
+                to the source); pass har_file_path to compact in place
+            compress: gzip the output (default: when output_path ends in .gz)
+
+        Returns:
+            HARCompactionResult with entry counts and sizes
+
+        Raises:
+            GongAuthenticationError: If the capture is missing or cannot be parsed
+        """
+        try:
+            return compact_har(
+                har_file_path, output_path, self.gong_domains,
+                cookie_names=self.jwt_cookie_names + self.session_cookie_names,
+                compress=compress
+            )
+        except FileNotFoundError:
+            raise GongAuthenticationError(f"HAR file not found: {har_file_path}")
+        except HARStreamError as e:
+            raise GongAuthenticationError(f"Failed to compact HAR file: {e}")
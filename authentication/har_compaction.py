@@ -0,0 +1,195 @@
+"""
+Module: har_compaction
+Type: Internal Module
+
+Purpose:
+Rewrites a HAR capture down to what session extraction reads: entries for
+Gong hosts (and any other entry carrying a Gong JWT or session cookie),
+each reduced to method/url/status, cookies and cookie/auth headers.
+Optionally gzip-compressed.
+
+Data Flow:
+- Input: .har / .har.gz capture, Gong domains, extraction cookie names
+- Processing: iter_har_entries stream → host/cookie filter → header
+              filter → JSON written entry by entry to a temp file → os.replace
+- Output: Compacted HAR (readable by extract_session_from_har), HARCompactionResult
+
+Critical Because:
+Stored captures are mostly Okta CDN assets, analytics pixels and response
+bodies that extraction never reads, so they cost disk and parse time on
+every extract_session_from_har.
+
+Dependencies:
+- Requires: argparse, gzip, json, tempfile, urllib.parse, har_stream
+- Used By: auth_manager.GongAuthenticationManager.compact_har, command line
+  (python -m app_backend.agent_tools.gong.authentication.har_compaction)
+
+Error Handling:
+- Unparseable captures raise HARStreamError; the destination is left untouched
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+from urllib.parse import urlsplit
+
+from .har_stream import iter_har_entries, slim_entry
+
+logger = logging.getLogger(__name__)
+
+# Headers that can carry session state; everything else is dropped
+COMPACT_HEADER_NAMES = frozenset({'cookie', 'set-cookie', 'authorization'})
+
+
+@dataclass
+class HARCompactionResult:
+    """Outcome of one compaction"""
+    source_path: Path
+    output_path: Path
+    entries_read: int
+    entries_kept: int
+    input_bytes: int
+    output_bytes: int
+
+    @property
+    def ratio(self) -> float:
+        """Input size over output size"""
+        return self.input_bytes / self.output_bytes if self.output_bytes else 0.0
+
+
+def is_gong_url(url: str, gong_domains: Iterable[str]) -> bool:
+    """Whether url's host is one of gong_domains or a subdomain of one"""
+    host = (urlsplit(url).hostname or '').lower()
+    return any(host == domain or host.endswith('.' + domain) for domain in gong_domains)
+
+
+def _has_cookie(entry: Dict[str, Any], cookie_names: Iterable[str]) -> bool:
+    # Substring match, as artifact_scan.CookieClassifier matches e.g. AWSALBCORS on AWSALB
+    return any(cookie_name in str(cookie.get('name', ''))
+               for message in (entry['request'], entry['response'])
+               for cookie in message['cookies'] if isinstance(cookie, dict)
+               for cookie_name in cookie_names)
+
+
+def compact_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Slim entry (see har_stream.slim_entry) with only cookie/auth headers kept"""
+    compacted = slim_entry(entry)
+    for message in (compacted['request'], compacted['response']):
+        message['headers'] = [header for header in message['headers']
+                              if isinstance(header, dict)
+                              and str(header.get('name', '')).lower() in COMPACT_HEADER_NAMES]
+    return compacted
+
+
+def default_output_path(source_path: Union[str, Path], compress: bool = False) -> Path:
+    """capture.har → capture.compact.har (or .compact.har.gz)"""
+    source_path = Path(source_path)
+    name = source_path.name
+    for suffix in ('.gz', '.har'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return source_path.with_name(f"{name}.compact.har{'.gz' if compress else ''}")
+
+
+def compact_har(source_path: Union[str, Path], output_path: Union[str, Path, None],
+                gong_domains: Iterable[str], cookie_names: Iterable[str] = (),
+                compress: Optional[bool] = None) -> HARCompactionResult:
+    """
+    Write a compacted copy of a HAR capture.
+
+    Args:
+        source_path: .har or .har.gz capture
+        output_path: Destination (default: default_output_path); may be
+                     source_path itself, which is only replaced on success
+        gong_domains: Hosts whose entries are kept (subdomains included)
+        cookie_names: Cookie names (substrings) that keep an entry on any host
+        compress: gzip the output (default: when output_path ends in .gz)
+
+    Returns:
+        HARCompactionResult
+
+    Raises:
+        FileNotFoundError: If source_path does not exist
+        HARStreamError: If the capture cannot be parsed
+    """
+    source_path = Path(source_path)
+    if output_path is None:
+        output_path = default_output_path(source_path, bool(compress))
+    output_path = Path(output_path)
+    if compress is None:
+        compress = output_path.suffix == '.gz'
+    gong_domains = [domain.lower() for domain in gong_domains]
+    cookie_names = list(cookie_names)
+    input_bytes = source_path.stat().st_size
+
+    entries_read = entries_kept = 0
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output_path.parent, prefix='.har-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as raw:
+            out = gzip.GzipFile(fileobj=raw, mode='wb') if compress else raw
+            try:
+                out.write(b'{"log": {"version": "1.2", '
+                          b'"creator": {"name": "gong-har-compaction", "version": "1.0"}, '
+                          b'"entries": [')
+                for entry in iter_har_entries(source_path, slim=False):
+                    entries_read += 1
+                    compacted = compact_entry(entry)
+                    if not (is_gong_url(str(compacted['request'].get('url', '')), gong_domains)
+                            or _has_cookie(compacted, cookie_names)):
+                        continue
+                    if entries_kept:
+                        out.write(b', ')
+                    out.write(json.dumps(compacted, separators=(',', ':')).encode('utf-8'))
+                    entries_kept += 1
+                out.write(b']}}')
+            finally:
+                if compress:
+                    out.close()
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    result = HARCompactionResult(source_path, output_path, entries_read, entries_kept,
+                                 input_bytes, output_path.stat().st_size)
+    logger.info(f"Compacted {source_path}: {entries_kept}/{entries_read} entries, "
+                f"{input_bytes} → {result.output_bytes} bytes")
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Shrink a HAR capture to what Gong session extraction needs")
+    parser.add_argument('source', help="HAR capture (.har or .har.gz)")
+    parser.add_argument('output', nargs='?', help="Destination (default: <source>.compact.har[.gz])")
+    parser.add_argument('--gzip', action='store_true', help="gzip the output (implied by a .gz destination)")
+    parser.add_argument('--in-place', action='store_true', help="Replace the source capture")
+    args = parser.parse_args(argv)
+
+    if args.in_place and args.output:
+        parser.error("--in-place and an output path are mutually exclusive")
+
+    from .auth_manager import GongAuthenticationManager
+
+    logging.basicConfig(level=logging.WARNING)
+    output = args.source if args.in_place else args.output
+    result = GongAuthenticationManager().compact_har(args.source, output, compress=args.gzip or None)
+    print(f"{result.output_path}: kept {result.entries_kept}/{result.entries_read} entries, "
+          f"{result.input_bytes} → {result.output_bytes} bytes ({result.ratio:.1f}x smaller)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
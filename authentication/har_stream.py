@@ -0,0 +1,220 @@
+"""
+Module: har_stream
+Type: Internal Module
+
+Purpose:
+Incremental HAR reader. Walks log.entries one entry at a time from a plain
+or gzip-compressed capture, keeping only the request/response cookies and
+headers each entry needs for session extraction, so a caller can stop as
+soon as it has what it needs.
+
+Data Flow:
+- Input: Path to a .har or .har.gz capture (or an open binary file)
+- Processing: Chunked read → incremental UTF-8 decode → structural walk to
+              log.entries → json raw_decode of one entry at a time → slim entry
+- Output: Iterator of slim HAR entries (method, url, status, headers, cookies)
+
+Critical Because:
+Captures with embedded response bodies run to hundreds of megabytes; loading
+them whole with json.load took tens of seconds and gigabytes of RAM just to
+read a handful of cookies.
+
+Dependencies:
+- Requires: codecs, gzip, json
+- Used By: auth_manager.GongAuthenticationManager.extract_session_from_har
+
+Error Handling:
+- Truncated or malformed JSON raises HARStreamError
+- Missing files raise FileNotFoundError, as open() does
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import codecs
+import gzip
+import json
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Union
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+GZIP_MAGIC = b'\x1f\x8b'
+
+_WHITESPACE = ' \t\n\r'
+
+
+class HARStreamError(Exception):
+    """Raised when a HAR capture cannot be parsed"""
+    pass
+
+
+def open_har(path: Union[str, Path]) -> BinaryIO:
+    """Open a HAR capture for binary reading, gunzipping when it starts with the gzip magic"""
+    f = open(path, 'rb')
+    try:
+        magic = f.read(2)
+        f.seek(0)
+    except Exception:
+        f.close()
+        raise
+    if magic == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=f, mode='rb')
+    return f
+
+
+class _JSONStream:
+    """Buffered text view over a binary stream with just enough JSON structure to walk it"""
+
+    def __init__(self, stream: BinaryIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int) -> bool:
+        """Append at least one more chunk of decoded text; False at end of stream"""
+        if self.eof:
+            return False
+        if self.pos > len(self.buf) // 2:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        data = self.stream.read(size)
+        if not data:
+            self.eof = True
+            self.buf += self.text_decoder.decode(b'', final=True)
+            return False
+        self.buf += self.text_decoder.decode(data)
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of stream)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill(self.chunk_size):
+                return ''
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise HARStreamError(f"Expected {char!r} in HAR at offset {self.pos}, found {found!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input until it fits"""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if not self._fill(size):
+                    raise HARStreamError(f"Malformed or truncated HAR: {e}")
+                # Double the read size so one large entry isn't re-parsed chunk by chunk
+                size *= 2
+                continue
+            # A value touching the end of the buffer may be a truncated number or literal
+            if end == len(self.buf) and self._fill(size):
+                continue
+            self.pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """Iterate the keys of the object at the cursor, leaving the cursor on each value"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise HARStreamError(f"Expected an object key in HAR at offset {self.pos}")
+            self.expect(':')
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise HARStreamError(f"Expected ',' or '}}' in HAR at offset {self.pos - 1}, found {separator!r}")
+
+    def items(self) -> Iterator[Any]:
+        """Decode the elements of the array at the cursor one at a time"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise HARStreamError(f"Expected ',' or ']' in HAR at offset {self.pos - 1}, found {separator!r}")
+
+
+def _slim_message(message: Any, keys: tuple) -> Dict[str, Any]:
+    if not isinstance(message, dict):
+        return {'headers': [], 'cookies': []}
+    slim = {key: message[key] for key in keys if key in message}
+    slim['headers'] = message.get('headers') or []
+    slim['cookies'] = message.get('cookies') or []
+    return slim
+
+
+def slim_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the parts of a HAR entry session extraction reads; drop bodies and timings"""
+    return {
+        'startedDateTime': entry.get('startedDateTime'),
+        'request': _slim_message(entry.get('request'), ('method', 'url')),
+        'response': _slim_message(entry.get('response'), ('status',))
+    }
+
+
+def iter_har_entries(source: Union[str, Path, BinaryIO],
+                     chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     slim: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Stream log.entries from a HAR capture.
+
+    Only one entry is held in memory at a time; stopping iteration early
+    closes the file without reading the rest of it.
+
+    Args:
+        source: Path to a .har / .har.gz file, or a binary file object
+                (gzip is detected from the content, not the suffix)
+        chunk_size: Bytes read per chunk
+        slim: Reduce each entry to method/url/status/headers/cookies
+
+    Yields:
+        HAR entries in capture order
+    """
+    owns_stream = isinstance(source, (str, Path))
+    stream = open_har(source) if owns_stream else source
+    try:
+        reader = _JSONStream(stream, chunk_size)
+        for key in reader.members():
+            if key != 'log':
+                reader.value()
+                continue
+            for log_key in reader.members():
+                if log_key != 'entries':
+                    reader.value()
+                    continue
+                for entry in reader.items():
+                    if isinstance(entry, dict):
+                        yield slim_entry(entry) if slim else entry
+                # Nothing after log.entries is needed
+                return
+            return
+    except (EOFError, OSError, UnicodeDecodeError) as e:
+        # Truncated or corrupt gzip streams surface as EOFError / BadGzipFile
+        raise HARStreamError(f"Failed to read HAR: {e}")
+    finally:
+        if owns_stream:
+            stream.close()
@@ -0,0 +1,168 @@
+"""
+Module: harvest
+Type: Internal Module
+
+Purpose:
+Multi-capture session harvesting. Extracts sessions from a directory of
+GodCapture HARs and analysis files in a process pool, then ranks them by
+how long their longest-lived token lasts so the freshest usable session
+(or the freshest per cell) is picked directly.
+
+Data Flow:
+- Input: Directory (or list) of .har / .har.gz / *analysis*.json files
+- Processing: Process pool of GongAuthenticationManager extractions →
+              per-identity dedupe → ranking by latest-token expiry
+- Output: Ranked HarvestedSession list, plus per-file errors
+
+Critical Because:
+Finding a usable session among dozens of captures from several users and
+cells meant trying files one by one until one was unexpired.
+
+Dependencies:
+- Requires: concurrent.futures, multiprocessing, auth_manager
+- Used By: auth_manager.GongAuthenticationManager.harvest_sessions
+
+Error Handling:
+- Files that fail to parse or hold only expired tokens are reported in
+  the errors list and skipped
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Analysis files only, so caches, configs and other JSON next to captures aren't parsed
+SESSION_SOURCE_PATTERNS = ('*.har', '*.har.gz', '*analysis*.json')
+
+
+@dataclass
+class HarvestedSession:
+    """A session extracted from one capture file"""
+    source_path: Path
+    session: Any  # GongSession
+    expires_at: Optional[float]  # Epoch seconds of the latest token expiry
+
+    @classmethod
+    def from_session(cls, source_path: Path, session: Any) -> 'HarvestedSession':
+        """Harvested session expiring with its longest-lived token (GongSession.latest_expiry)"""
+        latest = session.latest_expiry
+        return cls(source_path, session, latest.timestamp() if latest is not None else None)
+
+    @property
+    def cell_id(self) -> str:
+        return self.session.cell_id
+
+    @property
+    def remaining_seconds(self) -> float:
+        """Seconds until the last token expires (0 once expired)"""
+        if self.expires_at is None:
+            return 0.0
+        return max(0.0, self.expires_at - datetime.now().timestamp())
+
+
+def find_session_sources(directory: Union[str, Path], recursive: bool = False) -> List[Path]:
+    """HAR, compressed HAR and analysis files in directory, sorted by path"""
+    directory = Path(directory)
+    glob = directory.rglob if recursive else directory.glob
+    sources = {path for pattern in SESSION_SOURCE_PATTERNS for path in glob(pattern) if path.is_file()}
+    return sorted(sources)
+
+
+def _harvest_source(source_path: str, early_exit: bool,
+                    cache_dir: Optional[str], sample_bytes: Optional[int]) -> Dict[str, Any]:
+    """Worker: extract one capture with a fresh manager"""
+    from .auth_manager import GongAuthenticationManager
+    from .source_cache import SessionSourceCache
+
+    start_time = time.time()
+    source_cache = SessionSourceCache(cache_dir, sample_bytes) if cache_dir is not None else None
+    manager = GongAuthenticationManager(source_cache=source_cache)
+    path = Path(source_path)
+    try:
+        if path.suffix == '.json':
+            session = manager.extract_session_from_analysis(path)
+        else:
+            session = manager.extract_session_from_har(path, early_exit=early_exit)
+        error = None
+    except Exception as e:
+        session, error = None, f"{type(e).__name__}: {e}"
+    return {
+        'source_path': source_path,
+        'session': session,
+        'error': error,
+        'duration_seconds': round(time.time() - start_time, 3)
+    }
+
+
+def harvest_session_sources(sources: Iterable[Union[str, Path]], workers: Optional[int] = None,
+                            early_exit: bool = True, source_cache: Optional[Any] = None,
+                            mp_context: Optional[Any] = None) -> Tuple[List[HarvestedSession], List[str]]:
+    """
+    Extract a session from every source in a process pool.
+
+    Args:
+        sources: Capture files (.har, .har.gz or analysis .json)
+        workers: Worker processes (default: CPU count, capped at the source count)
+        early_exit: Passed to extract_session_from_har
+        source_cache: SessionSourceCache whose directory the workers share
+        mp_context: multiprocessing context (default: the platform default)
+
+    Returns:
+        (harvested sessions in completion order, error messages)
+    """
+    sources = [str(source) for source in sources]
+    if not sources:
+        return [], []
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(sources)))
+    cache_dir = str(source_cache.directory) if source_cache is not None else None
+    sample_bytes = source_cache.sample_bytes if source_cache is not None else None
+
+    harvested: List[HarvestedSession] = []
+    errors: List[str] = []
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context or multiprocessing.get_context())
+    with executor:
+        futures = [executor.submit(_harvest_source, source, early_exit, cache_dir, sample_bytes)
+                   for source in sources]
+        for future in as_completed(futures):
+            result = future.result()
+            if result['error'] is not None:
+                errors.append(f"{result['source_path']}: {result['error']}")
+                logger.warning(f"Skipping session source {result['source_path']}: {result['error']}")
+                continue
+            session = result['session']
+            harvested.append(HarvestedSession.from_session(Path(result['source_path']), session))
+
+    logger.info(f"Harvested {len(harvested)}/{len(sources)} sessions on {workers} workers")
+    return harvested, errors
+
+
+def rank_sessions(harvested: Iterable[HarvestedSession], per_cell: bool = False,
+                  limit: Optional[int] = None) -> List[HarvestedSession]:
+    """
+    Order sessions by remaining lifetime, longest first (ties by cell, then path).
+
+    Captures of the same identity (user_email, cell_id) collapse to the
+    freshest one; with per_cell only the freshest session of each cell is kept.
+    """
+    ranked = sorted(harvested, key=lambda h: (-(h.expires_at or 0.0), h.cell_id or '', str(h.source_path)))
+
+    best: List[HarvestedSession] = []
+    seen = set()
+    for candidate in ranked:
+        key = candidate.cell_id if per_cell else (candidate.session.user_email, candidate.cell_id)
+        if key in seen:
+            continue
+        seen.add(key)
+        best.append(candidate)
+    return best[:limit] if limit is not None else best
@@ -0,0 +1,84 @@
+"""
+Module: jwt_cache
+Type: Internal Module
+
+Purpose:
+Bounded LRU memo of JWT decode results keyed by raw token value, so a
+token repeated on thousands of HAR requests is decoded once.
+
+Data Flow:
+- Input: Raw JWT string, decode function (JWTDecoder.decode)
+- Processing: LRU lookup → decode on miss → store result (None for
+              tokens that fail to decode)
+- Output: Decoded JWT dict ({'header', 'payload'}) or None
+
+Critical Because:
+Session extraction decoded every JWT cookie occurrence before
+deduplicating, which dominated extraction time on large captures.
+
+Dependencies:
+- Requires: collections.OrderedDict, logging, threading
+- Used By: auth_manager.GongAuthenticationManager
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JWT_CACHE_SIZE = 1024
+
+
+class JWTDecodeCache:
+    """
+    Thread-safe LRU of decoded JWTs.
+
+    Decoded dicts are shared between callers and must be treated as
+    read-only. Expiry is not cached; callers compare payload['exp'] with
+    the current time on every use.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_JWT_CACHE_SIZE):
+        self.maxsize = max(1, maxsize)
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, Optional[Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def decode(self, token: str, decoder: Callable[[str], Any]) -> Optional[Dict[str, Any]]:
+        """
+        Decode token with decoder, or return the memoized result.
+
+        A decoder exception is memoized as None, so an undecodable token is
+        not retried (or logged) for every occurrence.
+        """
+        with self._lock:
+            if token in self._entries:
+                self._entries.move_to_end(token)
+                self.hits += 1
+                return self._entries[token]
+            self.misses += 1
+
+        try:
+            decoded = decoder(token)
+        except Exception as e:
+            logger.warning(f"Failed to decode JWT: {e}")
+            decoded = None
+
+        with self._lock:
+            self._entries[token] = decoded
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return decoded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
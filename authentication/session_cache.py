@@ -0,0 +1,117 @@
+"""
+Module: session_cache
+Type: Internal Module
+
+Purpose:
+Bounded, expiry-aware in-memory cache of GongSessions by session_id,
+used as GongAuthenticationManager.session_cache. Least recently used
+sessions are evicted past a count limit, and sessions whose every token
+has expired are evicted eagerly.
+
+Data Flow:
+- Input: GongSessions from extract_session_* and refresh_session
+- Processing: OrderedDict LRU → expired sweep on insert, expiry check on read
+- Output: Cached sessions, hit/miss/eviction counters
+
+Critical Because:
+The cache was an unbounded dict that never dropped expired sessions, so
+long-running agents that re-extract and refresh grew without limit.
+
+Dependencies:
+- Requires: collections.OrderedDict, datetime, threading
+- Used By: auth_manager.GongAuthenticationManager
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+DEFAULT_MAX_CACHED_SESSIONS = 64
+
+
+def _all_tokens_expired(session: Any, now: datetime) -> bool:
+    return not session.has_valid_token(now)
+
+
+class SessionCache(MutableMapping):
+    """
+    Thread-safe LRU mapping of session_id → GongSession.
+
+    Reads of a fully expired session evict it and count as a miss; every
+    insert also sweeps out expired sessions before enforcing max_sessions.
+    """
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_CACHED_SESSIONS):
+        self.max_sessions = max(1, max_sessions)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # Dropped for space (LRU)
+        self.expired_evictions = 0  # Dropped because every token expired
+        self._sessions: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __getitem__(self, session_id: str) -> Any:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                self.misses += 1
+                raise KeyError(session_id)
+            if _all_tokens_expired(session, datetime.now()):
+                del self._sessions[session_id]
+                self.expired_evictions += 1
+                self.misses += 1
+                raise KeyError(session_id)
+            self._sessions.move_to_end(session_id)
+            self.hits += 1
+            return session
+
+    def __setitem__(self, session_id: str, session: Any) -> None:
+        with self._lock:
+            self._sessions[session_id] = session
+            self._sessions.move_to_end(session_id)
+            self.prune_expired()
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+
+    def __delitem__(self, session_id: str) -> None:
+        with self._lock:
+            del self._sessions[session_id]
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._sessions))
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: object) -> bool:
+        # Membership doesn't touch recency or the hit/miss counters
+        return session_id in self._sessions
+
+    def prune_expired(self, now: Optional[datetime] = None) -> int:
+        """Evict every session whose tokens have all expired; returns the number evicted"""
+        now = now or datetime.now()
+        with self._lock:
+            expired = [session_id for session_id, session in self._sessions.items()
+                       if _all_tokens_expired(session, now)]
+            for session_id in expired:
+                del self._sessions[session_id]
+            self.expired_evictions += len(expired)
+            return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._sessions),
+            'max_sessions': self.max_sessions,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'evictions': self.evictions,
+            'expired_evictions': self.expired_evictions
+        }
@@ -0,0 +1,230 @@
+"""
+Module: session_pool
+Type: Internal Module
+
+Purpose:
+Pool of GongSessions for one workspace. Tracks per-identity request
+spacing, rate-limit headroom and recent 401/429 responses, and hands the
+API client the healthiest session for each request so throughput scales
+with the number of captured identities.
+
+Data Flow:
+- Input: GongSessions (e.g. from harvest_sessions), response status/headers
+- Processing: acquire → earliest-available healthy identity + its spacing
+              delay; record → headroom, cooldown (429) or disable (401)
+- Output: PooledSession leases for GongAPIClient._make_request
+
+Critical Because:
+All traffic went through one current_session, so one user's rate limit
+capped the whole extraction no matter how many identities were captured.
+
+Dependencies:
+- Requires: collections.deque, threading, auth_manager
+- Used By: api_client.GongAPIClient.set_session_pool
+
+Error Handling:
+- acquire raises GongAuthenticationError once every identity is expired
+  or disabled after a 401
+- Adding a session from another workspace raises GongAuthenticationError
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .auth_manager import GongAuthenticationError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FAILURE_WINDOW_SECONDS = 300.0
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+
+class PooledSession:
+    """One identity in a SessionPool and its health"""
+
+    def __init__(self, session: Any):
+        self.session = session
+        self.next_slot = 0.0  # Earliest time.time() for this identity's next request
+        self.cooldown_until = 0.0  # Set from Retry-After / X-RateLimit-Reset
+        self.rate_limit_remaining: Optional[int] = None
+        self.failures: Deque[Tuple[float, int]] = deque()  # (time, status) of recent 401/429s
+        self.disabled = False
+        self.in_flight = 0
+        self.requests = 0
+
+    @property
+    def user_email(self) -> str:
+        return self.session.user_email
+
+    def is_expired(self) -> bool:
+        return not self.session.has_valid_token()
+
+    def available_at(self) -> float:
+        return max(self.next_slot, self.cooldown_until)
+
+    def recent_failures(self, now: float, window_seconds: float) -> int:
+        while self.failures and self.failures[0][0] < now - window_seconds:
+            self.failures.popleft()
+        return len(self.failures)
+
+    def to_dict(self, now: float, window_seconds: float) -> Dict[str, Any]:
+        return {
+            'user_email': self.user_email,
+            'requests': self.requests,
+            'in_flight': self.in_flight,
+            'rate_limit_remaining': self.rate_limit_remaining,
+            'cooldown_seconds': round(max(0.0, self.cooldown_until - now), 3),
+            'recent_failures': self.recent_failures(now, window_seconds),
+            'disabled': self.disabled,
+            'expired': self.is_expired()
+        }
+
+
+class SessionPool:
+    """
+    Rotates requests across the valid sessions of one workspace.
+
+    Each identity is spaced min_request_interval apart on its own, so N
+    identities allow N times the request rate of a single session. acquire()
+    picks the identity that can go soonest, preferring fewer recent
+    failures and more rate-limit headroom; a 429 cools that identity down
+    for Retry-After seconds and a 401 takes it out of rotation.
+    """
+
+    def __init__(self, sessions: Iterable[Any] = (), min_request_interval: float = 0.1,
+                 failure_window_seconds: float = DEFAULT_FAILURE_WINDOW_SECONDS):
+        """
+        Create the pool.
+
+        Args:
+            sessions: Initial GongSessions (same cell and workspace)
+            min_request_interval: Seconds between requests on one identity
+            failure_window_seconds: How long a 401/429 counts against an identity
+        """
+        self.min_request_interval = min_request_interval
+        self.failure_window_seconds = failure_window_seconds
+        self.cell_id: Optional[str] = None
+        self.workspace_id: Optional[str] = None
+        self._entries: List[PooledSession] = []
+        self._lock = threading.Lock()
+        for session in sessions:
+            self.add(session)
+
+    def add(self, session: Any) -> PooledSession:
+        """
+        Add a session; one already pooled for the same user is replaced.
+
+        Raises:
+            GongAuthenticationError: If the session belongs to another cell or workspace
+        """
+        with self._lock:
+            if self.cell_id is None:
+                self.cell_id = session.cell_id
+                self.workspace_id = getattr(session, 'workspace_id', None)
+            elif (session.cell_id, getattr(session, 'workspace_id', None)) != (self.cell_id, self.workspace_id):
+                raise GongAuthenticationError(
+                    f"Session for {session.user_email} is on {session.cell_id}, pool is on {self.cell_id}"
+                )
+
+            pooled = PooledSession(session)
+            self._entries = [entry for entry in self._entries if entry.user_email != session.user_email]
+            self._entries.append(pooled)
+        logger.info(f"Session pool for {self.cell_id}: added {session.user_email} ({len(self._entries)} identities)")
+        return pooled
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def sessions(self) -> List[Any]:
+        with self._lock:
+            return [entry.session for entry in self._entries]
+
+    def usable_count(self) -> int:
+        """Identities that are neither disabled nor expired"""
+        with self._lock:
+            return sum(1 for entry in self._entries if not entry.disabled and not entry.is_expired())
+
+    def acquire(self) -> Tuple[PooledSession, float]:
+        """
+        Reserve the next request slot on the healthiest identity.
+
+        Returns:
+            (pooled session, seconds to wait before sending); pass the
+            pooled session to record() once the request finishes
+
+        Raises:
+            GongAuthenticationError: If no identity is usable
+        """
+        with self._lock:
+            now = time.time()
+            candidates = [entry for entry in self._entries if not entry.disabled and not entry.is_expired()]
+            if not candidates:
+                raise GongAuthenticationError("No usable session in pool (all expired or unauthorized)")
+
+            def health(entry: PooledSession) -> tuple:
+                headroom = entry.rate_limit_remaining if entry.rate_limit_remaining is not None else float('inf')
+                return (max(now, entry.available_at()),
+                        entry.recent_failures(now, self.failure_window_seconds),
+                        -headroom,
+                        entry.in_flight)
+
+            pooled = min(candidates, key=health)
+            slot = max(now, pooled.available_at())
+            pooled.next_slot = slot + self.min_request_interval
+            pooled.in_flight += 1
+            pooled.requests += 1
+        return pooled, slot - now
+
+    def record(self, pooled: PooledSession, status_code: Optional[int] = None,
+               headers: Optional[Mapping[str, str]] = None) -> None:
+        """
+        Release a lease and update the identity's health from the response.
+
+        Args:
+            pooled: Lease returned by acquire()
+            status_code: HTTP status, or None if the request never completed
+            headers: Response headers (Retry-After, X-RateLimit-Remaining, X-RateLimit-Reset)
+        """
+        headers = headers or {}
+        with self._lock:
+            now = time.time()
+            pooled.in_flight = max(0, pooled.in_flight - 1)
+
+            remaining = _header_number(headers, 'X-RateLimit-Remaining')
+            if remaining is not None:
+                pooled.rate_limit_remaining = int(remaining)
+                reset = _header_number(headers, 'X-RateLimit-Reset')
+                if remaining <= 0 and reset is not None:
+                    pooled.cooldown_until = max(pooled.cooldown_until, reset)
+
+            if status_code == 429:
+                retry_after = _header_number(headers, 'Retry-After')
+                retry_after = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER_SECONDS
+                pooled.cooldown_until = max(pooled.cooldown_until, now + max(0.0, retry_after))
+                pooled.failures.append((now, status_code))
+                logger.warning(f"Session {pooled.user_email} rate limited; cooling down {retry_after}s")
+            elif status_code == 401:
+                pooled.failures.append((now, status_code))
+                pooled.disabled = True
+                logger.warning(f"Session {pooled.user_email} unauthorized; removed from rotation")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Health of every identity, for monitoring"""
+        with self._lock:
+            now = time.time()
+            return [entry.to_dict(now, self.failure_window_seconds) for entry in self._entries]
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,280 @@
+"""
+Module: session_store
+Type: Internal Module
+
+Purpose:
+On-disk GongSession store shared by every worker process on a host. A
+session refreshed by one process is written once (encrypted, atomically)
+and picked up by its siblings through a stat of the store file, so a
+fleet of workers performs one refresh per identity instead of one each.
+
+Data Flow:
+- Input: GongSessions to publish, refresh callbacks from the auth manager
+- Processing: Exclusive file lock → re-read → write temp file → os.replace;
+              readers re-parse only when the file's inode, size or mtime changed
+- Output: Latest stored session per identity (cell_id + user_email)
+
+Critical Because:
+Each worker loaded and refreshed its own copy of the session, so N
+workers did N refreshes and never saw each other's tokens.
+
+Dependencies:
+- Requires: fcntl (POSIX; falls back to a per-process lock elsewhere),
+            cryptography (optional, Fernet encryption), json, tempfile, source_cache
+- Used By: auth_manager.GongAuthenticationManager
+
+Error Handling:
+- A key that cannot decrypt the store raises SessionStoreError rather
+  than letting a misconfigured worker overwrite its siblings' sessions
+- Unparseable store contents are logged and treated as an empty store
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes are only serialized within this process
+    fcntl = None
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    Fernet = None
+    InvalidToken = None
+    CRYPTOGRAPHY_AVAILABLE = False
+
+from .source_cache import session_from_dict, session_to_dict
+
+logger = logging.getLogger(__name__)
+
+SESSION_STORE_KEY_ENV = 'GONG_SESSION_STORE_KEY'
+STORE_FORMAT_VERSION = 1
+
+# Serializes threads of one process before they take the file lock
+_process_locks = {}
+_process_locks_guard = threading.Lock()
+
+
+def _process_lock(path: str) -> threading.RLock:
+    with _process_locks_guard:
+        return _process_locks.setdefault(path, threading.RLock())
+
+
+class SessionStoreError(Exception):
+    """Raised when the session store cannot be read with the configured key"""
+    pass
+
+
+def generate_store_key() -> str:
+    """New Fernet key for GONG_SESSION_STORE_KEY"""
+    if not CRYPTOGRAPHY_AVAILABLE:
+        raise SessionStoreError("Session store encryption requires cryptography (pip install cryptography)")
+    return Fernet.generate_key().decode('ascii')
+
+
+def session_identity(session: Any) -> str:
+    """Store key of a session: one entry per user per cell"""
+    return f"{session.cell_id}/{session.user_email}"
+
+
+class SessionStore:
+    """
+    File-backed map of identity → GongSession shared across processes.
+
+    Writers hold an exclusive lock on a sidecar .lock file and replace the
+    store atomically, so readers never need the lock: they stat the store
+    and re-parse only when it has been replaced since their last read.
+    """
+
+    def __init__(self, path: Union[str, Path], key: Optional[Union[str, bytes]] = None):
+        """
+        Open (or create on first write) a session store.
+
+        Args:
+            path: Store file; siblings must use the same path
+            key: Fernet key (default: $GONG_SESSION_STORE_KEY). Without a key
+                 sessions are stored unencrypted, readable only by the owner.
+
+        Raises:
+            SessionStoreError: If a key is given but cryptography is not installed
+        """
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + '.lock')
+        key = key if key is not None else os.environ.get(SESSION_STORE_KEY_ENV)
+        if key:
+            if not CRYPTOGRAPHY_AVAILABLE:
+                raise SessionStoreError("Session store encryption requires cryptography (pip install cryptography)")
+            self._fernet = Fernet(key.encode('ascii') if isinstance(key, str) else key)
+        else:
+            self._fernet = None
+            logger.warning(f"No {SESSION_STORE_KEY_ENV} set; session store {self.path} is not encrypted")
+        if fcntl is None:
+            logger.warning("fcntl unavailable; session store writes are only serialized within this process")
+
+        self.reloads = 0  # Times the store was re-read after another writer replaced it
+        self.adopted = 0  # Refreshes skipped because a sibling already refreshed
+        self._sessions: Dict[str, Any] = {}
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._lock = threading.RLock()
+
+    @property
+    def encrypted(self) -> bool:
+        return self._fernet is not None
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _file_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        # os.replace always changes the inode, so same-size writes within
+        # the mtime granularity are still noticed
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _decode(self, raw: bytes) -> Dict[str, Any]:
+        if self._fernet is not None:
+            try:
+                raw = self._fernet.decrypt(raw)
+            except InvalidToken:
+                raise SessionStoreError(f"Cannot decrypt session store {self.path}; check {SESSION_STORE_KEY_ENV}")
+
+        try:
+            document = json.loads(raw.decode('utf-8'))
+            if document.get('version') != STORE_FORMAT_VERSION:
+                raise ValueError(f"unsupported store version {document.get('version')}")
+            return {identity: session_from_dict(data) for identity, data in document['sessions'].items()}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable session store {self.path}: {e}")
+            return {}
+
+    def _refresh_snapshot(self) -> Dict[str, Any]:
+        """Stored sessions, re-read only if the store file was replaced"""
+        with self._lock:
+            stamp = self._file_stamp()
+            if stamp == self._stamp:
+                return self._sessions
+            if stamp is None:
+                self._sessions = {}
+            else:
+                try:
+                    with open(self.path, 'rb') as f:
+                        # Stamp what was actually read, in case it was replaced since the stat
+                        stat = os.fstat(f.fileno())
+                        stamp = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+                        raw = f.read()
+                except FileNotFoundError:
+                    raw, stamp = None, None
+                self._sessions = self._decode(raw) if raw is not None else {}
+                self.reloads += 1
+            self._stamp = stamp
+            return self._sessions
+
+    def get(self, user_email: str, cell_id: str) -> Optional[Any]:
+        """Stored session for an identity, or None"""
+        return self._refresh_snapshot().get(f"{cell_id}/{user_email}")
+
+    def sessions(self) -> List[Any]:
+        """Every stored session"""
+        return list(self._refresh_snapshot().values())
+
+    def latest(self, cell_id: Optional[str] = None) -> Optional[Any]:
+        """Stored session (optionally on cell_id) whose tokens last the longest, if any is still valid"""
+        candidates = [session for session in self.sessions()
+                      if session.has_valid_token() and (cell_id is None or session.cell_id == cell_id)]
+        return max(candidates, key=lambda session: session.latest_expiry, default=None)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _locked(self) -> Iterator[Dict[str, Any]]:
+        """Hold the store lock and yield a fresh copy of the stored sessions to modify"""
+        with _process_lock(str(self.path)):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                yield dict(self._refresh_snapshot())
+            finally:
+                os.close(fd)  # Closing releases the flock
+
+    def _write(self, sessions: Dict[str, Any]) -> None:
+        """Atomically replace the store (caller holds the lock)"""
+        document = {
+            'version': STORE_FORMAT_VERSION,
+            'sessions': {identity: session_to_dict(session) for identity, session in sessions.items()}
+        }
+        raw = json.dumps(document).encode('utf-8')
+        if self._fernet is not None:
+            raw = self._fernet.encrypt(raw)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.sessions-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:  # mkstemp creates the file 0600
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        with self._lock:
+            self._sessions = sessions
+            self._stamp = self._file_stamp()
+
+    def put(self, session: Any) -> None:
+        """Publish session to every process using this store"""
+        with self._locked() as sessions:
+            sessions[session_identity(session)] = session
+            self._write(sessions)
+        logger.info(f"Stored session for {session.user_email} on {session.cell_id}")
+
+    def remove(self, user_email: str, cell_id: str) -> bool:
+        """Drop an identity's session; returns whether one was stored"""
+        with self._locked() as sessions:
+            if sessions.pop(f"{cell_id}/{user_email}", None) is None:
+                return False
+            self._write(sessions)
+            return True
+
+    def refresh(self, session: Any, refresher: Callable[[Any], Any]) -> Any:
+        """
+        Refresh session once across all processes.
+
+        Under the store lock, a still-valid session already stored for the
+        same identity (refreshed by a sibling) is returned as-is; otherwise
+        refresher(session) runs and its result is stored.
+
+        Returns:
+            The refreshed session
+        """
+        identity = session_identity(session)
+        with self._locked() as sessions:
+            stored = sessions.get(identity)
+            if stored is not None and stored.has_valid_token():
+                self.adopted += 1
+                logger.info(f"Using session for {session.user_email} refreshed by another process")
+                return stored
+            refreshed = refresher(session)
+            sessions[identity] = refreshed
+            self._write(sessions)
+            return refreshed
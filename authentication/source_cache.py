@@ -0,0 +1,220 @@
+"""
+Module: source_cache
+Type: Internal Module
+
+Purpose:
+Persistent cache of extracted GongSessions keyed by a fingerprint of the
+source file (HAR capture or godcapture_analysis.json), so an unchanged
+source skips parsing, JWT decoding and validation on the next start.
+
+Data Flow:
+- Input: Session source path, GongSession from a successful extraction
+- Processing: stat + sampled content hash → fingerprint compared with
+              the entry stored for that path (one JSON file per source,
+              written atomically)
+- Output: Cached GongSession, or None when the source changed or the
+          earliest token has expired
+
+Critical Because:
+Every agent start re-parsed the same capture (seconds for large HARs)
+to rebuild a session that had not changed.
+
+Dependencies:
+- Requires: hashlib, json, os, tempfile, data_models
+- Used By: auth_manager.GongAuthenticationManager
+
+Error Handling:
+- Unreadable or corrupt cache files are treated as misses and removed
+- Write failures are logged; extraction never fails because of the cache
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Union
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from data_models import GongAuthenticationToken, GongJWTPayload, GongSession
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_SAMPLE_BYTES = 1 << 20
+
+
+class SourceFingerprint(NamedTuple):
+    """Identity of a session source file"""
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+
+
+def source_fingerprint(path: Union[str, Path],
+                       sample_bytes: Optional[int] = DEFAULT_SAMPLE_BYTES) -> SourceFingerprint:
+    """
+    Fingerprint a session source file.
+
+    Args:
+        path: Source file
+        sample_bytes: Hash only the first and last sample_bytes of the file
+                      (None hashes the whole file). Size and mtime_ns are
+                      always part of the fingerprint, so sampling only has to
+                      catch same-size rewrites that preserve mtime.
+
+    Raises:
+        FileNotFoundError: If the source does not exist
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        if sample_bytes is None or stat.st_size <= 2 * sample_bytes:
+            for chunk in iter(lambda: f.read(DEFAULT_SAMPLE_BYTES), b''):
+                hasher.update(chunk)
+        else:
+            hasher.update(f.read(sample_bytes))
+            f.seek(-sample_bytes, os.SEEK_END)
+            hasher.update(f.read(sample_bytes))
+    return SourceFingerprint(str(path), stat.st_size, stat.st_mtime_ns, hasher.hexdigest())
+
+
+def session_to_dict(session: GongSession) -> Dict[str, Any]:
+    """JSON-safe form of a GongSession"""
+    return session.model_dump(mode='json')
+
+
+def _token_from_dict(data: Dict[str, Any]) -> GongAuthenticationToken:
+    token = GongAuthenticationToken(**{**data, 'payload': GongJWTPayload(**data['payload'])})
+    # The model derives expires_at from the JWT; keep an expiry extended by refresh_session
+    if data.get('expires_at'):
+        token.expires_at = datetime.fromisoformat(data['expires_at'])
+    return token
+
+
+def session_from_dict(data: Dict[str, Any]) -> GongSession:
+    """Rebuild a GongSession from session_to_dict output (token expiry is re-evaluated)"""
+    data = dict(data)
+    data['authentication_tokens'] = [_token_from_dict(token) for token in data.get('authentication_tokens', [])]
+    return GongSession(**data)
+
+
+def session_expires_at(session: GongSession) -> Optional[float]:
+    """Epoch seconds at which the session's earliest token expires"""
+    earliest = session.earliest_expiry
+    return earliest.timestamp() if earliest is not None else None
+
+
+class SessionSourceCache:
+    """
+    Directory of cached sessions, one JSON file per source path.
+
+    An entry is served only while the source's path, size, mtime and
+    sampled content hash still match and its earliest token is unexpired;
+    otherwise it is deleted and the caller re-extracts.
+    """
+
+    def __init__(self, directory: Union[str, Path],
+                 sample_bytes: Optional[int] = DEFAULT_SAMPLE_BYTES):
+        self.directory = Path(directory)
+        self.sample_bytes = sample_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, source_path: Union[str, Path]) -> SourceFingerprint:
+        return source_fingerprint(source_path, self.sample_bytes)
+
+    def _entry_path(self, source_path: str) -> Path:
+        # One entry per source path; a changed source overwrites its old entry
+        key = hashlib.blake2b(source_path.encode('utf-8'), digest_size=16).hexdigest()
+        return self.directory / f"{key}.json"
+
+    def _remove(self, entry_path: Path) -> None:
+        try:
+            entry_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def load(self, fingerprint: SourceFingerprint) -> Optional[GongSession]:
+        """Cached session for fingerprint, or None"""
+        entry_path = self._entry_path(fingerprint.path)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable session cache entry {entry_path}: {e}")
+            self._remove(entry_path)
+            self.misses += 1
+            return None
+
+        if entry.get('version') != CACHE_FORMAT_VERSION or entry.get('fingerprint') != list(fingerprint):
+            self._remove(entry_path)
+            self.misses += 1
+            return None
+
+        expires_at = entry.get('expires_at')
+        if expires_at is not None and expires_at <= datetime.now().timestamp():
+            logger.info(f"Cached session for {fingerprint.path} expired; re-extracting")
+            self._remove(entry_path)
+            self.misses += 1
+            return None
+
+        try:
+            session = session_from_dict(entry['session'])
+        except Exception as e:
+            logger.warning(f"Discarding invalid session cache entry {entry_path}: {e}")
+            self._remove(entry_path)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return session
+
+    def save(self, fingerprint: SourceFingerprint, session: GongSession) -> Optional[Path]:
+        """Cache session under fingerprint; returns the entry path, or None if the write failed"""
+        entry = {
+            'version': CACHE_FORMAT_VERSION,
+            'fingerprint': list(fingerprint),
+            'expires_at': session_expires_at(session),
+            'saved_at': datetime.now().timestamp(),
+            'session': session_to_dict(session)
+        }
+        entry_path = self._entry_path(fingerprint.path)
+        tmp_path = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.session-', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, entry_path)
+            return entry_path
+        except OSError as e:
+            logger.warning(f"Failed to write session cache entry {entry_path}: {e}")
+            if tmp_path is not None:
+                self._remove(Path(tmp_path))
+            return None
+
+    def invalidate(self, source_path: Union[str, Path]) -> bool:
+        """Drop the entry for source_path"""
+        entry_path = self._entry_path(str(Path(source_path).resolve()))
+        existed = entry_path.exists()
+        self._remove(entry_path)
+        return existed
+
+    def clear(self) -> int:
+        """Remove every cached session; returns the number removed"""
+        removed = 0
+        for entry_path in self.directory.glob('*.json'):
+            self._remove(entry_path)
+            removed += 1
+        return removed
@@ -0,0 +1,62 @@
+"""
+Module: __init__
+Type: Internal Module
+
+Purpose:
+Offline benchmark suite for Gong extraction: seeded synthetic data,
+synthetic and recorded backends, parameterized scenarios and baseline
+comparison.
+
+Data Flow:
+- Input: Scenarios, synthetic dataset sizes or HAR recordings
+- Processing: Repeated timed extraction against offline backends
+- Output: JSON benchmark results, regressions against a baseline
+
+Critical Because:
+Performance regressions are only caught if runs are repeatable.
+
+Dependencies:
+- Requires: backends, suite, synthetic
+- Used By: agent, benchmarks.__main__
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+from .backends import (
+    BenchmarkBackend,
+    RecordedBackend,
+    SyntheticBackend
+)
+from .synthetic import (
+    SyntheticGongData,
+    make_jwt
+)
+from .suite import (
+    BenchmarkError,
+    BenchmarkScenario,
+    BenchmarkSuite,
+    DEFAULT_SCENARIOS,
+    compare_to_baseline,
+    load_results,
+    measure,
+    save_results
+)
+
+__version__ = "1.0.0"
+__author__ = "CS-Ascension Team"
+
+__all__ = [
+    'BenchmarkBackend',
+    'RecordedBackend',
+    'SyntheticBackend',
+    'BenchmarkError',
+    'BenchmarkScenario',
+    'BenchmarkSuite',
+    'DEFAULT_SCENARIOS',
+    'compare_to_baseline',
+    'load_results',
+    'measure',
+    'save_results',
+    'SyntheticGongData',
+    'make_jwt'
+]
@@ -0,0 +1,87 @@
+"""
+Module: __main__
+Type: Internal Module
+
+Purpose:
+Command line entry point for the Gong benchmark suite.
+
+Data Flow:
+- Input: Command line arguments (scenarios, backend, repeats, baseline)
+- Processing: BenchmarkSuite run, baseline comparison
+- Output: JSON results file, regression report, exit code
+
+Critical Because:
+Lets CI fail a build when extraction gets slower than the stored baseline.
+
+Dependencies:
+- Requires: argparse, benchmarks.suite
+- Used By: CI, developers (python -m app_backend.agent_tools.gong.benchmarks)
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import argparse
+import json
+import logging
+import sys
+
+from .suite import (
+    DEFAULT_SCENARIOS,
+    BenchmarkSuite,
+    compare_to_baseline,
+    load_results,
+    save_results
+)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run Gong extraction benchmarks against an offline backend")
+    parser.add_argument('--scenario', action='append', dest='scenarios',
+                        help="Scenario to run (repeatable; default: all)")
+    parser.add_argument('--list', action='store_true', help="List scenarios and exit")
+    parser.add_argument('--har', help="Replay responses from this HAR file instead of synthetic data")
+    parser.add_argument('--warmup', type=int, default=1, help="Untimed runs per scenario")
+    parser.add_argument('--repeats', type=int, default=5, help="Timed runs per scenario")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for injected latency and 429s")
+    parser.add_argument('--output', help="Write JSON results to this path")
+    parser.add_argument('--baseline', help="Compare against results stored at this path")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="Allowed p50 slowdown before flagging a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    scenarios = {scenario.name: scenario for scenario in DEFAULT_SCENARIOS}
+    if args.list:
+        for scenario in DEFAULT_SCENARIOS:
+            print(f"{scenario.name}: {json.dumps(scenario.to_dict())}")
+        return 0
+
+    unknown = [name for name in args.scenarios or [] if name not in scenarios]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+    selected = [scenarios[name] for name in args.scenarios] if args.scenarios else DEFAULT_SCENARIOS
+
+    logging.basicConfig(level=logging.WARNING)
+    options = {'warmup': args.warmup, 'repeats': args.repeats, 'seed': args.seed}
+    suite = BenchmarkSuite.recorded(args.har, **options) if args.har else BenchmarkSuite(**options)
+    results = suite.run(selected)
+
+    for name, result in results['scenarios'].items():
+        print(f"{name:<26} p50={result['p50_seconds']:.4f}s p90={result['p90_seconds']:.4f}s "
+              f"items={result['items']} requests={result['requests']} 429s={result['rate_limited']}")
+
+    if args.output:
+        print(f"Results written to {save_results(results, args.output)}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, load_results(args.baseline), tolerance=args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['scenario']}: {regression['metric']} "
+                  f"{regression['baseline']}s → {regression['current']}s (+{regression['change']:.1%})")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
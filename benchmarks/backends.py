@@ -0,0 +1,257 @@
+"""
+Module: backends
+Type: Internal Module
+
+Purpose:
+Offline HTTP backends for benchmarking the Gong API client. Each backend
+stands in for the client's requests.Session and serves either recorded
+responses (from a HAR capture) or synthetic ones, with optional injected
+latency and 429 rate limiting.
+
+Data Flow:
+- Input: HAR file or synthetic dataset sizes, latency and 429 settings
+- Processing: Route matching on method and path, fault injection
+- Output: requests.Response objects
+
+Critical Because:
+Benchmarks against live Gong are slow, flaky and rate limited. Offline
+backends make runs repeatable so regressions can be told apart from noise.
+
+Dependencies:
+- Requires: requests, json, random, threading, benchmarks.synthetic
+- Used By: benchmarks.suite
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import abc
+import json
+import random
+import re
+import threading
+import time
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+
+from .synthetic import SyntheticGongData
+
+
+def build_response(status_code: int, payload: Any = None, url: str = '',
+                   headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    """Build a requests.Response with a JSON (or raw text) body"""
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = url
+    response.reason = HTTPStatus(status_code).phrase
+    if isinstance(payload, (bytes, str)):
+        response._content = payload.encode('utf-8') if isinstance(payload, str) else payload
+    else:
+        response._content = json.dumps(payload if payload is not None else {}).encode('utf-8')
+        response.headers['Content-Type'] = 'application/json'
+    response.headers.update(headers or {})
+    response.encoding = 'utf-8'
+    return response
+
+
+class BenchmarkBackend(abc.ABC):
+    """
+    Base for offline backends swapped in as GongAPIClient.session.
+
+    Subclasses implement _respond(). This class adds latency and 429
+    injection and counts requests.
+    """
+
+    def __init__(self, latency_seconds: float = 0.0, latency_jitter: float = 0.0,
+                 rate_limit_rate: float = 0.0, seed: int = 0):
+        """
+        Initialize fault injection.
+
+        Args:
+            latency_seconds: Delay added to every response
+            latency_jitter: Maximum random extra delay per response
+            rate_limit_rate: Fraction of requests answered with 429 (0.0-1.0)
+            seed: Random seed so injected faults repeat across runs
+        """
+        self.latency_seconds = latency_seconds
+        self.latency_jitter = latency_jitter
+        self.rate_limit_rate = rate_limit_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.rate_limited_count = 0
+
+    def request(self, method: str, url: str, headers: Optional[Dict] = None,
+                params: Optional[Dict] = None, data: Any = None, json: Any = None,
+                timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """Serve one request (same signature as requests.Session.request)"""
+        with self._lock:
+            self.request_count += 1
+            jitter = self._random.uniform(0, self.latency_jitter) if self.latency_jitter else 0.0
+            throttled = self.rate_limit_rate > 0 and self._random.random() < self.rate_limit_rate
+            if throttled:
+                self.rate_limited_count += 1
+
+        delay = self.latency_seconds + jitter
+        if delay > 0:
+            if timeout is not None and delay > timeout:
+                time.sleep(timeout)
+                raise requests.exceptions.Timeout(f"Benchmark backend timed out after {timeout}s")
+            time.sleep(delay)
+
+        if throttled:
+            return build_response(429, {'error': 'Too Many Requests'}, url, {'Retry-After': '1'})
+
+        path = urlparse(url).path
+        return self._respond(method.upper(), path, params or {}, json if json is not None else data, url)
+
+    @abc.abstractmethod
+    def _respond(self, method: str, path: str, params: Dict[str, Any], body: Any,
+                 url: str) -> requests.Response:
+        """Build the response for one request after fault injection"""
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.request_count = 0
+            self.rate_limited_count = 0
+
+    # requests.Session compatibility
+    def mount(self, prefix: str, adapter: Any) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class RecordedBackend(BenchmarkBackend):
+    """
+    Serves responses recorded in a HAR capture.
+
+    Requests are matched on method and URL path. When a path was recorded
+    several times the recordings are replayed in turn.
+    """
+
+    def __init__(self, responses: Dict[Tuple[str, str], List[Tuple[int, str]]], **kwargs):
+        """
+        Initialize from recorded responses.
+
+        Args:
+            responses: (METHOD, path) → list of (status, body text)
+            **kwargs: Fault injection settings (see BenchmarkBackend)
+        """
+        super().__init__(**kwargs)
+        self.responses = responses
+        self._cursor: Dict[Tuple[str, str], int] = {}
+
+    @classmethod
+    def from_har(cls, har_path: Union[str, Path], **kwargs) -> 'RecordedBackend':
+        """Load recorded responses from a HAR file"""
+        with open(har_path, 'r', encoding='utf-8') as f:
+            har_data = json.load(f)
+
+        responses: Dict[Tuple[str, str], List[Tuple[int, str]]] = {}
+        for entry in har_data.get('log', {}).get('entries', []):
+            request = entry.get('request', {})
+            response = entry.get('response', {})
+            text = response.get('content', {}).get('text')
+            if text is None:
+                continue
+            key = (request.get('method', 'GET').upper(), urlparse(request.get('url', '')).path)
+            responses.setdefault(key, []).append((response.get('status', 200), text))
+
+        return cls(responses, **kwargs)
+
+    def _respond(self, method, path, params, body, url):
+        recorded = self.responses.get((method, path))
+        if not recorded:
+            return build_response(404, {'error': f'No recording for {method} {path}'}, url)
+
+        with self._lock:
+            index = self._cursor.get((method, path), 0)
+            self._cursor[(method, path)] = index + 1
+        status, text = recorded[index % len(recorded)]
+        return build_response(status, text, url, {'Content-Type': 'application/json'})
+
+
+class SyntheticBackend(BenchmarkBackend):
+    """
+    Serves SyntheticGongData payloads for the endpoints the extractors use.
+
+    Records are generated on request so large tenants don't have to be
+    held in memory.
+    """
+
+    ROUTES = [
+        ('GET', re.compile(r'^/ajax/home/calls/my-calls$'), '_calls_page'),
+        ('GET', re.compile(r'^/call/(?P<call_id>[^/]+)/detailed-transcript$'), '_transcript'),
+        ('GET', re.compile(r'^/call/(?P<call_id>[^/]+)$'), '_call_details'),
+        ('POST', re.compile(r'^/dealswebapi/ajax/deals/get-board-deals$'), '_deals_page'),
+        ('GET', re.compile(r'^/ajax/stats/get-users$'), '_users'),
+        ('POST', re.compile(r'^/conversations/ajax/results$'), '_conversations'),
+        ('GET', re.compile(r'^/library/get-library-data$'), '_library'),
+        ('POST', re.compile(r'^/stats/ajax/v2/team/activity/aggregated/(?P<metric>[^/]+)$'), '_team_stats'),
+    ]
+
+    def __init__(self, data: Optional[SyntheticGongData] = None, calls: int = 1000, deals: int = 500,
+                 users: int = 50, transcript_segments: int = 200, **kwargs):
+        """
+        Initialize the dataset.
+
+        Args:
+            data: Generator to serve (default: one built from the sizes below)
+            calls: Calls in the tenant
+            deals: Deals in the tenant
+            users: Users in the tenant
+            transcript_segments: Segments per call transcript
+            **kwargs: Fault injection settings (see BenchmarkBackend)
+        """
+        super().__init__(**kwargs)
+        self.data = data or SyntheticGongData(
+            seed=kwargs.get('seed', 0),
+            calls=calls,
+            deals=deals,
+            users=users,
+            transcript_segments=transcript_segments
+        )
+
+    def _respond(self, method, path, params, body, url):
+        for route_method, pattern, handler in self.ROUTES:
+            match = pattern.match(path)
+            if route_method == method and match:
+                request_args = dict(params)
+                if isinstance(body, dict):
+                    request_args.update(body)
+                return build_response(200, getattr(self, handler)(request_args, **match.groupdict()), url)
+
+        return build_response(404, {'error': f'Unknown endpoint {method} {path}'}, url)
+
+    @staticmethod
+    def _paging(args: Dict[str, Any]) -> Dict[str, int]:
+        return {'limit': int(args.get('limit', 50)), 'offset': int(args.get('offset', 0))}
+
+    def _calls_page(self, args):
+        return self.data.calls_page(**self._paging(args))
+
+    def _call_details(self, args, call_id):
+        return self.data.call_details(call_id)
+
+    def _transcript(self, args, call_id):
+        return self.data.transcript(call_id)
+
+    def _deals_page(self, args):
+        return self.data.deals_page(**self._paging(args))
+
+    def _users(self, args):
+        return self.data.users_response()
+
+    def _conversations(self, args):
+        return self.data.conversations_page(**self._paging(args))
+
+    def _library(self, args):
+        return self.data.library()
+
+    def _team_stats(self, args, metric):
+        return self.data.team_stats(metric, args.get('period', 'week'))
@@ -0,0 +1,369 @@
+"""
+Module: suite
+Type: Internal Module
+
+Purpose:
+Scenario-based benchmark suite for Gong extraction. Scenarios vary the
+object mix, page size, concurrency, injected latency and 429 rate; each is
+measured repeatedly after warmup against an offline backend, and results
+can be saved as JSON and compared against a stored baseline.
+
+Data Flow:
+- Input: Scenarios, backend (synthetic or recorded HAR), warmup/repeat counts
+- Processing: GongAgent extraction against the backend, timing
+- Output: JSON-serializable results, regressions against a baseline
+
+Critical Because:
+A single pass/fail run against live Gong can't show whether a change made
+extraction slower. Repeated offline measurements can.
+
+Dependencies:
+- Requires: benchmarks.backends, agent, api_client, data_models
+- Used By: benchmarks.__main__, agent.GongAgent.validate_performance
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from extraction.stats import percentile
+
+from .backends import BenchmarkBackend, RecordedBackend, SyntheticBackend
+
+logger = logging.getLogger(__name__)
+
+OBJECT_TYPES = ['calls', 'users', 'deals', 'conversations', 'library', 'team_stats']
+
+
+@dataclass
+class BenchmarkScenario:
+    """One benchmark configuration"""
+    name: str
+    object_types: List[str] = field(default_factory=lambda: list(OBJECT_TYPES))
+    limit: int = 100
+    page_size: int = 50  # My-calls page size for hydrated calls
+    concurrency: int = 1
+    hydrate_calls: bool = False
+    latency_seconds: float = 0.0
+    rate_limit_rate: float = 0.0
+    request_interval: Optional[float] = 0.0  # Client request spacing; None keeps the client default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+DEFAULT_SCENARIOS = [
+    # Same mix and limits as validate_performance
+    BenchmarkScenario('smoke', limit=10),
+    BenchmarkScenario('calls_page_25', object_types=['calls'], limit=500, page_size=25, hydrate_calls=True),
+    BenchmarkScenario('calls_page_100', object_types=['calls'], limit=500, page_size=100, hydrate_calls=True),
+    BenchmarkScenario('hydrated_serial', object_types=['calls'], limit=50, hydrate_calls=True,
+                      concurrency=1, latency_seconds=0.01),
+    BenchmarkScenario('hydrated_concurrent', object_types=['calls'], limit=50, hydrate_calls=True,
+                      concurrency=8, latency_seconds=0.01),
+    BenchmarkScenario('all_objects_concurrent', limit=100, concurrency=6, latency_seconds=0.02),
+    BenchmarkScenario('throttled', limit=100, rate_limit_rate=0.05)
+]
+
+
+class BenchmarkError(Exception):
+    """Raised when a benchmark can't be configured or run"""
+    pass
+
+
+def summarize_durations(durations: List[float]) -> Dict[str, Any]:
+    """Mean, median, spread and nearest-rank percentiles for a list of durations in seconds"""
+    ordered = sorted(durations)
+    return {
+        'runs': len(ordered),
+        'mean_seconds': round(statistics.mean(ordered), 4) if ordered else None,
+        'stdev_seconds': round(statistics.stdev(ordered), 4) if len(ordered) > 1 else 0.0,
+        'min_seconds': round(ordered[0], 4) if ordered else None,
+        'max_seconds': round(ordered[-1], 4) if ordered else None,
+        'median_seconds': round(statistics.median(ordered), 4) if ordered else None,
+        'p50_seconds': round(percentile(ordered, 50), 4) if ordered else None,
+        'p90_seconds': round(percentile(ordered, 90), 4) if ordered else None
+    }
+
+
+def measure(operation: Callable[[], Any], warmup: int = 1, repeats: int = 5) -> Dict[str, Any]:
+    """
+    Time an operation repeatedly after warmup runs.
+
+    Returns:
+        summarize_durations() output plus 'durations' and 'last_result'
+    """
+    for _ in range(warmup):
+        operation()
+
+    durations = []
+    result = None
+    for _ in range(max(1, repeats)):
+        start = time.perf_counter()
+        result = operation()
+        durations.append(time.perf_counter() - start)
+
+    summary = summarize_durations(durations)
+    summary['durations'] = [round(duration, 4) for duration in durations]
+    summary['last_result'] = result
+    return summary
+
+
+class _BenchmarkAuthManager:
+    """Serves a fixed session to GongAPIClient without token validation"""
+
+    def __init__(self, session):
+        self.current_session = session
+
+    def get_current_session(self):
+        return self.current_session
+
+    def get_session_headers(self, session) -> Dict[str, str]:
+        return {'Accept': 'application/json'}
+
+    def get_base_url(self, session) -> str:
+        return f"https://{session.cell_id}.app.gong.io"
+
+
+def build_client(backend: BenchmarkBackend, scenario: BenchmarkScenario):
+    """Create a GongAPIClient whose HTTP session is the benchmark backend"""
+    from ..api_client import GongAPIClient
+    from ..data_models import GongSession
+
+    session = GongSession(session_id='benchmark', user_email='benchmark@example.com', cell_id='us-00000')
+    client = GongAPIClient(auth_manager=_BenchmarkAuthManager(session))
+    client.session = backend
+    if scenario.request_interval is not None:
+        client.min_request_interval = scenario.request_interval
+    return client
+
+
+def build_agent(backend: BenchmarkBackend, scenario: BenchmarkScenario):
+    """Create a GongAgent whose API client's HTTP session is the benchmark backend"""
+    from ..agent import GongAgent
+
+    client = build_client(backend, scenario)
+    # No stats caching between runs, so every repeat measures the fan-out itself
+    agent = GongAgent(auth_provider=None, config={'stats_cache_ttl_seconds': 0})
+    agent.api_client = client
+    agent.session = client.auth_manager.get_current_session()
+    # The backend can't reauthenticate; auth failures count as errors
+    agent.disable_auto_refresh()
+    return agent
+
+
+# Object type -> GongAgent extraction for a scenario
+AGENT_EXTRACTIONS: Dict[str, Callable[[Any, BenchmarkScenario], Any]] = {
+    'calls': lambda agent, scenario: (
+        agent.extract_calls_hydrated(
+            limit=scenario.limit,
+            page_size=scenario.page_size,
+            detail_workers=scenario.concurrency,
+            transcript_workers=scenario.concurrency
+        )['calls'] if scenario.hydrate_calls else agent.extract_calls(limit=scenario.limit)
+    ),
+    'users': lambda agent, scenario: agent.extract_users(),
+    'deals': lambda agent, scenario: agent.extract_deals(limit=scenario.limit),
+    'conversations': lambda agent, scenario: agent.extract_conversations(limit=scenario.limit),
+    'library': lambda agent, scenario: agent.extract_library(),
+    'team_stats': lambda agent, scenario: agent.extract_team_stats()
+}
+
+
+def _extract_object_type(agent, scenario: BenchmarkScenario, object_type: str) -> Any:
+    if object_type not in AGENT_EXTRACTIONS:
+        raise BenchmarkError(f"Unknown object type: {object_type}")
+    return AGENT_EXTRACTIONS[object_type](agent, scenario)
+
+
+def run_extraction(agent, scenario: BenchmarkScenario) -> Dict[str, Any]:
+    """
+    Extract the scenario's object mix through a GongAgent, running up to
+    scenario.concurrency object types at once.
+
+    Returns:
+        Dict with 'items', 'succeeded' and 'errors'
+    """
+    outcome = {'items': 0, 'succeeded': 0, 'errors': []}
+    workers = max(1, min(scenario.concurrency, len(scenario.object_types)))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gong-bench") as executor:
+        futures = {
+            executor.submit(_extract_object_type, agent, scenario, object_type): object_type
+            for object_type in scenario.object_types
+        }
+        for future, object_type in futures.items():
+            try:
+                records = future.result()
+            except Exception as e:
+                outcome['errors'].append(f"{object_type}: {e}")
+                continue
+            outcome['succeeded'] += 1
+            outcome['items'] += len(records) if isinstance(records, list) else 1
+
+    return outcome
+
+
+class BenchmarkSuite:
+    """
+    Runs benchmark scenarios against an offline backend.
+
+    Each scenario gets a fresh backend (with the scenario's latency and 429
+    settings) and agent, warmup runs, then timed repeats.
+    """
+
+    def __init__(self, backend_factory: Optional[Callable[[BenchmarkScenario], BenchmarkBackend]] = None,
+                 agent_factory: Callable[[BenchmarkBackend, BenchmarkScenario], Any] = build_agent,
+                 warmup: int = 1, repeats: int = 5, seed: int = 0):
+        """
+        Initialize the suite.
+
+        Args:
+            backend_factory: Builds a backend for a scenario (default: SyntheticBackend)
+            agent_factory: Builds a GongAgent on top of a backend
+            warmup: Untimed runs before measuring
+            repeats: Timed runs per scenario
+            seed: Random seed for injected faults
+        """
+        self.backend_factory = backend_factory or self._synthetic_backend
+        self.agent_factory = agent_factory
+        self.warmup = warmup
+        self.repeats = repeats
+        self.seed = seed
+        self.backend_name = 'synthetic'
+
+    @classmethod
+    def recorded(cls, har_path: Union[str, Path], **kwargs) -> 'BenchmarkSuite':
+        """Create a suite replaying responses recorded in a HAR file"""
+        if not Path(har_path).exists():
+            raise BenchmarkError(f"HAR file not found: {har_path}")
+
+        suite = cls(**kwargs)
+        suite.backend_factory = lambda scenario: RecordedBackend.from_har(
+            har_path,
+            latency_seconds=scenario.latency_seconds,
+            rate_limit_rate=scenario.rate_limit_rate,
+            seed=suite.seed
+        )
+        suite.backend_name = f'recorded:{Path(har_path).name}'
+        return suite
+
+    def _synthetic_backend(self, scenario: BenchmarkScenario) -> BenchmarkBackend:
+        return SyntheticBackend(
+            calls=max(scenario.limit, 1000),
+            deals=max(scenario.limit, 500),
+            latency_seconds=scenario.latency_seconds,
+            rate_limit_rate=scenario.rate_limit_rate,
+            seed=self.seed
+        )
+
+    def run_scenario(self, scenario: BenchmarkScenario) -> Dict[str, Any]:
+        """
+        Measure one scenario.
+
+        Returns:
+            Dict with the scenario settings, duration summary and per-run
+            items, requests, 429s and errors (from the last run)
+        """
+        backend = self.backend_factory(scenario)
+        agent = self.agent_factory(backend, scenario)
+
+        def _operation():
+            backend.reset_counters()
+            return run_extraction(agent, scenario)
+
+        logger.info(f"Benchmarking scenario {scenario.name} ({self.warmup} warmup, {self.repeats} runs)")
+        measurement = measure(_operation, warmup=self.warmup, repeats=self.repeats)
+        outcome = measurement.pop('last_result')
+
+        measurement.update({
+            'scenario': scenario.to_dict(),
+            'items': outcome['items'],
+            'object_types_succeeded': outcome['succeeded'],
+            'errors': outcome['errors'],
+            'requests': backend.request_count,
+            'rate_limited': backend.rate_limited_count
+        })
+        if measurement['mean_seconds']:
+            measurement['items_per_second'] = round(outcome['items'] / measurement['mean_seconds'], 2)
+        return measurement
+
+    def run(self, scenarios: Optional[List[BenchmarkScenario]] = None) -> Dict[str, Any]:
+        """
+        Run scenarios (default: DEFAULT_SCENARIOS).
+
+        Returns:
+            JSON-serializable results keyed by scenario name
+        """
+        scenarios = scenarios if scenarios is not None else DEFAULT_SCENARIOS
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'backend': self.backend_name,
+            'warmup': self.warmup,
+            'repeats': self.repeats,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'scenarios': {scenario.name: self.run_scenario(scenario) for scenario in scenarios}
+        }
+
+
+def save_results(results: Dict[str, Any], output_path: Union[str, Path]) -> Path:
+    """Write benchmark results as JSON"""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+    return output_path
+
+
+def load_results(path: Union[str, Path]) -> Dict[str, Any]:
+    """Load benchmark results (e.g. a stored baseline)"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any],
+                        tolerance: float = 0.10, metric: str = 'p50_seconds') -> List[Dict[str, Any]]:
+    """
+    Find scenarios that got slower than the baseline.
+
+    Args:
+        results: Output of BenchmarkSuite.run()
+        baseline: Earlier results to compare against
+        tolerance: Allowed slowdown as a fraction (0.10 = 10%)
+        metric: Duration metric to compare
+
+    Returns:
+        One dict per regressed scenario with 'scenario', 'metric',
+        'baseline', 'current' and 'change' (fractional slowdown)
+    """
+    regressions = []
+    baseline_scenarios = baseline.get('scenarios', {})
+
+    for name, current in results.get('scenarios', {}).items():
+        previous = baseline_scenarios.get(name)
+        if not previous or not previous.get(metric) or current.get(metric) is None:
+            continue
+
+        change = (current[metric] - previous[metric]) / previous[metric]
+        if change > tolerance:
+            regressions.append({
+                'scenario': name,
+                'metric': metric,
+                'baseline': previous[metric],
+                'current': current[metric],
+                'change': round(change, 4)
+            })
+
+    return regressions
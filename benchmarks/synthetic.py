@@ -0,0 +1,461 @@
+"""
+Module: synthetic
+Type: Internal Module
+
+Purpose:
+Deterministic, seeded generator of realistic Gong payloads at scale:
+my-calls pages, get-board-deals responses, users, conversations, detailed
+transcripts, team stats and HAR captures with JWT cookies.
+
+Data Flow:
+- Input: Seed and dataset sizes
+- Processing: Per-record seeded generation (any record can be produced
+  without generating the ones before it)
+- Output: Raw API payload dictionaries, HAR files
+
+Critical Because:
+Parsers and extractors have to be benchmarked at 10k-1M records, far
+beyond what the validation/ fixtures hold. Generating lazily and per
+record keeps that cheap and repeatable.
+
+Dependencies:
+- Requires: random, json, base64, gzip, extraction.team_stats
+- Used By: benchmarks.backends.SyntheticBackend, tests
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import base64
+import gzip
+import json
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from extraction.team_stats import TEAM_METRICS
+
+FIRST_NAMES = ['Ava', 'Brian', 'Chen', 'Daryl', 'Elena', 'Farid', 'Grace', 'Hiro', 'Ian', 'Julia',
+               'Krista', 'Luis', 'Maya', 'Noah', 'Olga', 'Priya', 'Quinn', 'Rodric', 'Sachin', 'Tara']
+LAST_NAMES = ['Anders', 'Brooks', 'Coons', 'Diaz', 'Evans', 'Fischer', 'Garcia', 'Haddad', 'Ito',
+              'Khalsa', 'Lopez', 'Martis', 'Nguyen', 'Okafor', 'Payne', 'Rabbah', 'Schwartz', 'Tanaka']
+TITLES = ['Account Executive', 'Customer Success Manager', 'Solutions Engineer', 'Sales Development Rep',
+          'Strategic Account Director', 'Head of Product', 'VP Sales', 'Director, Product Management']
+COMPANY_WORDS = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Stark', 'Wayne', 'Hooli', 'Vandelay',
+                 'Soylent', 'Tyrell', 'Cyberdyne', 'Wonka', 'Aperture', 'Massive', 'Dynamic', 'Blue']
+COMPANY_SUFFIXES = ['Systems', 'Labs', 'Financial', 'Health', 'Networks', 'Logistics', 'Software', 'Energy']
+INDUSTRIES = ['Software', 'Financial Services', 'Healthcare', 'Retail', 'Manufacturing', 'Media']
+CALL_TOPICS = ['Discovery', 'Demo', 'Pricing Review', 'Technical Deep Dive', 'QBR', 'Onboarding',
+               'Renewal Sync', 'Security Review', 'Executive Alignment', 'Support Sync']
+TRANSCRIPT_TOPICS = ['Small Talk', 'Agenda', 'Pain Points', 'Product Demo', 'Pricing', 'Next Steps']
+WORDS = ('we the integration pricing timeline security team roll out api budget contract renewal '
+         'onboarding workflow dashboard adoption users license quarter review proposal legal '
+         'procurement stakeholder champion requirements pilot success metrics support migration '
+         'yes okay sounds great makes sense so let me share my screen next week follow up').split()
+DEAL_STAGES = ['prospecting', 'qualification', 'proposal', 'negotiation', 'closed_won', 'closed_lost']
+CALL_TYPES = ['video', 'video', 'video', 'phone', 'meeting']
+PERIOD_DAYS = {'week': 7, 'month': 30, 'quarter': 90}
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def make_jwt(payload: Dict[str, Any], signature: str = 'synthetic-signature') -> str:
+    """Encode an (unsigned) JWT with the given payload"""
+    header = _b64url(json.dumps({'alg': 'HS256', 'typ': 'JWT'}, separators=(',', ':')).encode())
+    body = _b64url(json.dumps(payload, separators=(',', ':')).encode())
+    return f"{header}.{body}.{_b64url(signature.encode())}"
+
+
+class SyntheticGongData:
+    """
+    Seeded generator of Gong payloads.
+
+    Every record is generated from (seed, kind, index), so page N can be
+    produced without generating pages 0..N-1 and the same seed always
+    yields the same data.
+    """
+
+    def __init__(self, seed: int = 0, calls: int = 1000, deals: int = 500, users: int = 50,
+                 accounts: int = 100, transcript_segments: int = 2000, cell_id: str = 'us-14496',
+                 company_domain: str = 'example.com', start: Optional[datetime] = None):
+        """
+        Initialize dataset sizes.
+
+        Args:
+            seed: Random seed
+            calls: Calls (and conversations) in the tenant
+            deals: Deals in the tenant
+            users: Internal users in the tenant
+            accounts: Customer accounts calls and deals are spread across
+            transcript_segments: Default segments per detailed transcript
+            cell_id: Gong cell the tenant lives on
+            company_domain: Email domain of internal users
+            start: Timestamp of the most recent call (default: 2025-06-20 UTC)
+        """
+        self.seed = seed
+        self.calls = calls
+        self.deals = deals
+        self.users = max(users, 1)
+        self.accounts = max(accounts, 1)
+        self.transcript_segments = transcript_segments
+        self.cell_id = cell_id
+        self.company_domain = company_domain
+        self.start = start or datetime(2025, 6, 20, 15, 0, tzinfo=timezone.utc)
+
+    def _rng(self, kind: str, index: Any) -> random.Random:
+        return random.Random(f"{self.seed}:{kind}:{index}")
+
+    @staticmethod
+    def _index(record_id: str) -> int:
+        suffix = str(record_id).rsplit('_', 1)[-1]
+        return int(suffix) if suffix.isdigit() else 0
+
+    @staticmethod
+    def _window(total: int, limit: int, offset: int) -> range:
+        return range(min(offset, total), min(offset + limit, total))
+
+    @staticmethod
+    def _epoch_ms(moment: datetime) -> int:
+        return int(moment.timestamp() * 1000)
+
+    # ============================================================================
+    # Users & Accounts
+    # ============================================================================
+
+    def user(self, index: int) -> Dict[str, Any]:
+        rng = self._rng('user', index)
+        first = FIRST_NAMES[index % len(FIRST_NAMES)]
+        last = LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        return {
+            'id': f'user_{index}',
+            'name': f'{first} {last}',
+            'firstName': first,
+            'lastName': last,
+            'email': f'{first.lower()}.{last.lower()}{index}@{self.company_domain}',
+            'title': rng.choice(TITLES),
+            'managerId': f'user_{index // 8}' if index >= 8 else None,
+            'isActive': rng.random() > 0.05,
+            'created': self._epoch_ms(self.start - timedelta(days=rng.randint(30, 1500)))
+        }
+
+    def users_response(self) -> Dict[str, Any]:
+        """/ajax/stats/get-users response"""
+        return {'users': [self.user(i) for i in range(self.users)]}
+
+    def account(self, index: int) -> Dict[str, Any]:
+        rng = self._rng('account', index)
+        name = f"{COMPANY_WORDS[index % len(COMPANY_WORDS)]} {COMPANY_SUFFIXES[(index // len(COMPANY_WORDS)) % len(COMPANY_SUFFIXES)]}"
+        if index >= len(COMPANY_WORDS) * len(COMPANY_SUFFIXES):
+            name = f"{name} {index}"
+        domain = name.lower().replace(' ', '') + '.com'
+        return {
+            'id': f'account_{index}',
+            'name': name,
+            'domain': domain,
+            'industry': rng.choice(INDUSTRIES),
+            'employees': rng.choice([50, 200, 1000, 5000, 20000]),
+            'ownerEmail': self.user(index % self.users)['email']
+        }
+
+    def contact(self, account_index: int, index: int) -> Dict[str, Any]:
+        account = self.account(account_index)
+        first = FIRST_NAMES[(account_index + index * 7) % len(FIRST_NAMES)]
+        last = LAST_NAMES[(account_index * 3 + index) % len(LAST_NAMES)]
+        return {
+            'email': f'{first.lower()}.{last.lower()}@{account["domain"]}',
+            'name': f'{first} {last}',
+            'title': TITLES[(account_index + index) % len(TITLES)],
+            'company': account['name'],
+            'accountId': account['id']
+        }
+
+    # ============================================================================
+    # Calls & Conversations
+    # ============================================================================
+
+    def call(self, index: int) -> Dict[str, Any]:
+        """One call as listed on the my-calls page"""
+        rng = self._rng('call', index)
+        account_index = rng.randrange(self.accounts)
+        account = self.account(account_index)
+        host_index = rng.randrange(self.users)
+        host = self.user(host_index)
+        started = self.start - timedelta(minutes=45 * index + rng.randint(0, 30))
+        duration = rng.randint(5, 75) * 60
+
+        participants = [{'userId': host['id'], 'email': host['email'], 'name': host['name'],
+                         'isHost': True, 'isInternal': True}]
+        for i in range(rng.randint(0, 2)):
+            colleague = self.user((host_index + i + 1) % self.users)
+            participants.append({'userId': colleague['id'], 'email': colleague['email'],
+                                 'name': colleague['name'], 'isHost': False, 'isInternal': True})
+        for i in range(rng.randint(1, 3)):
+            contact = self.contact(account_index, i)
+            participants.append({'email': contact['email'], 'name': contact['name'],
+                                 'isHost': False, 'isInternal': False})
+
+        return {
+            'id': f'call_{index}',
+            'title': f"{account['name']} | {rng.choice(CALL_TOPICS)}",
+            'callType': rng.choice(CALL_TYPES),
+            'startTime': self._epoch_ms(started),
+            'duration': duration,
+            'hostEmail': host['email'],
+            'accountId': account['id'],
+            'accountName': account['name'],
+            'opportunityId': f'deal_{rng.randrange(max(self.deals, 1))}' if self.deals else None,
+            'participants': participants,
+            'isPrivate': rng.random() < 0.03,
+            'language': 'English',
+            'url': f"https://{self.cell_id}.app.gong.io/call?id=call_{index}"
+        }
+
+    def iter_calls(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Lazily generate calls [start, stop)"""
+        for index in range(start, self.calls if stop is None else min(stop, self.calls)):
+            yield self.call(index)
+
+    def calls_page(self, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """/ajax/home/calls/my-calls response"""
+        window = self._window(self.calls, limit, offset)
+        return {
+            'calls': [self.call(i) for i in window],
+            'totalCount': self.calls,
+            'hasMore': window.stop < self.calls
+        }
+
+    def call_details(self, call_id: str) -> Dict[str, Any]:
+        """/call/{id} response"""
+        index = self._index(call_id)
+        rng = self._rng('call_details', index)
+        details = self.call(index)
+        details.update({
+            'id': call_id,
+            'talkRatio': round(rng.uniform(0.3, 0.7), 2),
+            'longestMonologueSeconds': rng.randint(30, 400),
+            'interactivity': round(rng.uniform(2, 12), 1),
+            'patience': round(rng.uniform(0.4, 2.5), 2),
+            'topics': rng.sample(TRANSCRIPT_TOPICS, 3),
+            'trackers': [{'name': word, 'count': rng.randint(1, 9)} for word in rng.sample(WORDS, 4)]
+        })
+        return details
+
+    def transcript(self, call_id: str, segments: Optional[int] = None) -> Dict[str, Any]:
+        """
+        /call/{id}/detailed-transcript response.
+
+        Args:
+            call_id: Call identifier
+            segments: Segment count (default: transcript_segments)
+        """
+        call = self.call(self._index(call_id))
+        rng = self._rng('transcript', call_id)
+        speakers = call['participants']
+        segment_count = self.transcript_segments if segments is None else segments
+
+        position_ms = 0
+        transcript_segments = []
+        for i in range(segment_count):
+            speaker = speakers[rng.randrange(len(speakers))]
+            words = rng.randint(3, 40)
+            length_ms = words * rng.randint(250, 450)
+            transcript_segments.append({
+                'segmentId': f'{call_id}_seg_{i}',
+                'speakerEmail': speaker['email'],
+                'speakerName': speaker['name'],
+                'isCustomer': not speaker['isInternal'],
+                'topic': TRANSCRIPT_TOPICS[min(i * len(TRANSCRIPT_TOPICS) // max(segment_count, 1),
+                                               len(TRANSCRIPT_TOPICS) - 1)],
+                'start': position_ms,
+                'end': position_ms + length_ms,
+                'text': ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.',
+                'confidence': round(rng.uniform(0.82, 0.99), 3)
+            })
+            position_ms += length_ms + rng.randint(100, 1500)
+
+        return {'callId': call_id, 'language': 'English', 'segments': transcript_segments}
+
+    def conversations_page(self, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """/conversations/ajax/results response"""
+        conversations = []
+        for index in self._window(self.calls, limit, offset):
+            call = self.call(index)
+            conversations.append({
+                'conversationId': call['id'],
+                'title': call['title'],
+                'started': call['startTime'],
+                'duration': call['duration'],
+                'accountId': call['accountId'],
+                'participants': [participant['email'] for participant in call['participants']]
+            })
+        return {'conversations': conversations, 'totalCount': self.calls}
+
+    # ============================================================================
+    # Deals
+    # ============================================================================
+
+    def deal(self, index: int) -> Dict[str, Any]:
+        rng = self._rng('deal', index)
+        account = self.account(rng.randrange(self.accounts))
+        stage = rng.choice(DEAL_STAGES)
+        created = self.start - timedelta(days=rng.randint(10, 400))
+        return {
+            'id': f'deal_{index}',
+            'name': f"{account['name']} - {rng.choice(['New Business', 'Expansion', 'Renewal'])}",
+            'accountId': account['id'],
+            'accountName': account['name'],
+            'ownerEmail': self.user(rng.randrange(self.users))['email'],
+            'stage': stage,
+            'amount': float(rng.randint(5, 500) * 1000),
+            'currency': 'USD',
+            'probability': {'prospecting': 10, 'qualification': 25, 'proposal': 50,
+                            'negotiation': 75, 'closed_won': 100, 'closed_lost': 0}[stage],
+            'closeDate': (created + timedelta(days=rng.randint(30, 180))).date().isoformat(),
+            'isWon': stage == 'closed_won',
+            'isLost': stage == 'closed_lost',
+            'created': self._epoch_ms(created),
+            'lastActivity': self._epoch_ms(created + timedelta(days=rng.randint(0, 10)))
+        }
+
+    def deals_page(self, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """/dealswebapi/ajax/deals/get-board-deals response"""
+        window = self._window(self.deals, limit, offset)
+        return {
+            'deals': [self.deal(i) for i in window],
+            'totalCount': self.deals,
+            'hasMore': window.stop < self.deals
+        }
+
+    # ============================================================================
+    # Library & Stats
+    # ============================================================================
+
+    def library(self, folders: int = 20) -> Dict[str, Any]:
+        """/library/get-library-data response"""
+        rng = self._rng('library', 0)
+        return {'folders': [
+            {'id': f'folder_{i}', 'name': f'{rng.choice(CALL_TOPICS)} examples {i}',
+             'callIds': [f'call_{rng.randrange(max(self.calls, 1))}' for _ in range(rng.randint(1, 10))]}
+            for i in range(folders)
+        ]}
+
+    def team_stats(self, metric: str, period: str = 'week') -> Dict[str, Any]:
+        """/stats/ajax/v2/team/activity/aggregated/{metric} response"""
+        rng = self._rng(f'team_stats:{metric}:{period}', 0)
+        days = PERIOD_DAYS.get(period, 7)
+        return {
+            'metric': metric,
+            'period': period,
+            'value': round(rng.uniform(1200, 3000), 1) if 'Duration' in metric else rng.randint(10, 500) * days // 7,
+            'users': [
+                {'userId': f'user_{i}',
+                 'value': round(rng.uniform(600, 3600), 1) if 'Duration' in metric else rng.randint(0, 60)}
+                for i in range(self.users)
+            ]
+        }
+
+    # ============================================================================
+    # HAR Captures
+    # ============================================================================
+
+    def jwt_cookies(self, user_index: int = 0, expires_in: int = 3600,
+                    issued_at: Optional[int] = None) -> List[Dict[str, Any]]:
+        """last_login_jwt and cell_jwt cookies for a user"""
+        user = self.user(user_index)
+        iat = issued_at if issued_at is not None else int(self.start.timestamp())
+        cookies = []
+        for name in ('last_login_jwt', 'cell_jwt'):
+            payload = {'gp': 'Okta', 'exp': iat + expires_in, 'iat': iat,
+                       'jti': f'{self.seed}-{name}-{user_index}', 'gu': user['email'], 'cell': self.cell_id}
+            cookies.append({'name': name, 'value': make_jwt(payload), 'domain': '.app.gong.io',
+                            'path': '/', 'httpOnly': True, 'secure': True})
+        return cookies
+
+    def har(self, entries: int = 100, user_index: int = 0, expires_in: int = 3600,
+            issued_at: Optional[int] = None, noise_ratio: float = 0.3) -> Dict[str, Any]:
+        """
+        HAR capture of a browsing session.
+
+        Args:
+            entries: Number of HAR entries
+            user_index: User whose JWT cookies are captured
+            expires_in: JWT lifetime in seconds
+            issued_at: JWT iat (default: start timestamp)
+            noise_ratio: Fraction of entries to non-Gong domains (CDNs, analytics)
+        """
+        rng = self._rng('har', user_index)
+        cookies = self.jwt_cookies(user_index, expires_in, issued_at)
+        session_cookies = [
+            {'name': 'g-session', 'value': f'{rng.getrandbits(128):032x}'},
+            {'name': 'AWSALB', 'value': f'{rng.getrandbits(160):040x}'},
+            {'name': 'AWSALBTG', 'value': f'{rng.getrandbits(160):040x}'},
+            {'name': 'ajs_user_id', 'value': self.user(user_index)['id']},
+            {'name': 'ajs_group_id', 'value': self.cell_id}
+        ]
+        base_url = f"https://{self.cell_id}.app.gong.io"
+        gong_requests = [
+            ('GET', '/ajax/home/calls/my-calls', lambda i: self.calls_page(limit=10, offset=i * 10)),
+            ('GET', '/ajax/stats/get-users', lambda i: self.users_response()),
+            ('POST', '/dealswebapi/ajax/deals/get-board-deals', lambda i: self.deals_page(limit=10, offset=i * 10)),
+            ('GET', '/ajax/common/rtkn', lambda i: {'token': f'{rng.getrandbits(64):016x}'})
+        ]
+        started = self.start
+
+        har_entries = []
+        for i in range(entries):
+            timestamp = (started + timedelta(seconds=i)).isoformat()
+            if rng.random() < noise_ratio:
+                har_entries.append({
+                    'startedDateTime': timestamp,
+                    'time': rng.randint(5, 80),
+                    'request': {'method': 'GET', 'url': f'https://cdn.example-analytics.com/collect?e={i}',
+                                'headers': [], 'cookies': [], 'queryString': []},
+                    'response': {'status': 204, 'headers': [], 'cookies': [],
+                                 'content': {'size': 0, 'mimeType': 'text/plain'}}
+                })
+                continue
+
+            method, path, body = gong_requests[i % len(gong_requests)]
+            text = json.dumps(body(i // len(gong_requests)))
+            har_entries.append({
+                'startedDateTime': timestamp,
+                'time': rng.randint(40, 600),
+                'request': {
+                    'method': method,
+                    'url': f'{base_url}{path}',
+                    'headers': [{'name': 'Host', 'value': f'{self.cell_id}.app.gong.io'},
+                                {'name': 'X-Requested-With', 'value': 'XMLHttpRequest'}],
+                    'cookies': cookies + session_cookies,
+                    'queryString': []
+                },
+                'response': {
+                    'status': 200,
+                    'headers': [{'name': 'Content-Type', 'value': 'application/json'}],
+                    'cookies': cookies if i == 0 else [],
+                    'content': {'size': len(text), 'mimeType': 'application/json', 'text': text}
+                }
+            })
+
+        return {'log': {'version': '1.2', 'creator': {'name': 'gong-synthetic', 'version': '1.0'},
+                        'entries': har_entries}}
+
+    def write_har(self, path: Union[str, Path], compress: Optional[bool] = None, **kwargs) -> Path:
+        """
+        Write a HAR capture to disk (gzip-compressed for .gz paths).
+
+        Args:
+            path: Output path
+            compress: Force gzip on or off (default: by .gz suffix)
+            **kwargs: Passed to har()
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        compress = path.suffix == '.gz' if compress is None else compress
+        opener = gzip.open if compress else open
+        with opener(path, 'wt', encoding='utf-8') as f:
+            json.dump(self.har(**kwargs), f)
+        return path
@@ -14,15 +14,16 @@ Critical Because:
 Central integration point for Gong - without this, no Gong data can be accessed.
 
 Dependencies:
-- Requires: pydantic, enum
+- Requires: pydantic, enum, bisect
 - Used By: app_backend.ingestion.orchestrator, app_backend.api_bridge.server
 
 Author: Julia Evans
 Date: 2025-06-20
 """
+from bisect import bisect_left
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Union
-from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Optional, List, Dict, Any, Tuple, Union
+from pydantic import BaseModel, Field, PrivateAttr, computed_field, field_validator, model_validator
 from enum import Enum
 
 
@@ -96,10 +97,15 @@ class GongAuthenticationToken(BaseModel):
     payload: GongJWTPayload = Field(..., description="Decoded JWT payload")
     expires_at: datetime = Field(..., description="Token expiration time")
     issued_at: datetime = Field(..., description="Token issued time")
-    is_expired: bool = Field(..., description="Whether token is expired")
     cell_id: Optional[str] = Field(None, description="Gong cell identifier")
     user_email: str = Field(..., description="User email from token")
     
+    @computed_field
+    @property
+    def is_expired(self) -> bool:
+        """Whether the token is expired now (evaluated against expires_at on every access)"""
+        return datetime.now() > self.expires_at
+    
     @model_validator(mode='before')
     @classmethod
     def validate_token_consistency(cls, values):
@@ -111,7 +117,6 @@ class GongAuthenticationToken(BaseModel):
                 values['cell_id'] = payload.cell
                 values['expires_at'] = datetime.fromtimestamp(payload.exp)
                 values['issued_at'] = datetime.fromtimestamp(payload.iat)
-                values['is_expired'] = datetime.now().timestamp() > payload.exp
         return values
 
 
@@ -128,6 +133,11 @@ class GongSession(BaseModel):
     last_activity: datetime = Field(default_factory=datetime.now)
     is_active: bool = Field(True, description="Whether session is active")
     
+    # Sorted token expiry timestamps, rebuilt whenever the tokens' expires_at
+    # values change (tokens added, removed, replaced or edited in place)
+    _token_expiries: Tuple[float, ...] = PrivateAttr(default=())
+    _token_expiries_key: Optional[Tuple[datetime, ...]] = PrivateAttr(default=None)
+    
     @field_validator('cell_id')
     @classmethod
     def validate_cell_format(cls, v):
@@ -135,6 +145,39 @@ class GongSession(BaseModel):
         if v and len(v) < 3:  # Allow empty string, but if provided must be ≥3 chars
             raise ValueError("Invalid cell ID format")
         return v
+    
+    def refresh_expiry_bounds(self) -> None:
+        """Recompute expiry bounds (the bounds also refresh on their own when any expires_at changes)"""
+        key = tuple(token.expires_at for token in self.authentication_tokens)
+        self._token_expiries = tuple(sorted(expires_at.timestamp() for expires_at in key))
+        self._token_expiries_key = key
+    
+    def _expiries(self) -> Tuple[float, ...]:
+        # Comparing the few expires_at values is cheap next to converting and sorting them
+        if self._token_expiries_key != tuple(token.expires_at for token in self.authentication_tokens):
+            self.refresh_expiry_bounds()
+        return self._token_expiries
+    
+    @property
+    def earliest_expiry(self) -> Optional[datetime]:
+        """When the first token expires"""
+        expiries = self._expiries()
+        return datetime.fromtimestamp(expiries[0]) if expiries else None
+    
+    @property
+    def latest_expiry(self) -> Optional[datetime]:
+        """When the last token expires (the session is unusable after this)"""
+        expiries = self._expiries()
+        return datetime.fromtimestamp(expiries[-1]) if expiries else None
+    
+    def has_valid_token(self, now: Optional[datetime] = None) -> bool:
+        """Whether any token is unexpired at now"""
+        expiries = self._expiries()
+        return bool(expiries) and expiries[-1] >= (now or datetime.now()).timestamp()
+    
+    def expired_token_count(self, now: Optional[datetime] = None) -> int:
+        """Number of tokens expired at now"""
+        return bisect_left(self._expiries(), (now or datetime.now()).timestamp())
 
 
 # ============================================================================
@@ -0,0 +1,68 @@
+"""
+Module: __init__
+Type: Internal Module
+
+Purpose:
+Extraction planning and execution helpers for bulk Gong data extraction.
+
+Data Flow:
+- Input: GongAPIClient, Configuration parameters
+- Processing: Data extraction, API interaction
+- Output: Processed results
+
+Critical Because:
+Bulk extraction throughput depends on overlapping independent requests.
+
+Dependencies:
+- Requires: pipeline, deadline, stats, backfill, team_stats, user_stats, account_360
+- Used By: agent, app_backend.ingestion.orchestrator
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+from .account_360 import Account360Crawler
+from .backfill import (
+    BackfillShard,
+    ShardedBackfill,
+    account_shards,
+    date_window_shards,
+    offset_shards
+)
+from .deadline import Deadline
+from .pipeline import (
+    ExtractionPipeline,
+    ExtractionPipelineError
+)
+from .stats import ExtractionStatsTracker
+from .team_stats import (
+    StatsCache,
+    StatsFanout,
+    StatsRequest,
+    plan_stats_requests
+)
+from .user_stats import (
+    UserStatsMatrix,
+    build_user_stats_matrix
+)
+
+__version__ = "1.0.0"
+__author__ = "CS-Ascension Team"
+
+__all__ = [
+    'Account360Crawler',
+    'BackfillShard',
+    'ShardedBackfill',
+    'account_shards',
+    'date_window_shards',
+    'offset_shards',
+    'Deadline',
+    'ExtractionPipeline',
+    'ExtractionPipelineError',
+    'ExtractionStatsTracker',
+    'StatsCache',
+    'StatsFanout',
+    'StatsRequest',
+    'plan_stats_requests',
+    'UserStatsMatrix',
+    'build_user_stats_matrix'
+]
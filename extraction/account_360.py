@@ -0,0 +1,198 @@
+"""
+Module: account_360
+Type: Internal Module
+
+Purpose:
+Account 360 crawler. For many accounts at once, fans out account details,
+people, opportunities and day activities, then contact details and
+engagements for every person, and yields each account as soon as all of
+its parts are in. Contacts shared between accounts are fetched once.
+
+Data Flow:
+- Input: GongAPIClient, account IDs
+- Processing: Thread pool fan-out per account → people → deduplicated
+              contact fetches → per-account assembly
+- Output: Account 360 dicts, streamed in completion order
+
+Critical Because:
+A complete account view took six endpoints called serially by hand per
+account, re-fetching contacts that appear on several accounts.
+
+Dependencies:
+- Requires: concurrent.futures, api_client.GongAPIClient, storage.records
+- Used By: agent.GongAgent.extract_account_360
+
+Error Handling:
+- A failed part is recorded in the account's (or contact's) 'errors' list;
+  the account is still yielded with the parts that succeeded
+- Contacts with failed parts are not cached, so a later crawl fetches them again
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import logging
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from storage.records import get_field
+
+logger = logging.getLogger(__name__)
+
+ACCOUNT_PARTS = ('details', 'people', 'opportunities', 'activities')
+CONTACT_PARTS = ('details', 'engagements')
+
+
+class Account360Crawler:
+    """
+    Concurrent account 360 extraction with contact dedupe.
+
+    At most max_accounts_in_flight accounts are open at once, so memory
+    stays bounded however many account IDs are passed; contacts whose parts
+    all succeeded are kept across crawls so later accounts reuse them.
+    """
+
+    def __init__(self, api_client: Any, max_workers: int = 8,
+                 max_accounts_in_flight: Optional[int] = None,
+                 include_activities: bool = True, activity_date: Optional[str] = None,
+                 include_contacts: bool = True):
+        """
+        Configure the crawler.
+
+        Args:
+            api_client: GongAPIClient
+            max_workers: Concurrent requests
+            max_accounts_in_flight: Accounts crawled at once (default: 2 × max_workers)
+            include_activities: Fetch get_day_activities for each account
+            activity_date: Day for activities (YYYY-MM-DD, default: today)
+            include_contacts: Fetch contact details and engagements for account people
+        """
+        self.api_client = api_client
+        self.max_workers = max(1, max_workers)
+        self.max_accounts_in_flight = max(1, max_accounts_in_flight or 2 * self.max_workers)
+        self.include_activities = include_activities
+        self.activity_date = activity_date
+        self.include_contacts = include_contacts
+        self.contacts: Dict[str, Dict[str, Any]] = {}  # Error-free contacts, reused across crawls
+        self.stats = {'accounts': 0, 'contacts_fetched': 0, 'contacts_reused': 0, 'errors': 0}
+
+    def _account_call(self, part: str, account_id: str) -> Any:
+        if part == 'details':
+            return self.api_client.get_account_details(account_id)
+        if part == 'people':
+            return self.api_client.get_account_people(account_id)
+        if part == 'opportunities':
+            return self.api_client.get_account_opportunities(account_id)
+        return self.api_client.get_day_activities(account_id, self.activity_date)
+
+    def _contact_call(self, part: str, contact_id: str) -> Any:
+        if part == 'details':
+            return self.api_client.get_contact_details(contact_id)
+        return self.api_client.get_contact_engagements(contact_id)
+
+    def crawl(self, account_ids: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Crawl accounts, yielding each one as soon as it is complete.
+
+        Yields:
+            {'account_id', 'details', 'people', 'opportunities', 'activities',
+             'contacts': [{'contact_id', 'details', 'engagements', 'errors'}],
+             'errors': [str]}
+        """
+        account_queue = list(dict.fromkeys(account_ids))
+        account_queue.reverse()
+        parts = ACCOUNT_PARTS if self.include_activities else ACCOUNT_PARTS[:3]
+
+        accounts: Dict[str, Dict[str, Any]] = {}
+        waiting: Dict[str, Set[Tuple[str, str]]] = {}
+        contact_waiters: Dict[str, Set[str]] = {}
+        contact_pending: Dict[str, int] = {}
+        contacts_in_flight: Dict[str, Dict[str, Any]] = {}
+        futures: Dict[Future, Tuple[str, str, str]] = {}
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gong-account360")
+
+        def start_account(account_id: str) -> None:
+            accounts[account_id] = {
+                'account_id': account_id, 'details': None, 'people': [], 'opportunities': [],
+                'activities': [], 'contacts': [], 'errors': []
+            }
+            waiting[account_id] = {('account', part) for part in parts}
+            for part in parts:
+                futures[executor.submit(self._account_call, part, account_id)] = ('account', account_id, part)
+
+        def require_contact(account_id: str, contact_id: str) -> None:
+            if contact_id in self.contacts:
+                accounts[account_id]['contacts'].append(self.contacts[contact_id])
+                self.stats['contacts_reused'] += 1
+                return
+            waiting[account_id].add(('contact', contact_id))
+            contact_waiters.setdefault(contact_id, set()).add(account_id)
+            if contact_id in contacts_in_flight:
+                self.stats['contacts_reused'] += 1
+                return
+            contacts_in_flight[contact_id] = {'contact_id': contact_id, 'details': None,
+                                              'engagements': [], 'errors': []}
+            contact_pending[contact_id] = len(CONTACT_PARTS)
+            self.stats['contacts_fetched'] += 1
+            for part in CONTACT_PARTS:
+                futures[executor.submit(self._contact_call, part, contact_id)] = ('contact', contact_id, part)
+
+        try:
+            while account_queue or futures:
+                while account_queue and len(accounts) < self.max_accounts_in_flight:
+                    start_account(account_queue.pop())
+
+                done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                completed: List[str] = []
+                for future in done:
+                    kind, key, part = futures.pop(future)
+                    try:
+                        value = future.result()
+                        error = None
+                    except Exception as e:
+                        value, error = None, f"{part}: {e}"
+                        self.stats['errors'] += 1
+
+                    if kind == 'account':
+                        account = accounts[key]
+                        if error is not None:
+                            account['errors'].append(error)
+                            logger.warning(f"Account {key} {error}")
+                        else:
+                            account[part] = value if value is not None else account[part]
+                        waiting[key].discard(('account', part))
+                        if part == 'people' and self.include_contacts and error is None:
+                            contact_ids = [get_field(person, 'contact_id') for person in value or []
+                                           if isinstance(person, dict)]
+                            for contact_id in dict.fromkeys(str(cid) for cid in contact_ids if cid is not None):
+                                require_contact(key, contact_id)
+                        completed.append(key)
+                        continue
+
+                    contact = contacts_in_flight[key]
+                    if error is not None:
+                        contact['errors'].append(error)
+                        logger.warning(f"Contact {key} {error}")
+                    else:
+                        contact[part] = value if value is not None else contact[part]
+                    contact_pending[key] -= 1
+                    if contact_pending[key] == 0:
+                        contacts_in_flight.pop(key)
+                        if not contact['errors']:
+                            self.contacts[key] = contact
+                        for account_id in contact_waiters.pop(key, ()):
+                            accounts[account_id]['contacts'].append(contact)
+                            waiting[account_id].discard(('contact', key))
+                            completed.append(account_id)
+
+                for account_id in dict.fromkeys(completed):
+                    if account_id in waiting and not waiting[account_id]:
+                        del waiting[account_id]
+                        self.stats['accounts'] += 1
+                        yield accounts.pop(account_id)
+        finally:
+            # A consumer that stops early shouldn't wait for queued requests
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,346 @@
+"""
+Module: backfill
+Type: Internal Module
+
+Purpose:
+Multi-process sharded backfill. Work is partitioned into shards (call or
+deal offset ranges, conversation date windows, accounts) that run across
+a process pool. Each worker process has its own GongAPIClient; all of
+them share one per-cell rate limit, and the parent merges shard results
+into a single sink as they complete.
+
+Data Flow:
+- Input: GongSession, shards, worker count, optional sink
+- Processing: Process pool → per-worker client (shared cell limiter) →
+              shard pagination → parent-side sink merge
+- Output: Backfill summary {'metadata', 'data'} (data only without a sink)
+
+Critical Because:
+A single process is CPU-bound on JSON decoding during big backfills;
+spreading shards over processes scales with cores, and the shared limiter
+keeps the combined request rate under the cell's limit.
+
+Dependencies:
+- Requires: concurrent.futures, multiprocessing, api_client.GongAPIClient, api_client.rate_limit
+- Used By: agent.GongAgent.run_backfill
+
+Error Handling:
+- A failed shard is recorded in metadata['errors'] and doesn't stop other shards
+- A conversation window that still fills a page at one day is recorded in
+  metadata['truncated_shards']
+- Sink write failures are recorded per shard without stopping the backfill
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Per-process state set up by _init_worker
+_worker_client = None
+_worker_page_size = 100
+
+
+@dataclass
+class BackfillShard:
+    """
+    One unit of backfill work.
+
+    calls/deals shards cover the offset range [start, end); conversations
+    shards cover a date window via filters; accounts shards cover one account.
+    """
+    object_type: str
+    start: int = 0
+    end: Optional[int] = None
+    filters: Dict[str, Any] = field(default_factory=dict)
+    account_id: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        if self.account_id is not None:
+            return f"{self.object_type}[{self.account_id}]"
+        if self.filters:
+            return f"{self.object_type}[{self.filters.get('fromDate')}..{self.filters.get('toDate')}]"
+        return f"{self.object_type}[{self.start}:{'' if self.end is None else self.end}]"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def offset_shards(object_type: str, total: int, shard_size: int) -> List[BackfillShard]:
+    """
+    Split the first total calls or deals into offset ranges.
+
+    Args:
+        object_type: 'calls' or 'deals'
+        total: Number of records to backfill
+        shard_size: Records per shard
+    """
+    if object_type not in ('calls', 'deals'):
+        raise ValueError(f"Offset shards support calls and deals, not {object_type}")
+    if shard_size <= 0:
+        raise ValueError("shard_size must be positive")
+    return [BackfillShard(object_type, start, min(start + shard_size, total))
+            for start in range(0, total, shard_size)]
+
+
+def date_window_shards(start: date, end: date, window_days: int = 7) -> List[BackfillShard]:
+    """
+    Split [start, end) into conversation search windows.
+
+    Args:
+        start: First day to backfill
+        end: Day after the last day to backfill
+        window_days: Days per shard
+    """
+    if window_days <= 0:
+        raise ValueError("window_days must be positive")
+    shards = []
+    window_start = start
+    while window_start < end:
+        window_end = min(window_start + timedelta(days=window_days), end)
+        shards.append(BackfillShard('conversations', filters={
+            'fromDate': window_start.isoformat(),
+            'toDate': window_end.isoformat()
+        }))
+        window_start = window_end
+    return shards
+
+
+def account_shards(account_ids: Iterable[str]) -> List[BackfillShard]:
+    """One shard per account (details, people and opportunities)"""
+    return [BackfillShard('accounts', account_id=account_id) for account_id in account_ids]
+
+
+def _default_client_factory(session: Any) -> Any:
+    """Create a worker's GongAPIClient for the backfill session"""
+    from ..api_client import GongAPIClient
+
+    client = GongAPIClient()
+    client.set_session(session)
+    return client
+
+
+def _init_worker(session: Any, client_factory: Callable[[Any], Any], rate_limiter: Any, page_size: int) -> None:
+    """Create this worker process's client, bound to the shared cell limiter"""
+    global _worker_client, _worker_page_size
+    _worker_client = client_factory(session)
+    if rate_limiter is not None and hasattr(_worker_client, 'set_rate_limiter'):
+        _worker_client.set_rate_limiter(rate_limiter)
+    _worker_page_size = page_size
+
+
+def _fetch_offset_range(fetch: Callable[..., List[Any]], shard: BackfillShard) -> List[Any]:
+    records = []
+    offset = shard.start
+    while shard.end is None or offset < shard.end:
+        limit = _worker_page_size if shard.end is None else min(_worker_page_size, shard.end - offset)
+        page = fetch(limit=limit, offset=offset)
+        records.extend(page)
+        if len(page) < limit:
+            break
+        offset += len(page)
+    return records
+
+
+def _fetch_conversation_window(client: Any, filters: Dict[str, Any]) -> Tuple[List[Any], bool]:
+    """
+    Fetch every conversation in a date window.
+
+    The conversation search takes a limit but no offset or cursor, so a
+    full page means the window may hold more: it is split in half and each
+    half fetched in turn, down to single days.
+
+    Returns:
+        (records, truncated) where truncated means a single-day window (or
+        one without fromDate/toDate) still filled the page
+    """
+    page = client.get_conversations(filters=filters, limit=_worker_page_size)
+    if len(page) < _worker_page_size:
+        return page, False
+    try:
+        window_start = date.fromisoformat(filters['fromDate'])
+        window_end = date.fromisoformat(filters['toDate'])
+    except (KeyError, TypeError, ValueError):
+        return page, True
+    days = (window_end - window_start).days
+    if days <= 1:
+        return page, True
+
+    middle = (window_start + timedelta(days=days // 2)).isoformat()
+    records, truncated = _fetch_conversation_window(client, {**filters, 'toDate': middle})
+    later, later_truncated = _fetch_conversation_window(client, {**filters, 'fromDate': middle})
+    return records + later, truncated or later_truncated
+
+
+def _fetch_account(client: Any, account_id: str) -> List[Dict[str, Any]]:
+    account = dict(client.get_account_details(account_id) or {})
+    account.setdefault('accountId', account_id)
+    account['people'] = client.get_account_people(account_id)
+    account['opportunities'] = client.get_account_opportunities(account_id)
+    return [account]
+
+
+def _run_shard(shard: BackfillShard) -> Dict[str, Any]:
+    """Fetch one shard in a worker process"""
+    start_time = time.perf_counter()
+    client = _worker_client
+    truncated = False
+    try:
+        if shard.object_type == 'calls':
+            records = _fetch_offset_range(client.get_my_calls, shard)
+        elif shard.object_type == 'deals':
+            records = _fetch_offset_range(client.get_deals, shard)
+        elif shard.object_type == 'conversations':
+            records, truncated = _fetch_conversation_window(client, shard.filters)
+        elif shard.object_type == 'accounts':
+            records = _fetch_account(client, shard.account_id)
+        else:
+            raise ValueError(f"Unsupported backfill object type: {shard.object_type}")
+        error = None
+    except Exception as e:
+        records, error = [], str(e)
+
+    return {
+        'shard': shard,
+        'records': records,
+        'error': error,
+        'truncated': truncated,
+        'worker_pid': os.getpid(),
+        'duration_seconds': time.perf_counter() - start_time
+    }
+
+
+class ShardedBackfill:
+    """
+    Runs backfill shards across a process pool and merges them into one sink.
+
+    Shards run in worker processes; sink writes happen in the parent as
+    shards complete, so the sink needs no cross-process support.
+    """
+
+    def __init__(self, session: Any, shards: List[BackfillShard], workers: Optional[int] = None,
+                 sink: Optional[Any] = None, page_size: int = 100,
+                 client_factory: Optional[Callable[[Any], Any]] = None,
+                 rate_limiter: Optional[Any] = None, min_request_interval: float = 0.1,
+                 mp_context: Optional[Any] = None):
+        """
+        Configure the backfill.
+
+        Args:
+            session: GongSession used by every worker
+            shards: Work to run (see offset_shards, date_window_shards, account_shards)
+            workers: Worker processes (default: CPU count, capped at the shard count)
+            sink: Optional storage sink with write(object_type, records); without
+                one, records are returned in the result's 'data'
+            page_size: Records per request within a shard
+            client_factory: Picklable callable(session) -> client for each worker
+                (default: GongAPIClient bound to the session)
+            rate_limiter: Limiter shared by all workers (default: a
+                SharedRateLimiter for the session's cell)
+            min_request_interval: Seconds between requests across all workers
+                when the default limiter is used
+            mp_context: multiprocessing context (default: the platform default)
+        """
+        self.session = session
+        self.shards = list(shards)
+        self.workers = max(1, min(workers or os.cpu_count() or 1, len(self.shards) or 1))
+        self.sink = sink
+        self.page_size = page_size
+        self.client_factory = client_factory or _default_client_factory
+        self.rate_limiter = rate_limiter
+        self.min_request_interval = min_request_interval
+        self.mp_context = mp_context
+
+    def _shared_rate_limiter(self) -> Any:
+        if self.rate_limiter is None:
+            from ..api_client.rate_limit import SharedRateLimiter
+
+            self.rate_limiter = SharedRateLimiter(self.session.cell_id, self.min_request_interval)
+        return self.rate_limiter
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run every shard and merge the results.
+
+        Returns:
+            {'metadata': {'shards', 'successful_shards', 'failed_shards',
+                          'workers', 'records', 'records_by_type',
+                          'duration_seconds', 'errors', 'truncated_shards'},
+             'data': {object_type: records} (only without a sink)}
+        """
+        start_time = time.time()
+        metadata = {
+            'shards': len(self.shards),
+            'successful_shards': 0,
+            'failed_shards': 0,
+            'workers': self.workers,
+            'records': 0,
+            'records_by_type': {},
+            'duration_seconds': 0,
+            'errors': [],
+            'truncated_shards': []
+        }
+        data: Dict[str, List[Any]] = {}
+
+        logger.info(f"Starting sharded backfill: {len(self.shards)} shards on {self.workers} workers")
+
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self.mp_context or multiprocessing.get_context(),
+            initializer=_init_worker,
+            initargs=(self.session, self.client_factory, self._shared_rate_limiter(), self.page_size)
+        )
+        with executor:
+            futures = [executor.submit(_run_shard, shard) for shard in self.shards]
+            for future in as_completed(futures):
+                self._merge(future.result(), metadata, data)
+
+        metadata['duration_seconds'] = round(time.time() - start_time, 2)
+        logger.info(f"Backfill complete: {metadata['successful_shards']}/{metadata['shards']} shards, "
+                    f"{metadata['records']} records in {metadata['duration_seconds']}s")
+
+        result = {'metadata': metadata}
+        if self.sink is None:
+            result['data'] = data
+        return result
+
+    def _merge(self, shard_result: Dict[str, Any], metadata: Dict[str, Any], data: Dict[str, List[Any]]) -> None:
+        """Write one finished shard to the sink (or collect it) and update counters"""
+        shard = shard_result['shard']
+        if shard_result['error'] is not None:
+            metadata['failed_shards'] += 1
+            metadata['errors'].append(f"Shard {shard.label} failed: {shard_result['error']}")
+            logger.error(f"❌ Backfill shard {shard.label} failed: {shard_result['error']}")
+            return
+
+        records = shard_result['records']
+        if self.sink is not None:
+            try:
+                self.sink.write(shard.object_type, records)
+            except Exception as e:
+                metadata['failed_shards'] += 1
+                metadata['errors'].append(f"Sink write failed for shard {shard.label}: {e}")
+                logger.error(f"❌ Sink write failed for shard {shard.label}: {e}")
+                return
+        else:
+            data.setdefault(shard.object_type, []).extend(records)
+
+        if shard_result['truncated']:
+            metadata['truncated_shards'].append(shard.label)
+            logger.warning(f"⚠️ Backfill shard {shard.label} hit the page size of a one-day window; "
+                           f"some conversations may be missing")
+
+        metadata['successful_shards'] += 1
+        metadata['records'] += len(records)
+        by_type = metadata['records_by_type']
+        by_type[shard.object_type] = by_type.get(shard.object_type, 0) + len(records)
+        logger.debug(f"Shard {shard.label}: {len(records)} records in {shard_result['duration_seconds']:.2f}s")
@@ -0,0 +1,80 @@
+"""
+Module: deadline
+Type: Internal Module
+
+Purpose:
+Time budgets for bulk extraction so callers with SLAs get a guaranteed upper
+bound on latency.
+
+Data Flow:
+- Input: Absolute deadline (epoch seconds) or relative time budget
+- Processing: Remaining-time bookkeeping, timeout clamping
+- Output: Remaining seconds, expiry checks
+
+Critical Because:
+Extraction work is scheduled and cancelled against a single shared deadline;
+every component must agree on how much time is left.
+
+Dependencies:
+- Requires: time
+- Used By: agent.GongAgent.extract_all_data, extraction.pipeline, api_client.GongAPIClient
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import time
+from typing import Optional
+
+
+class Deadline:
+    """
+    A point in time by which extraction work must finish.
+
+    Uses time.monotonic internally so wall clock changes can't extend or
+    shorten the budget.
+    """
+
+    def __init__(self, budget_seconds: float):
+        """
+        Create a deadline budget_seconds from now.
+
+        Args:
+            budget_seconds: Time budget in seconds
+        """
+        self.budget_seconds = budget_seconds
+        self._expires_at = time.monotonic() + budget_seconds
+
+    @classmethod
+    def at(cls, timestamp: float) -> 'Deadline':
+        """Create a deadline at an absolute epoch timestamp"""
+        return cls(timestamp - time.time())
+
+    @classmethod
+    def from_options(cls, deadline: Optional[float] = None,
+                     time_budget_seconds: Optional[float] = None) -> Optional['Deadline']:
+        """
+        Build a deadline from an absolute timestamp and/or a relative budget.
+
+        When both are given the earlier one wins. Returns None when neither is set.
+        """
+        candidates = []
+        if deadline is not None:
+            candidates.append(cls.at(deadline))
+        if time_budget_seconds is not None:
+            candidates.append(cls(time_budget_seconds))
+
+        if not candidates:
+            return None
+        return min(candidates, key=lambda candidate: candidate._expires_at)
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)"""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Whether the deadline has passed"""
+        return time.monotonic() >= self._expires_at
+
+    def clamp(self, timeout: float) -> float:
+        """Limit a timeout so it ends no later than the deadline"""
+        return min(timeout, self.remaining())
@@ -0,0 +1,402 @@
+"""
+Module: pipeline
+Type: Internal Module
+
+Purpose:
+Dependency-aware extraction pipeline that hydrates calls with details and
+transcripts. Call pages feed detail fetches, which feed transcript fetches,
+which feed the sink, so downstream work starts while pagination is still running.
+
+Data Flow:
+- Input: GongAPIClient, pipeline limits and per-stage concurrency
+- Processing: Pager → bounded queue → detail workers → bounded queue →
+              transcript workers → bounded queue → sink stage
+- Output: Hydrated call dictionaries {'call', 'details', 'transcript', 'errors'}
+
+Critical Because:
+Hydrating calls one by one after extract_calls returns serializes hundreds of
+round trips. Overlapping the stages keeps every endpoint busy at once.
+
+Dependencies:
+- Requires: threading, queue, api_client.GongAPIClient, storage.records, storage.spill
+- Used By: agent.GongAgent.extract_calls_hydrated
+
+Error Handling:
+- Per-call detail/transcript failures are recorded on the item and don't stop the pipeline
+- A failure fetching the first call page is raised (nothing to hydrate)
+- Failures on later pages stop pagination; calls already fetched are still hydrated
+- On deadline expiry the stages are stopped and the calls hydrated so far are returned
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import logging
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from storage.records import get_field
+from storage.spill import SpillStore
+
+from .deadline import Deadline
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's output
+_DONE = object()
+
+
+class ExtractionPipelineError(Exception):
+    """Raised when the extraction pipeline cannot produce any results"""
+    pass
+
+
+class _Stage:
+    """
+    A pool of worker threads reading from one queue and writing to the next.
+
+    When the last worker of a stage sees end-of-input, it forwards one end
+    marker per downstream worker.
+    """
+
+    def __init__(self, name: str, workers: int, inbox: queue.Queue, outbox: queue.Queue,
+                 downstream_workers: int, handler, stop_event: threading.Event, initializer=None):
+        self.name = name
+        self.workers = max(1, workers)
+        self.inbox = inbox
+        self.outbox = outbox
+        self.downstream_workers = downstream_workers
+        self.handler = handler
+        self.stop_event = stop_event
+        self.initializer = initializer
+        self._remaining = self.workers
+        self._lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self._run, name=f"gong-{name}-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+
+    def start(self) -> None:
+        for thread in self.threads:
+            thread.start()
+
+    def _run(self) -> None:
+        if self.initializer is not None:
+            self.initializer()
+
+        while True:
+            try:
+                item = self.inbox.get(timeout=0.1)
+            except queue.Empty:
+                if self.stop_event.is_set():
+                    break
+                continue
+
+            if item is _DONE:
+                break
+            if not self.stop_event.is_set():
+                self.handler(item)
+            _put(self.outbox, item, self.stop_event)
+
+        with self._lock:
+            self._remaining -= 1
+            last_worker = self._remaining == 0
+
+        if last_worker:
+            for _ in range(self.downstream_workers):
+                _put(self.outbox, _DONE, self.stop_event)
+
+
+def _put(target: queue.Queue, item: Any, stop_event: threading.Event) -> None:
+    """Put onto a bounded queue, giving up if the pipeline is stopped"""
+    while True:
+        try:
+            target.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            if stop_event.is_set():
+                return
+
+
+class ExtractionPipeline:
+    """
+    Pipelined extraction of calls → call details → transcripts → sink.
+
+    Each stage runs its own worker threads and stages are connected by bounded
+    queues, so a slow stage applies backpressure instead of buffering the
+    whole tenant in memory.
+    """
+
+    def __init__(self, api_client, max_calls: Optional[int] = 100, page_size: int = 50,
+                 detail_workers: int = 4, transcript_workers: int = 4,
+                 include_details: bool = True, include_transcripts: bool = True,
+                 queue_size: int = 100, sink: Optional[Any] = None, sink_batch_size: int = 50,
+                 deadline: Optional[Deadline] = None, memory_budget_records: Optional[int] = None,
+                 spill_dir: Optional[str] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            api_client: GongAPIClient with an active session
+            max_calls: Maximum calls to hydrate (None for all pages)
+            page_size: Calls requested per my-calls page
+            detail_workers: Concurrent get_call_details fetches
+            transcript_workers: Concurrent get_call_transcript fetches
+            include_details: Whether to fetch call details
+            include_transcripts: Whether to fetch transcripts
+            queue_size: Capacity of each inter-stage queue
+            sink: Optional storage sink with write(object_type, records)
+            sink_batch_size: Hydrated calls buffered per sink write
+            deadline: Optional Deadline; when it expires the stages are stopped
+                and the calls hydrated so far are returned
+            memory_budget_records: Optional cap on hydrated calls run() keeps in
+                memory; beyond it they spill to disk and run() returns a lazy view
+            spill_dir: Parent directory for spill files (default: system temp)
+        """
+        self.api_client = api_client
+        self.max_calls = max_calls
+        self.page_size = page_size
+        self.detail_workers = detail_workers if include_details else 1
+        self.transcript_workers = transcript_workers if include_transcripts else 1
+        self.include_details = include_details
+        self.include_transcripts = include_transcripts
+        self.queue_size = queue_size
+        self.sink = sink
+        self.sink_batch_size = sink_batch_size
+        self.deadline = deadline
+        self.memory_budget_records = memory_budget_records
+        self.spill_dir = spill_dir
+
+        self.stop_event = threading.Event()
+        self.errors: List[str] = []
+        self.stats = {
+            'pages_fetched': 0,
+            'calls_fetched': 0,
+            'details_fetched': 0,
+            'transcripts_fetched': 0,
+            'items_written': 0,
+            'pagination_complete': False,
+            'deadline_expired': False,
+            'spilled': False,
+            'duration_seconds': 0.0
+        }
+        self._stats_lock = threading.Lock()
+        self._first_page_error: Optional[Exception] = None
+
+    def stop(self) -> None:
+        """Stop all stages; items already in flight are passed through unhydrated"""
+        self.stop_event.set()
+
+    # ============================================================================
+    # Stage Handlers
+    # ============================================================================
+
+    def _apply_deadline(self) -> None:
+        """Bind the pipeline deadline to requests made from the current worker thread"""
+        if self.deadline is not None:
+            self.api_client.set_request_deadline(self.deadline)
+
+    def _paginate(self, outbox: queue.Queue, downstream_workers: int) -> None:
+        """Fetch call pages and feed each call into the detail stage"""
+        self._apply_deadline()
+        offset = 0
+        try:
+            while not self.stop_event.is_set():
+                limit = self.page_size
+                if self.max_calls is not None:
+                    limit = min(limit, self.max_calls - offset)
+                    if limit <= 0:
+                        self.stats['pagination_complete'] = True
+                        break
+
+                try:
+                    page = self.api_client.get_my_calls(limit=limit, offset=offset)
+                except Exception as e:
+                    if offset == 0:
+                        self._first_page_error = e
+                    self._record_error(f"Call page at offset {offset} failed: {e}")
+                    break
+
+                self._increment('pages_fetched')
+
+                for call in page:
+                    _put(outbox, {'call': call, 'details': None, 'transcript': None, 'errors': []},
+                         self.stop_event)
+                    self._increment('calls_fetched')
+
+                offset += len(page)
+                if len(page) < limit:
+                    self.stats['pagination_complete'] = True
+                    break
+        finally:
+            for _ in range(downstream_workers):
+                _put(outbox, _DONE, self.stop_event)
+
+    def _fetch_details(self, item: Dict[str, Any]) -> None:
+        """Hydrate one call with its details"""
+        if not self.include_details:
+            return
+
+        call_id = get_field(item['call'], 'call_id')
+        try:
+            item['details'] = self.api_client.get_call_details(call_id)
+            self._increment('details_fetched')
+        except Exception as e:
+            item['errors'].append(f"Details for call {call_id} failed: {e}")
+
+    def _fetch_transcript(self, item: Dict[str, Any]) -> None:
+        """Hydrate one call with its transcript"""
+        if not self.include_transcripts:
+            return
+
+        call_id = get_field(item['call'], 'call_id')
+        try:
+            item['transcript'] = self.api_client.get_call_transcript(call_id)
+            self._increment('transcripts_fetched')
+        except Exception as e:
+            item['errors'].append(f"Transcript for call {call_id} failed: {e}")
+
+    # ============================================================================
+    # Execution
+    # ============================================================================
+
+    def stream(self) -> Iterator[Dict[str, Any]]:
+        """
+        Run the pipeline, yielding hydrated calls as they leave the last stage.
+
+        Yields:
+            Dict with 'call', 'details', 'transcript' and 'errors' keys
+        """
+        start_time = time.time()
+
+        calls_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        details_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        output_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        detail_stage = _Stage('details', self.detail_workers, calls_queue, details_queue,
+                              self.transcript_workers, self._fetch_details, self.stop_event,
+                              self._apply_deadline)
+        transcript_stage = _Stage('transcripts', self.transcript_workers, details_queue, output_queue,
+                                  1, self._fetch_transcript, self.stop_event, self._apply_deadline)
+        pager = threading.Thread(target=self._paginate, args=(calls_queue, detail_stage.workers),
+                                 name="gong-pager", daemon=True)
+
+        pager.start()
+        detail_stage.start()
+        transcript_stage.start()
+
+        threads = [pager] + detail_stage.threads + transcript_stage.threads
+        batch: List[Dict[str, Any]] = []
+        finished = False
+        try:
+            while True:
+                if self.deadline is not None and self.deadline.expired():
+                    # Return what is already hydrated without waiting on in-flight requests
+                    self.stats['deadline_expired'] = True
+                    self.stop()
+                    logger.warning("Pipeline deadline expired, returning partial results")
+                    break
+
+                try:
+                    item = output_queue.get(timeout=0.1)
+                except queue.Empty:
+                    if self.stop_event.is_set() and not any(thread.is_alive() for thread in threads):
+                        break
+                    continue
+
+                if item is _DONE:
+                    break
+
+                if item['errors']:
+                    with self._stats_lock:
+                        self.errors.extend(item['errors'])
+                batch.append(item)
+                if len(batch) >= self.sink_batch_size:
+                    self._write_batch(batch)
+                    batch = []
+
+                yield item
+
+            self._write_batch(batch)
+            finished = True
+        finally:
+            if not finished:
+                # Consumer stopped iterating early: let the stages wind down
+                self.stop()
+            self.stats['duration_seconds'] = round(time.time() - start_time, 2)
+
+        if self._first_page_error is not None:
+            raise ExtractionPipelineError(f"Call pagination failed: {self._first_page_error}")
+
+        logger.info(
+            f"Pipeline hydrated {self.stats['calls_fetched']} calls "
+            f"({self.stats['details_fetched']} details, {self.stats['transcripts_fetched']} transcripts) "
+            f"in {self.stats['duration_seconds']}s"
+        )
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run the pipeline to completion.
+
+        Returns:
+            Dict with 'calls' (hydrated items, or a SpilledRecords view when
+            they exceeded memory_budget_records), 'status', 'stats' and 'errors'
+        """
+        if self.memory_budget_records is None:
+            calls = list(self.stream())
+        else:
+            buffer = SpillStore(self.spill_dir, max_records=self.memory_budget_records).buffer('calls')
+            buffer.extend(self.stream())
+            calls = buffer.result()
+            self.stats['spilled'] = buffer.is_spilled
+
+        return {
+            'calls': calls,
+            'status': self.status,
+            'stats': dict(self.stats),
+            'errors': list(self.errors)
+        }
+
+    @property
+    def status(self) -> str:
+        """'complete' if every page was fetched and hydrated, otherwise 'partial'"""
+        if self.stats['pagination_complete'] and not self.stop_event.is_set():
+            return 'complete'
+        return 'partial'
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Write hydrated calls and their transcripts to the sink"""
+        if self.sink is None or not batch:
+            return
+
+        calls = []
+        transcripts = []
+        for item in batch:
+            call = dict(item['call'])
+            if item['details'] is not None:
+                call['details'] = item['details']
+            calls.append(call)
+
+            if item['transcript'] is not None:
+                transcripts.append({'call_id': get_field(item['call'], 'call_id'), **item['transcript']})
+
+        try:
+            self.sink.write('calls', calls)
+            if transcripts:
+                self.sink.write('transcripts', transcripts)
+            self._increment('items_written', len(batch))
+        except Exception as e:
+            self._record_error(f"Sink write failed: {e}")
+
+    def _increment(self, stat: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[stat] += amount
+
+    def _record_error(self, message: str) -> None:
+        logger.warning(message)
+        with self._stats_lock:
+            self.errors.append(message)
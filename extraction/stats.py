@@ -0,0 +1,135 @@
+"""
+Module: stats
+Type: Internal Module
+
+Purpose:
+Per-object-type extraction statistics: counts, errors, items, bytes and
+latency percentiles over a sliding window of recent extractions.
+
+Data Flow:
+- Input: One observation per extraction (object type, duration, items, bytes, error)
+- Processing: Running counters plus a bounded window of recent durations
+- Output: Per-type summaries with p50/p90/p99 latencies
+
+Critical Because:
+A whole-run average hides a regression on a single endpoint. Per-type
+percentiles make a slow calls or deals endpoint visible on its own.
+
+Dependencies:
+- Requires: collections, threading
+- Used By: agent.GongAgent.get_extraction_stats, agent.GongAgent.get_status
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import math
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+DEFAULT_STATS_WINDOW = 100
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values, pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of an already sorted sequence.
+
+    Returns None for an empty sequence.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class ObjectTypeStats:
+    """Counters and a sliding latency window for one object type"""
+
+    def __init__(self, window_size: int = DEFAULT_STATS_WINDOW):
+        self.count = 0
+        self.errors = 0
+        self.items = 0
+        self.bytes = 0
+        self.durations: deque = deque(maxlen=window_size)
+
+    def record(self, duration: float, items: int = 0, bytes_received: int = 0, error: bool = False) -> None:
+        self.count += 1
+        if error:
+            self.errors += 1
+        self.items += items
+        self.bytes += bytes_received
+        self.durations.append(duration)
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.durations)
+        summary = {
+            'count': self.count,
+            'errors': self.errors,
+            'items': self.items,
+            'bytes': self.bytes,
+            'window': len(ordered)
+        }
+        for pct in PERCENTILES:
+            value = percentile(ordered, pct)
+            summary[f'p{pct}_seconds'] = round(value, 4) if value is not None else None
+        return summary
+
+
+class ExtractionStatsTracker:
+    """
+    Thread-safe per-object-type extraction statistics.
+
+    Counters cover every recorded extraction; percentiles cover only the
+    last window_size durations so they track current endpoint behaviour.
+    """
+
+    def __init__(self, window_size: int = DEFAULT_STATS_WINDOW):
+        """
+        Initialize the tracker.
+
+        Args:
+            window_size: Number of recent durations kept per object type
+        """
+        if window_size < 1:
+            raise ValueError("window_size must be at least 1")
+        self.window_size = window_size
+        self._stats: Dict[str, ObjectTypeStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, object_type: str, duration: float, items: int = 0,
+               bytes_received: int = 0, error: bool = False) -> None:
+        """
+        Record one extraction of an object type.
+
+        Args:
+            object_type: Object type name (e.g. 'calls')
+            duration: Extraction duration in seconds
+            items: Number of items extracted
+            bytes_received: Response bytes received
+            error: Whether the extraction failed
+        """
+        with self._lock:
+            stats = self._stats.get(object_type)
+            if stats is None:
+                stats = self._stats[object_type] = ObjectTypeStats(self.window_size)
+            stats.record(duration, items, bytes_received, error)
+
+    def percentile(self, object_type: str, pct: float) -> Optional[float]:
+        """Duration percentile for an object type, or None if nothing was recorded"""
+        with self._lock:
+            stats = self._stats.get(object_type)
+            if stats is None:
+                return None
+            return percentile(sorted(stats.durations), pct)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-object-type summaries keyed by object type"""
+        with self._lock:
+            return {object_type: stats.summary() for object_type, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        """Discard all recorded statistics"""
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,239 @@
+"""
+Module: team_stats
+Type: Internal Module
+
+Purpose:
+Concurrent fan-out for Gong stats endpoints. Team and user activity
+metrics, topic models and trackers are requested in parallel across
+metrics and periods, with responses cached per (kind, metric, period,
+user) for a TTL.
+
+Data Flow:
+- Input: GongAPIClient, stats requests (kind, metric, period, user)
+- Processing: TTL cache lookup → thread pool fan-out for misses → cache fill
+- Output: team_stats records {'metric', 'value', 'unit', 'period', 'scope'}
+
+Critical Because:
+extract_team_stats posted one metric at a time; with periods, user
+metrics and the topics/trackers endpoints that serial loop grows to
+dozens of round trips.
+
+Dependencies:
+- Requires: concurrent.futures, threading, api_client.GongAPIClient
+- Used By: agent.GongAgent.extract_team_stats
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default aggregated activity metrics under /stats/ajax/v2/team/activity/{aggregated,users}/{metric};
+# others (e.g. avgWeeklyDuration) are requested by passing metrics=
+TEAM_METRICS = ['avgCallDuration', 'totalCalls', 'avgWeeklyCalls', 'totalDuration']
+STATS_PERIODS = ('week', 'month', 'quarter')
+
+DEFAULT_STATS_CACHE_TTL = 300.0
+DEFAULT_STATS_WORKERS = 8
+
+# Request kinds: team/user activity metrics, topic models, team/user trackers
+TEAM = 'team'
+USER = 'user'
+TOPICS = 'topics'
+TRACKERS = 'trackers'
+USER_TRACKERS = 'user_trackers'
+
+
+class StatsRequest(NamedTuple):
+    """One stats endpoint call; also its cache key"""
+    kind: str
+    metric: str
+    period: str = 'week'
+    user_id: Optional[str] = None
+
+
+class StatsCache:
+    """
+    Thread-safe TTL cache of stats responses keyed by StatsRequest.
+
+    Expiry uses the monotonic clock; expired entries are dropped on read.
+    """
+
+    def __init__(self, ttl_seconds: float = DEFAULT_STATS_CACHE_TTL):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[StatsRequest, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, request: StatsRequest) -> Tuple[bool, Any]:
+        """Return (found, value) for a cached, unexpired response"""
+        with self._lock:
+            entry = self._entries.get(request)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[request]
+            self.misses += 1
+            return False, None
+
+    def set(self, request: StatsRequest, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[request] = (time.monotonic() + self.ttl_seconds, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def plan_stats_requests(metrics: Optional[Iterable[str]] = None,
+                        periods: Iterable[str] = ('week',),
+                        include_user_stats: bool = False,
+                        include_topics: bool = False,
+                        include_trackers: bool = False) -> List[StatsRequest]:
+    """
+    Build the request fan-out for a stats extraction.
+
+    Args:
+        metrics: Activity metrics (default: TEAM_METRICS)
+        periods: Periods to request each metric for
+        include_user_stats: Also request the per-user breakdown of each metric
+        include_topics: Also request topic models per period
+        include_trackers: Also request team and per-user trackers per period
+    """
+    metrics = list(metrics) if metrics is not None else TEAM_METRICS
+    requests = []
+    for period in periods:
+        requests.extend(StatsRequest(TEAM, metric, period) for metric in metrics)
+        if include_user_stats:
+            requests.extend(StatsRequest(USER, metric, period) for metric in metrics)
+        if include_topics:
+            requests.append(StatsRequest(TOPICS, 'topicModels', period))
+        if include_trackers:
+            requests.append(StatsRequest(TRACKERS, 'trackers', period))
+            requests.append(StatsRequest(USER_TRACKERS, 'trackers', period))
+    return requests
+
+
+def stats_record(request: StatsRequest, value: Any) -> Dict[str, Any]:
+    """
+    Shape one response as a team_stats record.
+
+    Team metrics keep their bare metric name; other kinds are prefixed
+    (users.avgCallDuration, topicModels, trackers.all, trackers.users) so
+    (metric, period) stays a unique key.
+    """
+    if request.kind == TEAM:
+        metric = request.metric
+    elif request.kind == USER:
+        metric = f"users.{request.metric}"
+    elif request.kind == TOPICS:
+        metric = 'topicModels'
+    elif request.kind == TRACKERS:
+        metric = 'trackers.all'
+    else:
+        metric = 'trackers.users'
+
+    if request.kind in (TEAM, USER):
+        unit = 'seconds' if 'Duration' in request.metric else 'count'
+    else:
+        unit = None
+
+    record = {
+        'metric': metric,
+        'value': value,
+        'unit': unit,
+        'period': request.period,
+        'scope': 'user' if request.kind in (USER, USER_TRACKERS) else 'team'
+    }
+    if request.user_id is not None:
+        record['user_id'] = request.user_id
+    return record
+
+
+class StatsFanout:
+    """
+    Fetches stats requests concurrently, serving repeats from a TTL cache.
+
+    Failed requests are logged and left out of the results, matching the
+    per-metric error handling of extract_team_stats. Workers run under the
+    calling thread's request deadline, and the bytes they receive are
+    credited to the calling thread's counter.
+    """
+
+    def __init__(self, api_client: Any, cache: Optional[StatsCache] = None,
+                 max_workers: int = DEFAULT_STATS_WORKERS):
+        self.api_client = api_client
+        self.cache = cache if cache is not None else StatsCache()
+        self.max_workers = max(1, max_workers)
+
+    def _call(self, request: StatsRequest) -> Any:
+        if request.kind == TEAM:
+            return self.api_client.get_team_stats(request.metric, request.period)
+        if request.kind == USER:
+            return self.api_client.get_user_stats(request.metric, request.user_id, period=request.period)
+        if request.kind == TOPICS:
+            return self.api_client.get_topic_models(request.period)
+        if request.kind == TRACKERS:
+            return self.api_client.get_trackers(request.period)
+        if request.kind == USER_TRACKERS:
+            return self.api_client.get_user_trackers(request.period, request.user_id)
+        raise ValueError(f"Unknown stats request kind: {request.kind}")
+
+    def _bytes_received(self) -> int:
+        received = self.api_client.get_bytes_received()
+        return received if isinstance(received, int) else 0
+
+    def _fetch_one(self, request: StatsRequest) -> Tuple[StatsRequest, Any, Optional[Exception], int]:
+        found, value = self.cache.get(request)
+        if found:
+            return request, value, None, 0
+        bytes_before = self._bytes_received()
+        try:
+            value = self._call(request)
+        except Exception as e:
+            return request, None, e, self._bytes_received() - bytes_before
+        self.cache.set(request, value)
+        return request, value, None, self._bytes_received() - bytes_before
+
+    def fetch(self, requests: Iterable[StatsRequest]) -> Dict[StatsRequest, Any]:
+        """
+        Fetch responses for requests, concurrently for cache misses.
+
+        Returns:
+            Response per successful request, in request order
+        """
+        requests = list(dict.fromkeys(requests))
+        workers = min(self.max_workers, len(requests)) or 1
+        deadline = self.api_client.get_request_deadline()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gong-stats",
+                                initializer=self.api_client.set_request_deadline,
+                                initargs=(deadline,)) as executor:
+            outcomes = list(executor.map(self._fetch_one, requests))
+
+        bytes_received = sum(outcome[3] for outcome in outcomes)
+        if bytes_received:
+            self.api_client.add_bytes_received(bytes_received)
+
+        responses = {}
+        for request, value, error, _ in outcomes:
+            if error is not None:
+                logger.warning(f"Failed to get {request.kind} stats {request.metric} ({request.period}): {error}")
+                continue
+            responses[request] = value
+        return responses
+
+    def records(self, requests: Iterable[StatsRequest]) -> List[Dict[str, Any]]:
+        """Fetch requests and shape non-empty responses as team_stats records"""
+        return [stats_record(request, value) for request, value in self.fetch(requests).items() if value]
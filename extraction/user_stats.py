@@ -0,0 +1,185 @@
+"""
+Module: user_stats
+Type: Internal Module
+
+Purpose:
+Bulk users × metrics stats matrix. Each /stats/ajax/v2/team/activity/users/{metric}
+response already carries every user's value, so the full matrix takes one
+request per metric (fanned out concurrently) plus get_users, instead of one
+request per user and metric.
+
+Data Flow:
+- Input: GongAPIClient, metrics, period
+- Processing: get_users roster → StatsFanout over users/{metric} → values
+              placed by (user index, metric index)
+- Output: UserStatsMatrix backed by a flat array('d'), NaN for missing values
+
+Critical Because:
+A coaching dashboard for 300 reps took 1,200 sequential get_user_stats
+calls and then aggregated nested dicts in Python loops.
+
+Dependencies:
+- Requires: array, math, numpy (optional), extraction.team_stats, storage.records
+- Used By: agent.GongAgent.extract_user_stats_matrix
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import logging
+import math
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from storage.records import get_field
+
+from .team_stats import DEFAULT_STATS_WORKERS, TEAM_METRICS, USER, StatsCache, StatsFanout, StatsRequest
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Keys observed for the per-user rows of a users/{metric} response
+_USER_ROW_KEYS = ('users', 'data', 'stats')
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, dict):
+        value = value.get('value')
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class UserStatsMatrix:
+    """
+    Dense users × metrics matrix of floats.
+
+    Values live in one row-major array('d') (8 bytes per cell); missing
+    values are NaN. Columns are strided slices of the array, and
+    to_numpy() returns a zero-copy 2-D view for vectorized aggregation.
+    """
+
+    def __init__(self, user_ids: List[str], metrics: List[str], values: Optional[array] = None):
+        self.user_ids = list(user_ids)
+        self.metrics = list(metrics)
+        self.user_index = {user_id: i for i, user_id in enumerate(self.user_ids)}
+        self.metric_index = {metric: j for j, metric in enumerate(self.metrics)}
+        size = len(self.user_ids) * len(self.metrics)
+        if values is None:
+            values = array('d', [math.nan]) * size
+        elif len(values) != size:
+            raise ValueError(f"Expected {size} values, got {len(values)}")
+        self.values = values
+
+    @property
+    def shape(self) -> tuple:
+        return len(self.user_ids), len(self.metrics)
+
+    def _offset(self, user_id: str, metric: str) -> int:
+        return self.user_index[user_id] * len(self.metrics) + self.metric_index[metric]
+
+    def get(self, user_id: str, metric: str) -> float:
+        return self.values[self._offset(user_id, metric)]
+
+    def set(self, user_id: str, metric: str, value: float) -> None:
+        self.values[self._offset(user_id, metric)] = value
+
+    def row(self, user_id: str) -> array:
+        """All metric values for one user"""
+        start = self.user_index[user_id] * len(self.metrics)
+        return self.values[start:start + len(self.metrics)]
+
+    def column(self, metric: str) -> array:
+        """One metric's values for every user, in user order"""
+        return self.values[self.metric_index[metric]::len(self.metrics)]
+
+    def column_summary(self, metric: str) -> Dict[str, Any]:
+        """count/mean/min/max over the users that have a value"""
+        present = [value for value in self.column(metric) if not math.isnan(value)]
+        if not present:
+            return {'count': 0, 'mean': None, 'min': None, 'max': None}
+        return {
+            'count': len(present),
+            'mean': math.fsum(present) / len(present),
+            'min': min(present),
+            'max': max(present)
+        }
+
+    def to_numpy(self):
+        """Zero-copy (users, metrics) float64 view; requires numpy"""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("UserStatsMatrix.to_numpy requires numpy (pip install numpy)")
+        return np.frombuffer(self.values, dtype=np.float64).reshape(self.shape)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """One dict per user ({'user_id', metric: value or None, ...})"""
+        records = []
+        for user_id in self.user_ids:
+            record = {'user_id': user_id}
+            for metric, value in zip(self.metrics, self.row(user_id)):
+                record[metric] = None if math.isnan(value) else value
+            records.append(record)
+        return records
+
+
+def _user_rows(response: Any) -> Iterable[Dict[str, Any]]:
+    if isinstance(response, list):
+        return response
+    if isinstance(response, dict):
+        for key in _USER_ROW_KEYS:
+            rows = response.get(key)
+            if isinstance(rows, list):
+                return rows
+    return []
+
+
+def build_user_stats_matrix(api_client: Any,
+                            metrics: Optional[Iterable[str]] = None,
+                            period: str = 'week',
+                            users: Optional[List[Dict[str, Any]]] = None,
+                            cache: Optional[StatsCache] = None,
+                            max_workers: int = DEFAULT_STATS_WORKERS) -> UserStatsMatrix:
+    """
+    Build the users × metrics matrix with one users/{metric} request per metric.
+
+    Args:
+        api_client: GongAPIClient (get_users, get_user_stats)
+        metrics: Activity metrics (default: TEAM_METRICS)
+        period: Stats period ('week', 'month', 'quarter')
+        users: User roster (default: api_client.get_users())
+        cache: Optional StatsCache shared with extract_team_stats
+        max_workers: Concurrent metric requests
+
+    Returns:
+        UserStatsMatrix with one row per roster user; users missing from a
+        metric's response (or whose metric request failed) are NaN
+    """
+    metrics = list(metrics) if metrics is not None else list(TEAM_METRICS)
+    if users is None:
+        users = api_client.get_users()
+
+    user_ids = [str(get_field(user, 'user_id')) for user in users if get_field(user, 'user_id') is not None]
+    matrix = UserStatsMatrix(list(dict.fromkeys(user_ids)), metrics)
+    requests = [StatsRequest(USER, metric, period) for metric in metrics]
+    responses = StatsFanout(api_client, cache=cache, max_workers=max_workers).fetch(requests)
+
+    width = len(metrics)
+    for request, response in responses.items():
+        column = matrix.metric_index[request.metric]
+        for row in _user_rows(response):
+            user_id = get_field(row, 'user_id') if isinstance(row, dict) else None
+            row_index = matrix.user_index.get(str(user_id)) if user_id is not None else None
+            if row_index is not None:
+                matrix.values[row_index * width + column] = _to_float(row.get('value'))
+
+    logger.info(f"Built user stats matrix: {len(matrix.user_ids)} users × {len(metrics)} metrics "
+                f"from {len(responses)}/{len(requests)} metric requests")
+    return matrix
@@ -0,0 +1,68 @@
+"""
+Module: __init__
+Type: Internal Module
+
+Purpose:
+Storage sinks and exporters for extracted Gong data.
+
+Data Flow:
+- Input: Extraction results from GongAgent
+- Processing: Data transformation, Persistence
+- Output: Files and local stores for downstream analytics
+
+Critical Because:
+Extraction output is only useful once downstream consumers can load it quickly.
+
+Dependencies:
+- Requires: columnar, sqlite_sink, spill, dedupe, cdc, snapshots
+- Used By: agent, app_backend.ingestion.orchestrator
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+from .columnar import (
+    ColumnarExporter,
+    ColumnarWriter,
+    ColumnarExportError,
+    schema_for_object_type
+)
+from .sqlite_sink import (
+    GongSQLiteSink,
+    GongSQLiteSinkError
+)
+from .cdc import (
+    ChangeFeed,
+    write_ndjson
+)
+from .dedupe import (
+    ContentHashIndex,
+    content_hash
+)
+from .snapshots import SnapshotStore
+from .spill import (
+    SpillError,
+    SpillStore,
+    SpilledRecords,
+    materialize
+)
+
+__version__ = "1.0.0"
+__author__ = "CS-Ascension Team"
+
+__all__ = [
+    'ColumnarExporter',
+    'ColumnarWriter',
+    'ColumnarExportError',
+    'schema_for_object_type',
+    'GongSQLiteSink',
+    'GongSQLiteSinkError',
+    'ChangeFeed',
+    'write_ndjson',
+    'ContentHashIndex',
+    'content_hash',
+    'SnapshotStore',
+    'SpillError',
+    'SpillStore',
+    'SpilledRecords',
+    'materialize'
+]
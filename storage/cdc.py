@@ -0,0 +1,149 @@
+"""
+Module: cdc
+Type: Internal Module
+
+Purpose:
+Change-data-capture feed between extraction runs. Diffs each object type
+against the previous snapshot's record keys and content hashes and emits
+created, updated and deleted events, as an iterator or NDJSON.
+
+Data Flow:
+- Input: Extraction results (or records per object type), ContentHashIndex
+- Processing: Key/hash comparison against the previous snapshot
+- Output: Change events {'op', 'object_type', 'key', 'record', 'extraction_id'}
+
+Critical Because:
+Downstream consumers diffed whole extraction JSON files to find what
+changed; the feed lets them process only deltas.
+
+Dependencies:
+- Requires: json, storage.dedupe, storage.records
+- Used By: agent.GongAgent.iter_changes, agent.GongAgent.save_changes
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, Optional, Union
+
+from .dedupe import CREATED, UNCHANGED, UNKEYED, UPDATED, ContentHashIndex
+from .records import OBJECT_KEY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+DELETED = 'deleted'
+
+
+class ChangeFeed:
+    """
+    Created/updated/deleted events against the previous extraction snapshot.
+
+    The snapshot is a ContentHashIndex of record keys and hashes. The index
+    is only advanced once a diff has been iterated to the end, so a consumer
+    that stops early sees the same events again next time. Use an index of
+    its own: one shared with extract_all_data(dedupe_index=...) has already
+    filtered out unchanged records, which would show up here as deletes.
+    """
+
+    def __init__(self, index: Optional[ContentHashIndex] = None):
+        """
+        Create the feed.
+
+        Args:
+            index: Snapshot index (default: in-memory, so the first diff
+                reports every record as created)
+        """
+        self.index = index if index is not None else ContentHashIndex()
+        self.counts: Dict[str, Dict[str, int]] = {}
+
+    def changes(self, object_type: str, records: Iterable[Any], detect_deletes: bool = False,
+                extraction_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Diff one object type's records against the previous snapshot.
+
+        Args:
+            object_type: Object type with a natural key (calls, deals, users, ...)
+            records: Full set of current records for the object type
+            detect_deletes: Emit deletes for previous keys missing from records;
+                only turn on when records are the full set
+            extraction_id: Optional extraction ID stamped on every event
+
+        Yields:
+            Change events; records without a key are emitted as created
+        """
+        # Hashes staged by an earlier diff that wasn't iterated to the end
+        self.index.discard(object_type)
+        counts = {CREATED: 0, UPDATED: 0, DELETED: 0}
+        previous_keys = self.index.keys(object_type) if detect_deletes else set()
+
+        for status, key, record in self.index.classify(object_type, records):
+            previous_keys.discard(key)
+            if status == UNCHANGED:
+                continue
+            op = CREATED if status == UNKEYED else status
+            counts[op] += 1
+            yield self._event(op, object_type, key, record, extraction_id)
+
+        for key in sorted(previous_keys):
+            counts[DELETED] += 1
+            yield self._event(DELETED, object_type, key, None, extraction_id)
+
+        self.index.commit(object_type, deleted_keys=previous_keys)
+        self.counts[object_type] = counts
+
+    def iter_results(self, results: Dict[str, Any], detect_deletes: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Diff every keyed object type in an extraction result.
+
+        With detect_deletes, deletes are only detected for object types
+        whose object_status is 'complete' (types without a status count as
+        partial); object types without a natural key (e.g. library) are not
+        part of the feed.
+        """
+        metadata = results.get('metadata', {})
+        object_status = metadata.get('object_status', {})
+        extraction_id = metadata.get('extraction_id')
+
+        for object_type, records in results.get('data', {}).items():
+            if object_type not in OBJECT_KEY_FIELDS:
+                logger.debug(f"Skipping change feed for unkeyed object type: {object_type}")
+                continue
+            if isinstance(records, dict):
+                records = [records]
+            complete = object_status.get(object_type) == 'complete'
+            yield from self.changes(object_type, records, detect_deletes=detect_deletes and complete,
+                                    extraction_id=extraction_id)
+
+    @staticmethod
+    def _event(op: str, object_type: str, key: Optional[str], record: Any,
+               extraction_id: Optional[str]) -> Dict[str, Any]:
+        event = {'op': op, 'object_type': object_type, 'key': key, 'record': record}
+        if extraction_id is not None:
+            event['extraction_id'] = extraction_id
+        return event
+
+
+def write_ndjson(events: Iterable[Dict[str, Any]], output: Union[str, Path, IO[str]]) -> int:
+    """
+    Write change events as NDJSON, one event per line.
+
+    Args:
+        events: Change events (consumed lazily)
+        output: File path or text file object
+
+    Returns:
+        Number of events written
+    """
+    if isinstance(output, (str, Path)):
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            return write_ndjson(events, f)
+
+    count = 0
+    for event in events:
+        output.write(json.dumps(event, default=str, separators=(',', ':')))
+        output.write('\n')
+        count += 1
+    return count
@@ -0,0 +1,343 @@
+"""
+Module: columnar
+Type: Internal Module
+
+Purpose:
+Columnar (Parquet / Arrow IPC) export of extracted Gong calls, deals, users,
+conversations and team stats for dataframe-based analytics.
+
+Data Flow:
+- Input: Raw record dictionaries per object type (as returned by GongAgent.extract_*)
+- Processing: Schema derivation from data_models → Row mapping → Row-group buffering
+- Output: One typed columnar file per object type
+
+Critical Because:
+Analytics loads extraction output into dataframes; scanning typed columnar
+files is an order of magnitude faster than parsing nested indent-2 JSON.
+
+Dependencies:
+- Requires: pyarrow (optional), data_models, storage.records
+- Used By: agent.GongAgent.save_extraction_results
+
+Error Handling:
+- ColumnarExportError: Raised when pyarrow is missing or a file cannot be written
+- Values that cannot be coerced to the column type are written as null
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import json
+import logging
+import sys
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Union, get_args, get_origin
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+# Import data models
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from data_models import GongCall, GongDeal, GongUser, GongTeamStats
+
+from .records import consumed_keys, get_field, to_bool, to_datetime
+
+logger = logging.getLogger(__name__)
+
+# Models that define the column layout for each object type.
+# Conversations are calls returned by the conversations search endpoint.
+OBJECT_TYPE_MODELS = {
+    'calls': GongCall,
+    'conversations': GongCall,
+    'deals': GongDeal,
+    'users': GongUser,
+    'team_stats': GongTeamStats,
+}
+
+# extract_team_stats emits one row per metric rather than aggregated
+# GongTeamStats objects, so the metric row fields are added as columns
+EXTRA_COLUMNS = {
+    'team_stats': [('metric', str), ('unit', str), ('period', str), ('value', dict)],
+}
+
+# Column holding the JSON of any payload keys not mapped to a model field
+EXTRA_FIELDS_COLUMN = 'extra_fields'
+
+SUPPORTED_FORMATS = ('parquet', 'arrow')
+
+FILE_SUFFIXES = {
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+}
+
+
+class ColumnarExportError(Exception):
+    """Raised when columnar export fails"""
+    pass
+
+
+def _require_pyarrow() -> None:
+    """Raise ColumnarExportError if pyarrow is not installed"""
+    if not PYARROW_AVAILABLE:
+        raise ColumnarExportError("Columnar export requires pyarrow (pip install pyarrow)")
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    """Return the inner type of Optional[X]"""
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _arrow_type(python_type: Any) -> Any:
+    """Map a model field annotation onto an Arrow type"""
+    python_type = _unwrap_optional(python_type)
+
+    if isinstance(python_type, type):
+        if issubclass(python_type, Enum):
+            return pa.string()
+        if issubclass(python_type, bool):
+            return pa.bool_()
+        if issubclass(python_type, int):
+            return pa.int64()
+        if issubclass(python_type, float):
+            return pa.float64()
+        if issubclass(python_type, datetime):
+            return pa.timestamp('us')
+        if issubclass(python_type, str):
+            return pa.string()
+
+    # Lists, dicts and nested models are stored as JSON strings
+    return pa.string()
+
+
+def schema_for_object_type(object_type: str) -> 'pa.Schema':
+    """
+    Build the Arrow schema for an object type from its data model.
+
+    Args:
+        object_type: One of OBJECT_TYPE_MODELS
+
+    Returns:
+        Arrow schema with one column per model field, any extra columns for
+        the object type, and a trailing extra_fields JSON column
+    """
+    _require_pyarrow()
+
+    model = OBJECT_TYPE_MODELS.get(object_type)
+    if model is None:
+        raise ColumnarExportError(f"No columnar schema for object type: {object_type}")
+
+    fields = [
+        pa.field(name, _arrow_type(field_info.annotation))
+        for name, field_info in model.model_fields.items()
+    ]
+    for name, python_type in EXTRA_COLUMNS.get(object_type, []):
+        fields.append(pa.field(name, _arrow_type(python_type)))
+    fields.append(pa.field(EXTRA_FIELDS_COLUMN, pa.string()))
+
+    return pa.schema(fields)
+
+
+def _coerce(value: Any, arrow_type: Any) -> Any:
+    """Coerce a raw value to the Python type pyarrow expects for arrow_type"""
+    if value is None:
+        return None
+
+    try:
+        if pa.types.is_timestamp(arrow_type):
+            return to_datetime(value)
+        if pa.types.is_boolean(arrow_type):
+            return to_bool(value)
+        if pa.types.is_integer(arrow_type):
+            return int(value)
+        if pa.types.is_floating(arrow_type):
+            return float(value)
+        if isinstance(value, Enum):
+            return value.value
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, default=str)
+        return str(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+class ColumnarWriter:
+    """
+    Streams records of one object type into a columnar file.
+
+    Rows are buffered and written one row group at a time, so memory use is
+    bounded by row_group_size rather than by the number of records.
+    """
+
+    def __init__(self, output_path: Path, object_type: str, output_format: str = 'parquet',
+                 row_group_size: int = 10000, compression: str = 'zstd'):
+        """
+        Initialize the writer.
+
+        Args:
+            output_path: Path of the file to write
+            object_type: Object type being written (calls, deals, ...)
+            output_format: 'parquet' or 'arrow' (Arrow IPC file)
+            row_group_size: Number of rows buffered before a row group is written
+            compression: Parquet compression codec
+        """
+        _require_pyarrow()
+
+        if output_format not in SUPPORTED_FORMATS:
+            raise ColumnarExportError(f"Unsupported columnar format: {output_format}")
+
+        self.output_path = Path(output_path)
+        self.object_type = object_type
+        self.output_format = output_format
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.schema = schema_for_object_type(object_type)
+        self.rows_written = 0
+
+        self._model_fields = [field.name for field in self.schema if field.name != EXTRA_FIELDS_COLUMN]
+        self._buffer: Dict[str, List[Any]] = {name: [] for name in self.schema.names}
+        self._buffered = 0
+        self._writer = None
+        self._sink = None
+
+    def write(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Buffer records, writing a row group whenever the buffer is full"""
+        for record in records:
+            self._append(record)
+            if self._buffered >= self.row_group_size:
+                self._flush()
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Map one raw record onto the schema columns"""
+        used_keys = set()
+
+        for name in self._model_fields:
+            value = get_field(record, name)
+            used_keys.update(consumed_keys(record, name))
+            self._buffer[name].append(_coerce(value, self.schema.field(name).type))
+
+        extra = {key: value for key, value in record.items() if key not in used_keys}
+        self._buffer[EXTRA_FIELDS_COLUMN].append(json.dumps(extra, default=str) if extra else None)
+        self._buffered += 1
+
+    def _flush(self) -> None:
+        """Write buffered rows as one row group"""
+        if not self._buffered:
+            return
+
+        table = pa.Table.from_pydict(self._buffer, schema=self.schema)
+
+        if self._writer is None:
+            self._open()
+
+        self._writer.write_table(table)
+        self.rows_written += self._buffered
+
+        self._buffer = {name: [] for name in self.schema.names}
+        self._buffered = 0
+
+    def _open(self) -> None:
+        """Open the underlying file writer"""
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.output_format == 'parquet':
+            self._writer = pq.ParquetWriter(self.output_path, self.schema, compression=self.compression)
+        else:
+            self._sink = pa.OSFile(str(self.output_path), 'wb')
+            self._writer = pa.ipc.new_file(self._sink, self.schema)
+
+    def close(self) -> None:
+        """Flush remaining rows and close the file"""
+        self._flush()
+
+        # Always produce a file, even when no records were written
+        if self._writer is None:
+            self._open()
+
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+        logger.info(f"Wrote {self.rows_written} {self.object_type} rows to {self.output_path}")
+
+
+class ColumnarExporter:
+    """
+    Sink that writes each supported object type to its own columnar file.
+
+    Object types without a columnar schema (e.g. library) are ignored, so
+    the exporter can be fed a full extraction result.
+    """
+
+    def __init__(self, output_dir: Path, output_format: str = 'parquet', row_group_size: int = 10000):
+        """
+        Initialize the exporter.
+
+        Args:
+            output_dir: Directory that receives one file per object type
+            output_format: 'parquet' or 'arrow'
+            row_group_size: Rows per row group
+        """
+        _require_pyarrow()
+
+        if output_format not in SUPPORTED_FORMATS:
+            raise ColumnarExportError(f"Unsupported columnar format: {output_format}")
+
+        self.output_dir = Path(output_dir)
+        self.output_format = output_format
+        self.row_group_size = row_group_size
+        self._writers: Dict[str, ColumnarWriter] = {}
+
+    def supports(self, object_type: str) -> bool:
+        """Check whether an object type has a columnar schema"""
+        return object_type in OBJECT_TYPE_MODELS
+
+    def write(self, object_type: str, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Append records of an object type.
+
+        Args:
+            object_type: Object type (calls, deals, users, conversations, team_stats)
+            records: Raw record dictionaries
+        """
+        if not self.supports(object_type):
+            logger.debug(f"Skipping columnar export for unsupported object type: {object_type}")
+            return
+
+        writer = self._writers.get(object_type)
+        if writer is None:
+            path = self.output_dir / f"{object_type}{FILE_SUFFIXES[self.output_format]}"
+            writer = ColumnarWriter(path, object_type, self.output_format, self.row_group_size)
+            self._writers[object_type] = writer
+
+        writer.write(records)
+
+    def close(self) -> Dict[str, Path]:
+        """
+        Close all open writers.
+
+        Returns:
+            Mapping of object type to written file path
+        """
+        paths = {}
+        for object_type, writer in self._writers.items():
+            writer.close()
+            paths[object_type] = writer.output_path
+        self._writers = {}
+        return paths
+
+    def __enter__(self) -> 'ColumnarExporter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
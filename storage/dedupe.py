@@ -0,0 +1,213 @@
+"""
+Module: dedupe
+Type: Internal Module
+
+Purpose:
+Local index of content hashes per record key (call_id, deal id, user
+email, ...), used to skip records that haven't changed since the last
+extraction before they are converted or written to sinks.
+
+Data Flow:
+- Input: Raw records per object type
+- Processing: Canonical JSON → 16-byte BLAKE2b digest, compared against the
+  stored digest for the record's natural key
+- Output: Changed records, skipped counts; digests persisted in SQLite
+
+Critical Because:
+Hourly jobs re-emitted and re-saved every record even when almost nothing
+changed, multiplying downstream load.
+
+Dependencies:
+- Requires: hashlib, json, sqlite3, storage.records
+- Used By: agent.GongAgent.extract_all_data
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .records import record_key
+
+logger = logging.getLogger(__name__)
+
+CREATED = 'created'
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+UNKEYED = 'unkeyed'
+
+
+def content_hash(record: Any, ignore_fields: Iterable[str] = ()) -> bytes:
+    """
+    Stable 16-byte digest of a record's content.
+
+    Keys are sorted so field order doesn't matter; top-level ignore_fields
+    (e.g. volatile timestamps) are left out.
+    """
+    if ignore_fields and isinstance(record, dict):
+        ignored = set(ignore_fields)
+        record = {key: value for key, value in record.items() if key not in ignored}
+    canonical = json.dumps(record, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).digest()
+
+
+class ContentHashIndex:
+    """
+    Persistent record key → content hash index.
+
+    Hashes for an object type are loaded into memory on first use. New
+    hashes are staged until commit(object_type), so a failed sink write can
+    discard them and the records are re-emitted on the next run.
+    """
+
+    def __init__(self, path: Union[str, Path] = ':memory:',
+                 ignore_fields: Optional[Dict[str, Iterable[str]]] = None):
+        """
+        Open (or create) the index.
+
+        Args:
+            path: SQLite file for the index (':memory:' for a per-process index)
+            ignore_fields: Object type → top-level fields left out of the hash
+        """
+        self.path = str(path)
+        self.ignore_fields = {object_type: tuple(fields) for object_type, fields in (ignore_fields or {}).items()}
+        self.skipped: Dict[str, int] = {}
+        self._hashes: Dict[str, Dict[str, bytes]] = {}
+        self._pending: Dict[str, Dict[str, bytes]] = {}
+        self._lock = threading.Lock()
+
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS content_hashes (
+                    object_type TEXT NOT NULL,
+                    record_key TEXT NOT NULL,
+                    hash BLOB NOT NULL,
+                    PRIMARY KEY (object_type, record_key)
+                ) WITHOUT ROWID
+                """
+            )
+
+    @property
+    def total_skipped(self) -> int:
+        return sum(self.skipped.values())
+
+    def _load(self, object_type: str) -> Dict[str, bytes]:
+        hashes = self._hashes.get(object_type)
+        if hashes is None:
+            rows = self.connection.execute(
+                "SELECT record_key, hash FROM content_hashes WHERE object_type = ?", (object_type,)
+            )
+            hashes = self._hashes[object_type] = {key: bytes(digest) for key, digest in rows}
+        return hashes
+
+    def keys(self, object_type: str) -> Set[str]:
+        """Record keys currently indexed for an object type"""
+        with self._lock:
+            return set(self._load(object_type))
+
+    def classify(self, object_type: str, records: Iterable[Any]) -> Iterator[Tuple[str, Optional[str], Any]]:
+        """
+        Compare records against the index, staging new hashes.
+
+        Yields:
+            (status, record_key, record) with status 'created', 'updated',
+            'unchanged' or 'unkeyed' (no natural key; always treated as changed)
+        """
+        ignore = self.ignore_fields.get(object_type, ())
+        with self._lock:
+            hashes = self._load(object_type)
+            pending = self._pending.setdefault(object_type, {})
+
+        for record in records:
+            key = record_key(object_type, record) if isinstance(record, dict) else None
+            if key is None:
+                yield UNKEYED, None, record
+                continue
+
+            digest = content_hash(record, ignore)
+            previous = pending.get(key, hashes.get(key))
+            if previous == digest:
+                yield UNCHANGED, key, record
+                continue
+
+            pending[key] = digest
+            yield (CREATED if previous is None else UPDATED), key, record
+
+    def filter_changed(self, object_type: str, records: Iterable[Any]) -> List[Any]:
+        """
+        Drop records whose content hash matches the index.
+
+        Returns:
+            Records that are new, changed or have no natural key
+        """
+        changed = []
+        skipped = 0
+        for status, _, record in self.classify(object_type, records):
+            if status == UNCHANGED:
+                skipped += 1
+            else:
+                changed.append(record)
+
+        with self._lock:
+            self.skipped[object_type] = self.skipped.get(object_type, 0) + skipped
+        return changed
+
+    def commit(self, object_type: Optional[str] = None, deleted_keys: Iterable[str] = ()) -> None:
+        """
+        Persist staged hashes (for one object type, or all).
+
+        Args:
+            object_type: Object type to commit (None for every staged type)
+            deleted_keys: Keys of object_type to remove from the index
+        """
+        with self._lock:
+            object_types = [object_type] if object_type is not None else list(self._pending)
+            with self.connection:
+                for current_type in object_types:
+                    pending = self._pending.pop(current_type, {})
+                    if pending:
+                        self.connection.executemany(
+                            """
+                            INSERT INTO content_hashes (object_type, record_key, hash) VALUES (?, ?, ?)
+                            ON CONFLICT (object_type, record_key) DO UPDATE SET hash = excluded.hash
+                            """,
+                            [(current_type, key, digest) for key, digest in pending.items()]
+                        )
+                        self._load(current_type).update(pending)
+
+                deleted = list(deleted_keys) if object_type is not None else []
+                if deleted:
+                    self.connection.executemany(
+                        "DELETE FROM content_hashes WHERE object_type = ? AND record_key = ?",
+                        [(object_type, key) for key in deleted]
+                    )
+                    hashes = self._load(object_type)
+                    for key in deleted:
+                        hashes.pop(key, None)
+
+    def discard(self, object_type: Optional[str] = None) -> None:
+        """Drop staged hashes so the records are treated as changed next time"""
+        with self._lock:
+            if object_type is None:
+                self._pending.clear()
+            else:
+                self._pending.pop(object_type, None)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,178 @@
+"""
+Module: records
+Type: Internal Module
+
+Purpose:
+Helpers for reading raw Gong API records (calls, deals, users, conversations,
+team stats) in terms of the data_models field names.
+
+Data Flow:
+- Input: Raw record dictionaries returned by GongAPIClient
+- Processing: Field alias resolution, natural key lookup, timestamp normalization
+- Output: Field values and record keys
+
+Critical Because:
+Raw Gong payloads use camelCase and short ids ('id', 'callId') while the
+data models use snake_case names ('call_id'). Every storage sink resolves
+fields through this module so they agree on what a record's key is.
+
+Dependencies:
+- Requires: typing
+- Used By: storage.columnar, storage.sqlite_sink
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+# Natural key field(s) for each object type
+OBJECT_KEY_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'calls': ('call_id',),
+    'conversations': ('call_id',),
+    'deals': ('deal_id',),
+    'users': ('email',),
+    'accounts': ('account_id',),
+    'team_stats': ('metric', 'period'),
+}
+
+# Alternative names observed in raw Gong payloads for each model field
+FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    'call_id': ('id', 'callId', 'conversationId'),
+    'deal_id': ('id', 'dealId', 'opportunityId'),
+    'user_id': ('id', 'userId'),
+    'account_id': ('accountId', 'companyId'),
+    'contact_id': ('contactId', 'personId', 'id'),
+    'opportunity_id': ('opportunityId',),
+    'call_type': ('callType', 'type'),
+    'start_time': ('startTime', 'started', 'scheduled'),
+    'end_time': ('endTime',),
+    'duration_seconds': ('duration', 'durationSeconds'),
+    'host_email': ('hostEmail', 'ownerEmail'),
+    'recording_url': ('recordingUrl',),
+    'transcript_url': ('transcriptUrl',),
+    'meeting_url': ('meetingUrl',),
+    'is_private': ('isPrivate',),
+    'first_name': ('firstName',),
+    'last_name': ('lastName',),
+    'full_name': ('name', 'fullName'),
+    'email': ('emailAddress',),
+    'is_active': ('active', 'isActive'),
+    'owner_email': ('ownerEmail',),
+    'close_date': ('closeDate',),
+    'is_won': ('isWon',),
+    'is_lost': ('isLost',),
+    'created_at': ('createdAt', 'created'),
+    'updated_at': ('updatedAt', 'lastModified'),
+}
+
+_MISSING = object()
+
+
+def get_field(record: Dict[str, Any], field_name: str, default: Any = None) -> Any:
+    """
+    Get a model field value from a raw record.
+
+    Args:
+        record: Raw record dictionary
+        field_name: data_models field name (e.g. 'call_id')
+        default: Value returned when neither the field nor an alias is present
+
+    Returns:
+        Field value, or default if not present
+    """
+    value = record.get(field_name, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    for alias in FIELD_ALIASES.get(field_name, ()):
+        value = record.get(alias, _MISSING)
+        if value is not _MISSING:
+            return value
+
+    return default
+
+
+def consumed_keys(record: Dict[str, Any], field_name: str) -> Tuple[str, ...]:
+    """Return the raw keys of record that resolve field_name"""
+    if field_name in record:
+        return (field_name,)
+
+    for alias in FIELD_ALIASES.get(field_name, ()):
+        if alias in record:
+            return (alias,)
+
+    return ()
+
+
+def record_key(object_type: str, record: Dict[str, Any]) -> Optional[str]:
+    """
+    Get the natural key of a raw record.
+
+    Args:
+        object_type: Object type (calls, deals, users, ...)
+        record: Raw record dictionary
+
+    Returns:
+        Key as a string, or None if the record has no usable key
+    """
+    key_fields = OBJECT_KEY_FIELDS.get(object_type)
+    if not key_fields:
+        return None
+
+    parts = []
+    for key_field in key_fields:
+        value = get_field(record, key_field)
+        if value is None or value == '':
+            return None
+        parts.append(str(value).lower() if key_field == 'email' else str(value))
+
+    return ':'.join(parts)
+
+
+def to_datetime(value: Any) -> Optional[datetime]:
+    """
+    Coerce a raw timestamp to a naive UTC datetime.
+
+    Accepts datetimes, ISO 8601 strings and epoch seconds or milliseconds
+    (Gong returns epoch milliseconds on most endpoints).
+
+    Raises:
+        ValueError: If a string is not valid ISO 8601
+    """
+    if isinstance(value, datetime):
+        result = value
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        seconds = value / 1000 if value > 1e11 else value
+        result = datetime.fromtimestamp(seconds, tz=timezone.utc)
+    elif isinstance(value, str) and value:
+        result = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    else:
+        return None
+
+    if result.tzinfo is not None:
+        result = result.astimezone(timezone.utc).replace(tzinfo=None)
+    return result
+
+
+_TRUE_STRINGS = frozenset({'true', 't', 'yes', 'y', '1', 'on'})
+_FALSE_STRINGS = frozenset({'false', 'f', 'no', 'n', '0', 'off', ''})
+
+
+def to_bool(value: Any) -> Optional[bool]:
+    """
+    Coerce a raw flag to a bool.
+
+    Strings are parsed ("false", "0", "no" → False) rather than tested for
+    truthiness; unrecognized strings return None.
+    """
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE_STRINGS:
+            return True
+        if text in _FALSE_STRINGS:
+            return False
+        return None
+    return bool(value)
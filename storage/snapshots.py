@@ -0,0 +1,93 @@
+"""
+Module: snapshots
+Type: Internal Module
+
+Purpose:
+Persisted extraction snapshots for stale-while-revalidate reads. The last
+extraction result per key (e.g. cell and user) is kept as a JSON file,
+replaced atomically so readers never see a partial snapshot.
+
+Data Flow:
+- Input: Extraction results from GongAgent
+- Processing: JSON dump to a temporary file → os.replace
+- Output: Last snapshot per key with its age
+
+Critical Because:
+Interactive callers of quick_extract waited tens of seconds for a live
+extraction even when a recent result was on disk.
+
+Dependencies:
+- Requires: json, os, tempfile, storage.spill
+- Used By: agent.GongAgent.quick_extract
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .spill import dump_results_json
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """
+    Directory of extraction snapshots, one JSON file per key.
+
+    A snapshot's age comes from its file modification time, so snapshots
+    written by other processes are picked up too.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        safe_key = re.sub(r'[^A-Za-z0-9_.@-]', '_', key)
+        return self.directory / f"{safe_key}.json"
+
+    def save(self, key: str, results: Dict[str, Any]) -> Path:
+        """Atomically replace the snapshot for key"""
+        path = self.path(key)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{path.stem}_", suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                dump_results_json(results, f)
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+        logger.debug(f"Snapshot saved to {path}")
+        return path
+
+    def load(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Load the snapshot for key.
+
+        Returns:
+            (results, saved_at epoch seconds), or None if there is no readable snapshot
+        """
+        path = self.path(key)
+        try:
+            saved_at = path.stat().st_mtime
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f), saved_at
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable snapshot {path}: {e}")
+            return None
+
+    def age(self, key: str) -> Optional[float]:
+        """Seconds since the snapshot for key was saved (None if missing)"""
+        try:
+            return max(0.0, time.time() - self.path(key).stat().st_mtime)
+        except FileNotFoundError:
+            return None
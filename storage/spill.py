@@ -0,0 +1,281 @@
+"""
+Module: spill
+Type: Internal Module
+
+Purpose:
+Disk spill for extraction results. Once in-memory records pass a budget,
+further records are appended to temporary NDJSON files and exposed as
+lazy, re-iterable views. Records streamed through a SpillBuffer (the
+pipelined call extraction) keep peak memory within the budget; lists
+admitted after the fact (extract_all_data) bound what is retained across
+object types, but each list is whole in memory until it is spilled.
+
+Data Flow:
+- Input: Extracted records, memory budget (max in-memory records)
+- Processing: Budget accounting, NDJSON append to a temporary directory
+- Output: Lists (under budget) or SpilledRecords views (over budget)
+
+Critical Because:
+Large tenants ran extraction workers out of memory by holding every
+object type's full list until the run finished.
+
+Dependencies:
+- Requires: json, tempfile, threading, weakref
+- Used By: agent.GongAgent.extract_all_data, extraction.pipeline, agent.GongAgent.save_extraction_results
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import json
+import shutil
+import tempfile
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+
+class SpillError(Exception):
+    """Raised when spilled records can't be written or read"""
+    pass
+
+
+class SpilledRecords:
+    """
+    Lazy, re-iterable view over records spilled to an NDJSON file.
+
+    Each iteration streams the file from disk; only one record is held in
+    memory at a time.
+    """
+
+    def __init__(self, path: Path, count: int, object_type: str, store: Optional['SpillStore'] = None):
+        self.path = path
+        self.object_type = object_type
+        self._count = count
+        self._store = store  # Keeps the spill directory alive while the view is referenced
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            raise SpillError(f"Spilled {self.object_type} records were cleaned up: {self.path}")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __repr__(self) -> str:
+        return f"SpilledRecords(object_type={self.object_type!r}, count={self._count}, path='{self.path}')"
+
+    def to_list(self) -> List[Any]:
+        """Load every record into memory"""
+        return list(self)
+
+
+class MemoryBudget:
+    """
+    Shared count of records held in memory across object types.
+
+    Thread-safe so concurrently extracted object types draw on one budget.
+    """
+
+    def __init__(self, max_records: int):
+        if max_records < 0:
+            raise ValueError("max_records must be non-negative")
+        self.max_records = max_records
+        self.in_memory = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, count: int) -> bool:
+        """Reserve room for count records; False if that would exceed the budget"""
+        with self._lock:
+            if self.in_memory + count > self.max_records:
+                return False
+            self.in_memory += count
+            return True
+
+    def release(self, count: int) -> None:
+        with self._lock:
+            self.in_memory = max(0, self.in_memory - count)
+
+
+class SpillStore:
+    """
+    Temporary on-disk store for spilled records, with an optional memory budget.
+
+    Files live in a private temporary directory that is removed by
+    cleanup(), on context exit, or once the store and every view over its
+    files are garbage collected.
+    """
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None, max_records: Optional[int] = None):
+        """
+        Create the store.
+
+        Args:
+            directory: Parent directory for the spill directory (default: system temp)
+            max_records: Records allowed in memory across all object types
+                before spilling (None for no budget)
+        """
+        if directory is not None:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+        self.directory = Path(tempfile.mkdtemp(prefix='gong_spill_', dir=directory))
+        self.budget = MemoryBudget(max_records) if max_records is not None else None
+        self.spilled_object_types: List[str] = []
+        self._files = 0
+        self._lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, shutil.rmtree, str(self.directory), True)
+
+    def _new_path(self, object_type: str) -> Path:
+        with self._lock:
+            self._files += 1
+            if object_type not in self.spilled_object_types:
+                self.spilled_object_types.append(object_type)
+            return self.directory / f"{object_type}_{self._files}.ndjson"
+
+    def buffer(self, object_type: str) -> 'SpillBuffer':
+        """Create a buffer for one object type that spills when the budget runs out"""
+        return SpillBuffer(self, object_type, self.budget)
+
+    def admit(self, object_type: str, records: Any) -> Any:
+        """
+        Keep a fully extracted list in memory if it fits the budget, otherwise
+        spill it and return a SpilledRecords view. Non-list values pass through.
+
+        The list is already in memory, so this bounds what stays resident
+        afterwards (the caller drops its list for the view), not the peak
+        while it was fetched; use buffer() to spill records as they arrive.
+        """
+        if not isinstance(records, list) or self.budget is None or self.budget.reserve(len(records)):
+            return records
+        return self.spill(object_type, records)
+
+    def spill(self, object_type: str, records: Iterable[Any]) -> SpilledRecords:
+        """Write records to disk and return a lazy view over them"""
+        buffer = SpillBuffer(self, object_type)
+        buffer.extend(records)
+        return buffer.spilled()
+
+    def cleanup(self) -> None:
+        """Remove all spilled files"""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cleanup()
+
+
+class SpillBuffer:
+    """
+    Append-only record buffer that moves to disk when the budget runs out.
+
+    Records are kept in memory while the shared MemoryBudget allows; the
+    first record that doesn't fit moves the whole buffer to an NDJSON file
+    and everything after it is appended there. Without a budget every
+    record goes straight to disk.
+    """
+
+    def __init__(self, store: SpillStore, object_type: str, budget: Optional[MemoryBudget] = None):
+        self.store = store
+        self.object_type = object_type
+        self.budget = budget
+        self.count = 0
+        self._records: Optional[List[Any]] = []
+        self._file = None
+        self._path: Optional[Path] = None
+
+    @property
+    def is_spilled(self) -> bool:
+        return self._path is not None
+
+    def append(self, record: Any) -> None:
+        if self._records is not None:
+            if self.budget is not None and self.budget.reserve(1):
+                self._records.append(record)
+                self.count += 1
+                return
+            self._move_to_disk()
+
+        self._write(record)
+        self.count += 1
+
+    def extend(self, records: Iterable[Any]) -> None:
+        for record in records:
+            self.append(record)
+
+    def _move_to_disk(self) -> None:
+        self._path = self.store._new_path(self.object_type)
+        try:
+            self._file = open(self._path, 'w', encoding='utf-8')
+        except OSError as e:
+            raise SpillError(f"Failed to open spill file for {self.object_type}: {e}")
+
+        records, self._records = self._records, None
+        for record in records:
+            self._write(record)
+        if self.budget is not None:
+            self.budget.release(len(records))
+
+    def _write(self, record: Any) -> None:
+        try:
+            self._file.write(json.dumps(record, default=str, separators=(',', ':')))
+            self._file.write('\n')
+        except OSError as e:
+            raise SpillError(f"Failed to spill {self.object_type} record: {e}")
+
+    def spilled(self) -> SpilledRecords:
+        """Finish writing and return a disk-backed view (spilling if needed)"""
+        if self._records is not None:
+            self._move_to_disk()
+        self._file.close()
+        return SpilledRecords(self._path, self.count, self.object_type, self.store)
+
+    def result(self) -> Union[List[Any], SpilledRecords]:
+        """The buffered records: a list if they fit the budget, otherwise a SpilledRecords view"""
+        if self._records is not None:
+            return self._records
+        return self.spilled()
+
+
+def materialize(value: Any) -> Any:
+    """Load a SpilledRecords view into a list; other values pass through"""
+    return value.to_list() if isinstance(value, SpilledRecords) else value
+
+
+def dump_results_json(results: Dict[str, Any], f, indent: int = 2) -> None:
+    """
+    Write extraction results as JSON, streaming spilled object types
+    record by record instead of loading them into memory.
+    """
+    data = results.get('data', {})
+    if not any(isinstance(records, SpilledRecords) for records in data.values()):
+        json.dump(results, f, indent=indent, default=str)
+        return
+
+    pad = ' ' * indent
+    f.write('{\n')
+    for key, value in results.items():
+        if key == 'data':
+            continue
+        f.write(f'{pad}{json.dumps(key)}: {json.dumps(value, default=str)},\n')
+
+    f.write(f'{pad}"data": {{')
+    for i, (object_type, records) in enumerate(data.items()):
+        f.write(',' if i else '')
+        f.write(f'\n{pad}{pad}{json.dumps(object_type)}: ')
+        if isinstance(records, SpilledRecords):
+            f.write('[')
+            for j, record in enumerate(records):
+                f.write(',' if j else '')
+                f.write(f'\n{pad * 3}{json.dumps(record, default=str)}')
+            f.write(f'\n{pad}{pad}]')
+        else:
+            f.write(json.dumps(records, default=str))
+    f.write(f'\n{pad}}}\n}}\n')
@@ -0,0 +1,489 @@
+"""
+Module: sqlite_sink
+Type: Internal Module
+
+Purpose:
+Embedded SQLite warehouse that GongAgent can extract into directly, giving
+fast local queries over calls, participants, deals, users, accounts,
+transcripts and team stats.
+
+Data Flow:
+- Input: Raw record dictionaries per object type (as returned by GongAgent.extract_*)
+- Processing: Field mapping → Batched upserts on natural keys
+- Output: Indexed SQLite tables
+
+Critical Because:
+Repeated extractions must be idempotent. Upserting on natural keys (call_id,
+deal_id, email) means re-running an extraction updates rows in place instead
+of piling up timestamped JSON files.
+
+Dependencies:
+- Requires: sqlite3, storage.records
+- Used By: agent.GongAgent.extract_all_data (sink argument)
+
+Error Handling:
+- GongSQLiteSinkError: Raised for unknown tables or database failures
+- Object types without a table (e.g. library) are ignored
+- Records without a natural key are skipped and counted in skipped_records
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .records import get_field, record_key, to_bool, to_datetime
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS calls (
+        call_id TEXT PRIMARY KEY,
+        title TEXT,
+        call_type TEXT,
+        start_time TEXT,
+        end_time TEXT,
+        duration_seconds INTEGER,
+        host_email TEXT,
+        account_id TEXT,
+        opportunity_id TEXT,
+        is_private INTEGER,
+        raw_json TEXT,
+        synced_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS call_participants (
+        call_id TEXT NOT NULL,
+        email TEXT NOT NULL,
+        name TEXT,
+        is_host INTEGER,
+        is_internal INTEGER,
+        talk_time_seconds INTEGER,
+        PRIMARY KEY (call_id, email)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS deals (
+        deal_id TEXT PRIMARY KEY,
+        name TEXT,
+        account_id TEXT,
+        owner_email TEXT,
+        stage TEXT,
+        amount REAL,
+        currency TEXT,
+        probability REAL,
+        close_date TEXT,
+        raw_json TEXT,
+        synced_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        email TEXT PRIMARY KEY,
+        user_id TEXT,
+        full_name TEXT,
+        first_name TEXT,
+        last_name TEXT,
+        title TEXT,
+        is_active INTEGER,
+        raw_json TEXT,
+        synced_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS accounts (
+        account_id TEXT PRIMARY KEY,
+        name TEXT,
+        domain TEXT,
+        industry TEXT,
+        owner_email TEXT,
+        raw_json TEXT,
+        synced_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS transcripts (
+        call_id TEXT PRIMARY KEY,
+        segment_count INTEGER,
+        raw_json TEXT,
+        synced_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS team_stats (
+        metric TEXT NOT NULL,
+        period TEXT NOT NULL,
+        unit TEXT,
+        value_json TEXT,
+        synced_at TEXT,
+        PRIMARY KEY (metric, period)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_calls_start_time ON calls (start_time)",
+    "CREATE INDEX IF NOT EXISTS idx_calls_account_id ON calls (account_id)",
+    "CREATE INDEX IF NOT EXISTS idx_calls_host_email ON calls (host_email)",
+    "CREATE INDEX IF NOT EXISTS idx_participants_email ON call_participants (email)",
+    "CREATE INDEX IF NOT EXISTS idx_deals_account_id ON deals (account_id)",
+]
+
+# Object type -> (table, key columns, value columns)
+TABLES: Dict[str, Tuple[str, Tuple[str, ...], Tuple[str, ...]]] = {
+    'calls': ('calls', ('call_id',), (
+        'title', 'call_type', 'start_time', 'end_time', 'duration_seconds', 'host_email',
+        'account_id', 'opportunity_id', 'is_private', 'raw_json', 'synced_at')),
+    'call_participants': ('call_participants', ('call_id', 'email'), (
+        'name', 'is_host', 'is_internal', 'talk_time_seconds')),
+    'deals': ('deals', ('deal_id',), (
+        'name', 'account_id', 'owner_email', 'stage', 'amount', 'currency',
+        'probability', 'close_date', 'raw_json', 'synced_at')),
+    'users': ('users', ('email',), (
+        'user_id', 'full_name', 'first_name', 'last_name', 'title', 'is_active',
+        'raw_json', 'synced_at')),
+    'accounts': ('accounts', ('account_id',), (
+        'name', 'domain', 'industry', 'owner_email', 'raw_json', 'synced_at')),
+    'transcripts': ('transcripts', ('call_id',), ('segment_count', 'raw_json', 'synced_at')),
+    'team_stats': ('team_stats', ('metric', 'period'), ('unit', 'value_json', 'synced_at')),
+}
+
+# Conversations are calls returned by the conversations search endpoint
+OBJECT_TYPE_TABLES = {
+    'calls': 'calls',
+    'conversations': 'calls',
+    'deals': 'deals',
+    'users': 'users',
+    'accounts': 'accounts',
+    'transcripts': 'transcripts',
+    'team_stats': 'team_stats',
+}
+
+# Object types that share a table with a richer payload: their upserts only
+# fill columns they carry (conversations have no host_email, call_type,
+# opportunity_id, ...) and never replace the stored raw_json
+MERGED_OBJECT_TYPES = frozenset({'conversations'})
+
+
+class GongSQLiteSinkError(Exception):
+    """Raised when writing to the SQLite warehouse fails"""
+    pass
+
+
+def _upsert_sql(table: str, key_columns: Tuple[str, ...], value_columns: Tuple[str, ...],
+                merge: bool = False) -> str:
+    """
+    Build an INSERT ... ON CONFLICT DO UPDATE statement.
+
+    With merge, NULL incoming values keep the stored value and an existing
+    raw_json is kept, so a partial payload doesn't erase a fuller one.
+    """
+    columns = key_columns + value_columns
+    placeholders = ', '.join('?' for _ in columns)
+    if merge:
+        updates = ', '.join(
+            f"{column} = COALESCE({column}, excluded.{column})" if column == 'raw_json'
+            else f"{column} = COALESCE(excluded.{column}, {column})"
+            for column in value_columns
+        )
+    else:
+        updates = ', '.join(f"{column} = excluded.{column}" for column in value_columns)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+        f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates}"
+    )
+
+
+def _timestamp(value: Any) -> Optional[str]:
+    """Normalize a raw timestamp to an ISO string so it sorts correctly"""
+    try:
+        parsed = to_datetime(value)
+    except (TypeError, ValueError, OverflowError):
+        return str(value)
+    return parsed.isoformat() if parsed else None
+
+
+def _flag(value: Any) -> Optional[int]:
+    """Store booleans as 0/1"""
+    flag = to_bool(value)
+    return None if flag is None else int(flag)
+
+
+def _number(value: Any, cast=float) -> Optional[Union[int, float]]:
+    """Coerce numeric payload values, returning None when not numeric"""
+    if value is None:
+        return None
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _text(value: Any) -> Optional[str]:
+    """Store ids as text regardless of payload type"""
+    return None if value is None else str(value)
+
+
+def _json(value: Any) -> Optional[str]:
+    """Serialize a payload value for a JSON column"""
+    return None if value is None else json.dumps(value, default=str)
+
+
+class GongSQLiteSink:
+    """
+    Local SQLite store for extracted Gong data.
+
+    Usable as an extraction sink: write(object_type, records) upserts a batch
+    and close() releases the connection.
+    """
+
+    def __init__(self, db_path: Union[str, Path], batch_size: int = 500):
+        """
+        Open (or create) the warehouse.
+
+        Args:
+            db_path: SQLite database path (':memory:' for an in-memory store)
+            batch_size: Rows written per transaction
+        """
+        self.db_path = str(db_path)
+        self.batch_size = batch_size
+        self.skipped_records = 0
+        self._lock = threading.Lock()
+
+        if self.db_path != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        with self.connection:
+            for statement in SCHEMA_STATEMENTS:
+                self.connection.execute(statement)
+
+        logger.info(f"SQLite warehouse opened at {self.db_path}")
+
+    def supports(self, object_type: str) -> bool:
+        """Check whether an object type has a table"""
+        return object_type in OBJECT_TYPE_TABLES
+
+    def write(self, object_type: str, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Upsert records of an object type in batched transactions.
+
+        Args:
+            object_type: calls, conversations, deals, users, accounts, transcripts or team_stats
+            records: Raw record dictionaries
+
+        Returns:
+            Number of records written
+        """
+        table = OBJECT_TYPE_TABLES.get(object_type)
+        if table is None:
+            logger.debug(f"Skipping SQLite write for unsupported object type: {object_type}")
+            return 0
+
+        row_builder = getattr(self, f"_{table}_rows")
+        merge = object_type in MERGED_OBJECT_TYPES
+        synced_at = datetime.now().isoformat()
+        written = 0
+
+        rows: Dict[str, List[tuple]] = {}
+        for record in records:
+            record_rows = row_builder(object_type, record, synced_at)
+            if not record_rows:
+                self.skipped_records += 1
+                continue
+
+            for row_table, row in record_rows:
+                rows.setdefault(row_table, []).append(row)
+            written += 1
+
+            if written % self.batch_size == 0:
+                self._execute_batch(rows, merge)
+                rows = {}
+
+        self._execute_batch(rows, merge)
+
+        logger.info(f"Upserted {written} {object_type} records into {table}")
+        return written
+
+    def _execute_batch(self, rows: Dict[str, List[tuple]], merge: bool = False) -> None:
+        """Write one batch of rows inside a single transaction (see _upsert_sql for merge)"""
+        if not rows:
+            return
+
+        try:
+            with self._lock, self.connection:
+                for table, table_rows in rows.items():
+                    _, key_columns, value_columns = TABLES[table]
+                    self.connection.executemany(_upsert_sql(table, key_columns, value_columns, merge), table_rows)
+        except sqlite3.Error as e:
+            raise GongSQLiteSinkError(f"SQLite batch write failed: {e}")
+
+    # ============================================================================
+    # Row Builders
+    # ============================================================================
+
+    def _calls_rows(self, object_type: str, record: Dict[str, Any], synced_at: str) -> List[Tuple[str, tuple]]:
+        """Build calls and call_participants rows for one call record"""
+        call_id = record_key(object_type, record)
+        if not call_id:
+            return []
+
+        rows = [('calls', (
+            call_id,
+            get_field(record, 'title'),
+            get_field(record, 'call_type'),
+            _timestamp(get_field(record, 'start_time')),
+            _timestamp(get_field(record, 'end_time')),
+            _number(get_field(record, 'duration_seconds'), int),
+            get_field(record, 'host_email'),
+            get_field(record, 'account_id'),
+            get_field(record, 'opportunity_id'),
+            _flag(get_field(record, 'is_private')),
+            _json(record),
+            synced_at
+        ))]
+
+        for participant in record.get('participants') or []:
+            if not isinstance(participant, dict):
+                continue
+            email = get_field(participant, 'email')
+            if not email:
+                continue
+            rows.append(('call_participants', (
+                call_id,
+                str(email).lower(),
+                participant.get('name'),
+                _flag(participant.get('is_host', participant.get('isHost'))),
+                _flag(participant.get('is_internal', participant.get('isInternal'))),
+                _number(participant.get('talk_time_seconds', participant.get('talkTime')), int)
+            )))
+
+        return rows
+
+    def _deals_rows(self, object_type: str, record: Dict[str, Any], synced_at: str) -> List[Tuple[str, tuple]]:
+        """Build the deals row for one deal record"""
+        deal_id = record_key(object_type, record)
+        if not deal_id:
+            return []
+
+        return [('deals', (
+            deal_id,
+            get_field(record, 'name'),
+            get_field(record, 'account_id'),
+            get_field(record, 'owner_email'),
+            get_field(record, 'stage'),
+            _number(get_field(record, 'amount')),
+            get_field(record, 'currency'),
+            _number(get_field(record, 'probability')),
+            _timestamp(get_field(record, 'close_date')),
+            _json(record),
+            synced_at
+        ))]
+
+    def _users_rows(self, object_type: str, record: Dict[str, Any], synced_at: str) -> List[Tuple[str, tuple]]:
+        """Build the users row for one user record"""
+        email = record_key(object_type, record)
+        if not email:
+            return []
+
+        return [('users', (
+            email,
+            _text(get_field(record, 'user_id')),
+            get_field(record, 'full_name'),
+            get_field(record, 'first_name'),
+            get_field(record, 'last_name'),
+            get_field(record, 'title'),
+            _flag(get_field(record, 'is_active')),
+            _json(record),
+            synced_at
+        ))]
+
+    def _accounts_rows(self, object_type: str, record: Dict[str, Any], synced_at: str) -> List[Tuple[str, tuple]]:
+        """Build the accounts row for one account record"""
+        account_id = record_key(object_type, record) or _text(record.get('id'))
+        if not account_id:
+            return []
+
+        return [('accounts', (
+            account_id,
+            get_field(record, 'name'),
+            get_field(record, 'domain'),
+            get_field(record, 'industry'),
+            get_field(record, 'owner_email'),
+            _json(record),
+            synced_at
+        ))]
+
+    def _transcripts_rows(self, object_type: str, record: Dict[str, Any], synced_at: str) -> List[Tuple[str, tuple]]:
+        """Build the transcripts row for one transcript record"""
+        call_id = record_key('calls', record)
+        if not call_id:
+            return []
+
+        segments = record.get('segments') or record.get('transcript') or []
+        return [('transcripts', (
+            call_id,
+            len(segments) if isinstance(segments, list) else None,
+            _json(record),
+            synced_at
+        ))]
+
+    def _team_stats_rows(self, object_type: str, record: Dict[str, Any], synced_at: str) -> List[Tuple[str, tuple]]:
+        """Build the team_stats row for one metric record"""
+        metric = record.get('metric')
+        if not metric:
+            return []
+
+        return [('team_stats', (
+            metric,
+            record.get('period') or 'week',
+            record.get('unit'),
+            _json(record.get('value')),
+            synced_at
+        ))]
+
+    # ============================================================================
+    # Queries
+    # ============================================================================
+
+    def query(self, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        """
+        Run a read query against the warehouse.
+
+        Args:
+            sql: SQL statement
+            params: Statement parameters
+
+        Returns:
+            Rows as dictionaries
+        """
+        with self._lock:
+            cursor = self.connection.execute(sql, tuple(params))
+            return [dict(row) for row in cursor.fetchall()]
+
+    def count(self, table: str) -> int:
+        """Return the number of rows in a table"""
+        if table not in TABLES:
+            raise GongSQLiteSinkError(f"Unknown table: {table}")
+        return self.query(f"SELECT COUNT(*) AS n FROM {table}")[0]['n']
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self.connection.close()
+        logger.info(f"SQLite warehouse closed at {self.db_path}")
+
+    def __enter__(self) -> 'GongSQLiteSink':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -14,7 +14,7 @@ Critical Because:
 Central integration point for Gong - without this, no Gong data can be accessed.
 
 Dependencies:
-- Requires: pytest, tempfile, unittest.mock, data_models, authentication, api_client, agent
+- Requires: pytest, tempfile, unittest.mock, data_models, authentication, api_client, agent, benchmarks
 - Used By: app_backend.ingestion.orchestrator, app_backend.api_bridge.server
 
 Author: Julia Evans
@@ -34,6 +34,7 @@ from data_models import GongSession, GongAuthenticationToken, GongJWTPayload
 from authentication import GongAuthenticationManager
 from api_client import GongAPIClient
 from agent import GongAgent
+from benchmarks import SyntheticGongData
 
 
 @pytest.fixture
@@ -213,6 +214,19 @@ def mock_api_responses():
     }
 
 
+@pytest.fixture
+def synthetic_data():
+    """Seeded synthetic Gong tenant fixture"""
+    return SyntheticGongData(seed=42, calls=10000, deals=2000, users=100, transcript_segments=2000)
+
+
+@pytest.fixture
+def synthetic_har_file(synthetic_data, tmp_path):
+    """Synthetic HAR capture with JWT cookies that expire in 1 hour"""
+    return synthetic_data.write_har(tmp_path / 'synthetic.har', entries=200,
+                                    issued_at=int(datetime.now().timestamp()))
+
+
 # Pytest configuration
 def pytest_configure(config):
     """Configure pytest with custom markers"""
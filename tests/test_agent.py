@@ -416,6 +416,82 @@ class TestComprehensiveExtraction:
             assert metadata['performance_target_met'] is True  # Under 30 seconds
 
 
+class TestObjectStatus:
+    """Test per-object-type extraction status"""
+
+    def test_object_status_partial_when_limited_or_deduped(self):
+        """Test only fully extracted, unfiltered object types are marked complete"""
+        from storage import ContentHashIndex
+
+        agent = GongAgent(Mock())
+        agent.session = Mock(user_email="test@example.com", cell_id="us-14496")
+        agent.extract_calls = Mock(return_value=[{'id': '1'}, {'id': '2'}])
+        agent.extract_users = Mock(return_value=[{'email': 'a@x.com'}])
+        agent.extract_deals = Mock(return_value=[{'id': '3'}])
+
+        with ContentHashIndex() as dedupe_index:
+            dedupe_index.filter_changed('users', [{'email': 'a@x.com'}])
+            dedupe_index.commit('users')
+            result = agent.extract_all_data(include_conversations=False, include_library=False,
+                                            include_stats=False, calls_limit=2, deals_limit=10,
+                                            dedupe_index=dedupe_index)
+
+        assert result['metadata']['object_status'] == {'calls': 'partial', 'users': 'partial', 'deals': 'complete'}
+
+
+class TestAccount360:
+    """Test account 360 extraction through the retry wrapper"""
+
+    def test_auth_failure_refreshes_and_recrawls_account(self):
+        """Test an account with an auth failure is re-crawled after a session refresh"""
+        from unittest.mock import AsyncMock
+
+        agent = GongAgent(Mock())
+        agent.session = Mock(user_email="test@example.com", cell_id="us-14496")
+        agent.api_client = Mock()
+        agent.api_client.get_bytes_received.return_value = 0
+        agent.api_client.get_account_details.side_effect = [
+            GongAPIError("Authentication failed - session may be expired"),
+            {'name': 'Acme'}
+        ]
+        agent.api_client.get_account_people.return_value = []
+        agent.api_client.get_account_opportunities.return_value = []
+        agent._ensure_authenticated = AsyncMock()
+
+        accounts = list(agent.extract_account_360(['acme'], include_activities=False))
+
+        assert [(account['account_id'], account['details'], account['errors']) for account in accounts] == [
+            ('acme', {'name': 'Acme'}, [])
+        ]
+        agent._ensure_authenticated.assert_awaited_once()
+        assert agent.object_stats.summary()['account_360']['items'] == 1
+
+    def test_contact_auth_failure_refreshes_and_refetches_contact(self):
+        """Test a 401 on a contact part triggers a refresh and the contact is fetched again"""
+        from unittest.mock import AsyncMock
+
+        agent = GongAgent(Mock())
+        agent.session = Mock(user_email="test@example.com", cell_id="us-14496")
+        agent.api_client = Mock()
+        agent.api_client.get_bytes_received.return_value = 0
+        agent.api_client.get_account_details.return_value = {'name': 'Acme'}
+        agent.api_client.get_account_people.return_value = [{'contactId': 'c1'}]
+        agent.api_client.get_account_opportunities.return_value = []
+        agent.api_client.get_contact_details.side_effect = [
+            GongAPIError("Authentication failed - session may be expired"),
+            {'name': 'Buyer'}
+        ]
+        agent.api_client.get_contact_engagements.return_value = []
+        agent._ensure_authenticated = AsyncMock()
+
+        accounts = list(agent.extract_account_360(['acme'], include_activities=False))
+
+        assert [contact['details'] for contact in accounts[0]['contacts']] == [{'name': 'Buyer'}]
+        assert accounts[0]['contacts'][0]['errors'] == []
+        assert agent.api_client.get_contact_details.call_count == 2
+        agent._ensure_authenticated.assert_awaited_once()
+
+
 class TestPerformanceValidation:
     """Test performance validation functionality"""
     
@@ -446,7 +522,7 @@ class TestPerformanceValidation:
                 }
             }
             
-            with patch('time.time') as mock_time:
+            with patch('time.perf_counter') as mock_time:
                 mock_time.side_effect = [0, 12.5]
                 
                 result = self.agent.validate_performance()
@@ -544,6 +620,67 @@ class TestQuickExtract:
         with pytest.raises(GongAgentError, match="No session available"):
             agent.quick_extract()
 
+    def test_quick_extract_serves_snapshot_and_refreshes(self, tmp_path):
+        """Test a recent snapshot is returned immediately while a refresh runs"""
+        agent = GongAgent(Mock())
+        agent.session = Mock(cell_id='us-14496', user_email='test@example.com')
+
+        with patch.object(agent, 'extract_all_data') as mock_extract:
+            mock_extract.return_value = {'metadata': {'run': 1}, 'data': {}}
+            first = agent.quick_extract(snapshot_dir=tmp_path, revalidate_after_seconds=0)
+
+            mock_extract.return_value = {'metadata': {'run': 2}, 'data': {}}
+            second = agent.quick_extract(snapshot_dir=tmp_path, revalidate_after_seconds=0)
+            agent._snapshot_refresh_thread.join()
+            third = agent.quick_extract(snapshot_dir=tmp_path, revalidate_after_seconds=3600)
+
+        assert first['metadata']['snapshot']['served_from_snapshot'] is False
+        assert second['metadata']['run'] == 1
+        assert second['metadata']['snapshot']['served_from_snapshot'] is True
+        assert second['metadata']['snapshot']['refreshing'] is True
+        assert third['metadata']['run'] == 2
+        assert mock_extract.call_count == 2
+
+    def test_failed_refresh_keeps_snapshot(self, tmp_path):
+        """Test a refresh with failed object types doesn't replace a good snapshot"""
+        agent = GongAgent(Mock())
+        agent.session = Mock(cell_id='us-14496', user_email='test@example.com')
+
+        with patch.object(agent, 'extract_all_data') as mock_extract:
+            mock_extract.return_value = {'metadata': {'run': 1, 'errors': [], 'object_status': {'calls': 'partial'}},
+                                         'data': {'calls': [{'id': '1'}]}}
+            agent.quick_extract(snapshot_dir=tmp_path, revalidate_after_seconds=0)
+
+            mock_extract.return_value = {'metadata': {'run': 2, 'errors': ['Calls extraction failed: 401'],
+                                                      'object_status': {'calls': 'failed'}},
+                                         'data': {}}
+            agent.quick_extract(snapshot_dir=tmp_path, revalidate_after_seconds=0)
+            agent._snapshot_refresh_thread.join()
+            served = agent.quick_extract(snapshot_dir=tmp_path, revalidate_after_seconds=3600)
+
+        assert mock_extract.call_count == 2
+        assert served['metadata']['run'] == 1
+        assert served['data'] == {'calls': [{'id': '1'}]}
+
+    def test_quick_extract_blocks_when_too_stale(self, tmp_path):
+        """Test snapshots older than max staleness trigger a live extraction"""
+        import os
+
+        agent = GongAgent(Mock())
+        agent.session = Mock(cell_id='us-14496', user_email='test@example.com')
+
+        with patch.object(agent, 'extract_all_data') as mock_extract:
+            mock_extract.return_value = {'metadata': {'run': 1}, 'data': {}}
+            agent.quick_extract(snapshot_dir=tmp_path)
+            for snapshot in tmp_path.iterdir():
+                os.utime(snapshot, (time.time() - 7200, time.time() - 7200))
+
+            mock_extract.return_value = {'metadata': {'run': 2}, 'data': {}}
+            result = agent.quick_extract(snapshot_dir=tmp_path, max_staleness_seconds=3600)
+
+        assert result['metadata']['run'] == 2
+        assert result['metadata']['snapshot']['served_from_snapshot'] is False
+
 
 class TestStatusReporting:
     """Test comprehensive status reporting"""
@@ -163,9 +163,34 @@ class TestRateLimiting:
         }
         
         client._update_rate_limit_info(mock_response)
-        
+
         assert client.rate_limit_remaining == 500
 
+    def test_shared_rate_limiter_spans_clients(self, tmp_path):
+        """Test clients sharing a cell limiter reserve consecutive slots"""
+        from api_client import SharedRateLimiter
+
+        first, second = GongAPIClient(), GongAPIClient()
+        first.set_rate_limiter(SharedRateLimiter('us-14496', min_request_interval=10, directory=tmp_path))
+        second.set_rate_limiter(SharedRateLimiter('us-14496', min_request_interval=10, directory=tmp_path))
+
+        with patch('time.sleep') as mock_sleep:
+            first._handle_rate_limiting()
+            second._handle_rate_limiting()
+
+        # The second client waits for the slot after the first client's request
+        assert mock_sleep.call_count == 1
+        assert 9 < mock_sleep.call_args[0][0] <= 10
+
+    def test_shared_rate_limiter_penalty(self, tmp_path):
+        """Test a 429 pushes back the next slot for the whole cell"""
+        from api_client import SharedRateLimiter
+
+        limiter = SharedRateLimiter('us-14496', min_request_interval=0, directory=tmp_path)
+        limiter.penalize(30)
+
+        assert 29 < SharedRateLimiter('us-14496', directory=tmp_path).reserve() <= 30
+
 
 class TestRequestHandling:
     """Test HTTP request handling"""
@@ -277,6 +302,69 @@ class TestRequestHandling:
         result = client._make_request('GET', '/test/endpoint')
         
         assert result == {"text": "Plain text response", "status_code": 200}
+    
+    @patch('requests.Session.request')
+    def test_make_request_rotates_pooled_sessions_on_429(self, mock_request):
+        """Test a 429 on one pooled identity is retried on another"""
+        from authentication import SessionPool
+        
+        def pooled_session(email):
+            now = int(datetime.now().timestamp())
+            payload = GongJWTPayload(gp="Okta", exp=now + 3600, iat=now, jti=email, gu=email, cell="us-14496")
+            token = GongAuthenticationToken(token_type="cell_jwt", raw_token=f"token-{email}", payload=payload,
+                                            expires_at=datetime.fromtimestamp(payload.exp),
+                                            issued_at=datetime.fromtimestamp(payload.iat),
+                                            is_expired=False, cell_id="us-14496", user_email=email)
+            return GongSession(session_id=email, user_email=email, cell_id="us-14496",
+                               authentication_tokens=[token])
+        
+        client, _ = self.create_mock_session_and_client()
+        first, second = pooled_session("a@example.com"), pooled_session("b@example.com")
+        client.set_session_pool(SessionPool([first, second], min_request_interval=0))
+        
+        limited = Mock(ok=False, status_code=429, headers={'Retry-After': '30'})
+        success = Mock(ok=True, status_code=200, headers={})
+        success.json.return_value = {"success": True}
+        mock_request.side_effect = [limited, success]
+        
+        assert client._make_request('GET', '/test/endpoint') == {"success": True}
+        assert [c.args[0] for c in client.auth_manager.get_session_headers.call_args_list] == [first, second]
+        health = {entry['user_email']: entry for entry in client.session_pool.stats()}
+        assert health["a@example.com"]['recent_failures'] == 1
+        assert health["b@example.com"]['requests'] == 1
+
+
+    def test_make_request_releases_pooled_session_on_error(self):
+        """Test a pooled identity is released when building the request fails"""
+        client, _ = self.create_mock_session_and_client()
+        pooled = Mock()
+        client.session_pool = Mock()
+        client.session_pool.usable_count.return_value = 1
+        client.session_pool.acquire.return_value = (pooled, 0)
+        client.auth_manager.get_session_headers.side_effect = RuntimeError("bad session")
+        
+        with pytest.raises(RuntimeError, match="bad session"):
+            client._make_request('GET', '/test/endpoint')
+        
+        client.session_pool.record.assert_called_once_with(pooled)
+    
+    @patch('requests.Session.request')
+    def test_make_request_pooled_delay_clamped_to_deadline(self, mock_request):
+        """Test waiting for a pooled identity never sleeps past the request deadline"""
+        client, _ = self.create_mock_session_and_client()
+        client.session_pool = Mock()
+        client.session_pool.usable_count.return_value = 1
+        client.session_pool.acquire.return_value = (Mock(), 30.0)
+        client.set_request_deadline(Mock(remaining=Mock(return_value=0.5)))
+        success = Mock(ok=True, status_code=200, headers={}, content=b'{}')
+        success.json.return_value = {"success": True}
+        mock_request.return_value = success
+        
+        with patch('time.sleep') as mock_sleep:
+            assert client._make_request('GET', '/test/endpoint') == {"success": True}
+        
+        mock_sleep.assert_called_once_with(0.5)
+        assert mock_request.call_args.kwargs['timeout'] == 0.5
 
 
 class TestEndpointMethods:
@@ -402,6 +490,25 @@ class TestEndpointMethods:
         mock_request.assert_called_once_with('POST', '/stats/ajax/v2/team/activity/aggregated/avgCallDuration',
                                            json_data={'metric': 'avgCallDuration', 'period': 'week'})
 
+    @patch.object(GongAPIClient, '_make_request')
+    def test_get_topics_and_trackers(self, mock_request):
+        """Test topic model and tracker endpoints"""
+        mock_request.return_value = {}
+
+        self.client.get_topic_models('month')
+        self.client.get_trackers('quarter')
+        self.client.get_user_trackers('week', user_id='u1')
+        self.client.get_user_stats('avgWeeklyDuration', period='month')
+
+        assert [call.args[1] for call in mock_request.call_args_list] == [
+            '/stats/ajax/v2/team/topics/topicModels',
+            '/stats/ajax/v2/team/trackers/all',
+            '/stats/ajax/v2/team/trackers/users',
+            '/stats/ajax/v2/team/activity/users/avgWeeklyDuration'
+        ]
+        assert mock_request.call_args_list[2].kwargs['json_data'] == {'period': 'week', 'user_id': 'u1'}
+        assert mock_request.call_args_list[3].kwargs['json_data'] == {'metric': 'avgWeeklyDuration', 'period': 'month'}
+
 
 class TestConnectionTesting:
     """Test connection testing functionality"""
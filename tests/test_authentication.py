@@ -22,6 +22,7 @@ Date: 2025-06-20
 """
 import pytest
 import json
+import os
 import tempfile
 from datetime import datetime
 from pathlib import Path
@@ -34,11 +35,45 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from authentication import (
     GongAuthenticationManager,
     GongAuthenticationError,
-    GongSessionExpiredError
+    GongSessionExpiredError,
+    HARStreamError,
+    HarvestedSession,
+    JWTDecodeCache,
+    SessionCache,
+    SessionPool,
+    SessionSourceCache,
+    SessionStore,
+    SessionStoreError,
+    compact_har,
+    find_session_sources,
+    harvest_session_sources,
+    iter_har_entries,
+    rank_sessions,
+    source_fingerprint
 )
+from authentication.artifact_scan import JWT_COOKIE, SESSION_COOKIE, CookieClassifier
+from authentication.session_store import CRYPTOGRAPHY_AVAILABLE, generate_store_key
 from data_models import GongSession, GongAuthenticationToken, GongJWTPayload
 
 
+def create_identity_session(email, cell="us-14496", expires_in=3600):
+    """Create a session for one identity whose token expires in expires_in seconds"""
+    now = int(datetime.now().timestamp())
+    jwt_payload = GongJWTPayload(gp="Okta", exp=now + expires_in, iat=now, jti=email, gu=email, cell=cell)
+    auth_token = GongAuthenticationToken(
+        token_type="cell_jwt",
+        raw_token=f"token-{email}",
+        payload=jwt_payload,
+        expires_at=datetime.fromtimestamp(jwt_payload.exp),
+        issued_at=datetime.fromtimestamp(jwt_payload.iat),
+        is_expired=expires_in <= 0,
+        cell_id=cell,
+        user_email=email
+    )
+    return GongSession(session_id=email, user_email=email, cell_id=cell,
+                       authentication_tokens=[auth_token], session_cookies={})
+
+
 class TestGongAuthenticationManager:
     """Test GongAuthenticationManager class"""
     
@@ -122,14 +157,11 @@ class TestHARSessionExtraction:
             }
         }
     
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('json.load')
     @patch.object(GongAuthenticationManager, '_process_jwt_cookie')
-    def test_extract_session_from_har_success(self, mock_process_jwt, mock_json_load, mock_file):
+    def test_extract_session_from_har_success(self, mock_process_jwt, tmp_path):
         """Test successful session extraction from HAR"""
-        # Setup mocks
-        mock_har_data = self.create_mock_har_data()
-        mock_json_load.return_value = mock_har_data
+        har_path = tmp_path / 'capture.har'
+        har_path.write_text(json.dumps(self.create_mock_har_data()))
         
         # Mock JWT processing
         mock_jwt_payload = GongJWTPayload(
@@ -157,15 +189,14 @@ class TestHARSessionExtraction:
         # Test extraction
         auth_manager = GongAuthenticationManager()
         
-        with tempfile.NamedTemporaryFile(suffix='.har') as temp_file:
-            temp_path = Path(temp_file.name)
-            session = auth_manager.extract_session_from_har(temp_path)
-            
-            assert session is not None
-            assert session.user_email == "test@example.com"
-            assert session.cell_id == "us-14496"
-            assert len(session.authentication_tokens) > 0
-            assert session.is_active
+        session = auth_manager.extract_session_from_har(har_path)
+        
+        assert session is not None
+        assert session.user_email == "test@example.com"
+        assert session.cell_id == "us-14496"
+        assert len(session.authentication_tokens) > 0
+        assert session.session_cookies == {"g-session": "test_session_value"}
+        assert session.is_active
     
     def test_extract_session_from_har_file_not_found(self):
         """Test HAR extraction with non-existent file"""
@@ -174,9 +205,7 @@ class TestHARSessionExtraction:
         with pytest.raises(GongAuthenticationError, match="HAR file not found"):
             auth_manager.extract_session_from_har(Path("non_existent.har"))
     
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('json.load')
-    def test_extract_session_from_har_no_tokens(self, mock_json_load, mock_file):
+    def test_extract_session_from_har_no_tokens(self, tmp_path):
         """Test HAR extraction with no JWT tokens"""
         # HAR data without JWT tokens
         mock_har_data = {
@@ -189,15 +218,453 @@ class TestHARSessionExtraction:
                 ]
             }
         }
-        mock_json_load.return_value = mock_har_data
+        har_path = tmp_path / 'capture.har'
+        har_path.write_text(json.dumps(mock_har_data))
         
         auth_manager = GongAuthenticationManager()
         
-        with tempfile.NamedTemporaryFile(suffix='.har') as temp_file:
-            temp_path = Path(temp_file.name)
-            
-            with pytest.raises(GongAuthenticationError, match="No JWT tokens found"):
-                auth_manager.extract_session_from_har(temp_path)
+        with pytest.raises(GongAuthenticationError, match="No JWT tokens found"):
+            auth_manager.extract_session_from_har(har_path)
+    
+    def test_extract_session_from_har_gzip_early_exit(self, synthetic_data, tmp_path):
+        """Test streamed extraction from .har.gz stops at the first entry with a full session"""
+        har_path = synthetic_data.write_har(tmp_path / 'capture.har.gz', entries=200,
+                                            issued_at=int(datetime.now().timestamp()))
+        auth_manager = GongAuthenticationManager()
+        
+        scan = auth_manager._scan_har_stream(iter_har_entries(har_path))
+        assert scan.items_scanned < 10
+        
+        session = auth_manager.extract_session_from_har(har_path)
+        assert session.user_email == synthetic_data.user(0)['email']
+        assert {token.token_type for token in session.authentication_tokens} == {'last_login_jwt', 'cell_jwt'}
+        assert 'g-session' in session.session_cookies
+
+    def test_har_early_exit_matches_full_scan_with_rotated_session(self, synthetic_data):
+        """Test early exit keeps the same session cookies as a full scan when g-session rotates"""
+        jwt_cookies = synthetic_data.jwt_cookies(issued_at=int(datetime.now().timestamp()))
+        final_cookies = [
+            {'name': 'g-session', 'value': 'rotated'},
+            {'name': 'AWSALB', 'value': 'alb'},
+            {'name': 'AWSALBTG', 'value': 'albtg'},
+            {'name': 'ajs_user_id', 'value': 'user_0'},
+            {'name': 'ajs_group_id', 'value': 'group_0'}
+        ]
+        request_cookies = [
+            jwt_cookies + [{'name': 'g-session', 'value': 'original'}],
+            final_cookies[:1],
+            final_cookies[1:3],
+            final_cookies[3:]
+        ] + [final_cookies] * 6
+        entries = [{'request': {'cookies': cookies}, 'response': {'cookies': []}}
+                   for cookies in request_cookies]
+        auth_manager = GongAuthenticationManager()
+
+        early = auth_manager._scan_har_stream(iter(entries))
+        full = auth_manager._scan_har_stream(iter(entries), early_exit=False)
+
+        assert early.items_scanned < len(entries)
+        assert early.session_cookies == full.session_cookies
+        assert early.session_cookies['g-session'] == 'rotated'
+
+    def test_extract_session_from_har_malformed(self, tmp_path):
+        """Test truncated HAR raises GongAuthenticationError"""
+        har_path = tmp_path / 'capture.har'
+        har_path.write_text('{"log": {"entries": [{"request": {"cookies": [')
+        
+        with pytest.raises(GongAuthenticationError, match="Failed to load HAR file"):
+            GongAuthenticationManager().extract_session_from_har(har_path)
+
+
+class TestHARStream:
+    """Test incremental HAR reading"""
+    
+    def test_plain_and_gzip_match_full_load(self, synthetic_data, tmp_path):
+        """Test streamed entries match json.load for plain and gzip captures"""
+        plain = synthetic_data.write_har(tmp_path / 'capture.har', entries=50)
+        compressed = synthetic_data.write_har(tmp_path / 'capture.har.gz', entries=50)
+        expected = json.loads(plain.read_text())['log']['entries']
+        
+        for path in (plain, compressed):
+            entries = list(iter_har_entries(path, chunk_size=64, slim=False))
+            assert entries == expected
+    
+    def test_slim_entries_drop_bodies(self, synthetic_data, tmp_path):
+        """Test slim entries keep cookies and headers but not response content"""
+        har_path = synthetic_data.write_har(tmp_path / 'capture.har', entries=20, noise_ratio=0)
+        
+        entry = next(iter_har_entries(har_path))
+        assert entry['request']['url'].startswith('https://')
+        assert entry['request']['cookies']
+        assert entry['response']['headers']
+        assert 'content' not in entry['response']
+    
+    def test_entries_found_after_other_log_keys(self, tmp_path):
+        """Test entries are located regardless of key order and tolerate multi-byte text"""
+        har_path = tmp_path / 'capture.har'
+        har_path.write_text(json.dumps({
+            'meta': [{'note': '} ] {'}],
+            'log': {'pages': [{'id': 'page_1'}], 'entries': [{'request': {'cookies': [{'name': 'n', 'value': 'é'}]}}]}
+        }, ensure_ascii=False), encoding='utf-8')
+        
+        entries = list(iter_har_entries(har_path, chunk_size=3))
+        assert entries[0]['request']['cookies'] == [{'name': 'n', 'value': 'é'}]
+    
+    def test_truncated_har_raises(self, tmp_path):
+        """Test truncated captures raise HARStreamError"""
+        har_path = tmp_path / 'capture.har'
+        har_path.write_text('{"log": {"entries": [{"request": {}}, {"requ')
+        
+        with pytest.raises(HARStreamError):
+            list(iter_har_entries(har_path))
+
+
+class TestHARCompaction:
+    """Test shrinking HAR captures to what session extraction reads"""
+    
+    @pytest.mark.parametrize("output_name", ["capture.compact.har", "capture.compact.har.gz"])
+    def test_compacted_capture_yields_same_session(self, synthetic_data, tmp_path, output_name):
+        """Test noise entries, bodies and unrelated headers are dropped without changing the session"""
+        har_path = synthetic_data.write_har(tmp_path / 'capture.har', entries=200,
+                                            issued_at=int(datetime.now().timestamp()))
+        auth_manager = GongAuthenticationManager()
+        
+        result = auth_manager.compact_har(har_path, tmp_path / output_name)
+        
+        assert result.entries_kept < result.entries_read == 200
+        assert result.output_bytes * 5 < result.input_bytes
+        entries = list(iter_har_entries(result.output_path, slim=False))
+        assert len(entries) == result.entries_kept
+        assert all('.gong.io' in entry['request']['url'] for entry in entries)
+        assert all('content' not in entry['response'] for entry in entries)
+        assert all(header['name'].lower() in ('cookie', 'set-cookie', 'authorization')
+                   for entry in entries for header in entry['request']['headers'])
+        
+        original = GongAuthenticationManager().extract_session_from_har(har_path, early_exit=False)
+        compacted = GongAuthenticationManager().extract_session_from_har(result.output_path, early_exit=False)
+        assert compacted.user_email == original.user_email
+        assert compacted.session_cookies == original.session_cookies
+        assert ({token.raw_token for token in compacted.authentication_tokens}
+                == {token.raw_token for token in original.authentication_tokens})
+    
+    def test_keeps_auth_cookies_on_other_hosts(self, tmp_path):
+        """Test entries off the Gong domains survive only when they carry extraction cookies"""
+        har_path = tmp_path / 'capture.har'
+        har_path.write_text(json.dumps({'log': {'entries': [
+            {'request': {'url': 'https://login.okta.com/x', 'cookies': [{'name': 'AWSALBCORS', 'value': 'v'}]}},
+            {'request': {'url': 'https://ok12static.oktacdn.com/font.woff', 'cookies': []}},
+            {'request': {'url': 'https://notgong.io/x', 'cookies': []}}
+        ]}}))
+        
+        result = compact_har(har_path, None, ['gong.io'], cookie_names=['AWSALB'])
+        
+        assert result.output_path == tmp_path / 'capture.compact.har'
+        entries = list(iter_har_entries(result.output_path))
+        assert [entry['request']['url'] for entry in entries] == ['https://login.okta.com/x']
+    
+    def test_failed_compaction_leaves_source(self, tmp_path):
+        """Test a malformed capture raises and in-place compaction leaves the source intact"""
+        har_path = tmp_path / 'capture.har'
+        har_path.write_text('{"log": {"entries": [{"request": ')
+        
+        with pytest.raises(GongAuthenticationError, match="Failed to compact HAR file"):
+            GongAuthenticationManager().compact_har(har_path, har_path)
+        
+        assert har_path.read_text() == '{"log": {"entries": [{"request": '
+        assert [path.name for path in tmp_path.iterdir()] == ['capture.har']
+
+
+class TestSessionSourceCache:
+    """Test the persistent session cache keyed by source fingerprint"""
+    
+    def test_unchanged_har_served_from_cache(self, synthetic_har_file, tmp_path):
+        """Test a second extraction of the same HAR skips parsing"""
+        cache = SessionSourceCache(tmp_path / 'cache')
+        first = GongAuthenticationManager(source_cache=cache).extract_session_from_har(synthetic_har_file)
+        
+        with patch('authentication.auth_manager.iter_har_entries') as stream:
+            manager = GongAuthenticationManager(source_cache=cache)
+            second = manager.extract_session_from_har(synthetic_har_file)
+        
+        stream.assert_not_called()
+        assert cache.hits == 1
+        assert second.session_id == first.session_id
+        assert [t.raw_token for t in second.authentication_tokens] == [t.raw_token for t in first.authentication_tokens]
+        assert second.session_cookies == first.session_cookies
+        assert manager.current_session is second
+    
+    def test_changed_har_invalidates_entry(self, synthetic_data, synthetic_har_file, tmp_path):
+        """Test rewriting the source re-extracts instead of serving the cached session"""
+        cache = SessionSourceCache(tmp_path / 'cache')
+        GongAuthenticationManager(source_cache=cache).extract_session_from_har(synthetic_har_file)
+        
+        synthetic_data.write_har(synthetic_har_file, entries=50, user_index=1,
+                                 issued_at=int(datetime.now().timestamp()))
+        session = GongAuthenticationManager(source_cache=cache).extract_session_from_har(synthetic_har_file)
+        
+        assert cache.hits == 0
+        assert session.user_email == synthetic_data.user(1)['email']
+        assert len(list((tmp_path / 'cache').glob('*.json'))) == 1
+    
+    def test_expired_entry_is_dropped(self, synthetic_har_file, tmp_path):
+        """Test entries are invalidated once the earliest token expires"""
+        cache = SessionSourceCache(tmp_path / 'cache')
+        GongAuthenticationManager(source_cache=cache).extract_session_from_har(synthetic_har_file)
+        
+        entry_path = next((tmp_path / 'cache').glob('*.json'))
+        entry = json.loads(entry_path.read_text())
+        entry['expires_at'] = datetime.now().timestamp() - 1
+        entry_path.write_text(json.dumps(entry))
+        
+        assert cache.load(cache.fingerprint(synthetic_har_file)) is None
+        assert not entry_path.exists()
+    
+    def test_fingerprint_tracks_content(self, tmp_path):
+        """Test same-size rewrites with a restored mtime still change the fingerprint"""
+        source = tmp_path / 'analysis.json'
+        source.write_text('{"artifacts": [1]}')
+        before = source_fingerprint(source)
+        
+        source.write_text('{"artifacts": [2]}')
+        os.utime(source, ns=(before.mtime_ns, before.mtime_ns))
+        after = source_fingerprint(source)
+        
+        assert after.size == before.size and after.mtime_ns == before.mtime_ns
+        assert after.content_hash != before.content_hash
+
+
+class TestSessionHarvesting:
+    """Test multi-capture session harvesting"""
+    
+    def test_harvest_ranks_by_remaining_lifetime(self, synthetic_data, tmp_path):
+        """Test captures are extracted in parallel and ranked freshest first, one per identity"""
+        now = int(datetime.now().timestamp())
+        synthetic_data.write_har(tmp_path / 'user0_short.har', entries=20, user_index=0, issued_at=now, expires_in=1800)
+        synthetic_data.write_har(tmp_path / 'user0_long.har.gz', entries=20, user_index=0, issued_at=now, expires_in=5400)
+        synthetic_data.write_har(tmp_path / 'user1.har', entries=20, user_index=1, issued_at=now, expires_in=3600)
+        synthetic_data.write_har(tmp_path / 'expired.har', entries=20, user_index=2, issued_at=now - 7200, expires_in=3600)
+        (tmp_path / 'notes.json').write_text('{"artifacts": []}')
+        
+        harvested = GongAuthenticationManager().harvest_sessions(tmp_path, workers=2)
+        
+        assert [h.source_path.name for h in harvested] == ['user0_long.har.gz', 'user1.har']
+        assert harvested[0].remaining_seconds > harvested[1].remaining_seconds > 3000
+        assert harvested[1].session.user_email == synthetic_data.user(1)['email']
+    
+    def test_harvest_per_cell_and_limit(self, synthetic_data, tmp_path):
+        """Test per_cell keeps the freshest session of each cell"""
+        now = int(datetime.now().timestamp())
+        for index, lifetime in enumerate((1800, 5400, 3600)):
+            synthetic_data.write_har(tmp_path / f'user{index}.har', entries=10, user_index=index,
+                                     issued_at=now, expires_in=lifetime)
+        
+        manager = GongAuthenticationManager()
+        per_cell = manager.harvest_sessions(tmp_path, per_cell=True, workers=2)
+        limited = manager.harvest_sessions(tmp_path, limit=2, workers=2)
+        
+        assert [h.source_path.name for h in per_cell] == ['user1.har']
+        assert [h.source_path.name for h in limited] == ['user1.har', 'user2.har']
+    
+    def test_rank_by_latest_token_expiry(self):
+        """Test a session whose longest-lived token lasts longest ranks first"""
+        short_cell = create_identity_session("a@example.com", expires_in=600)
+        long_login = create_identity_session("a@example.com", expires_in=7200).authentication_tokens[0]
+        mixed = GongSession(session_id="mixed", user_email="a@example.com", cell_id="us-14496",
+                            authentication_tokens=[short_cell.authentication_tokens[0],
+                                                   long_login.model_copy(update={'token_type': 'last_login_jwt'})])
+        single = create_identity_session("a@example.com", expires_in=3600)
+        
+        ranked = rank_sessions([HarvestedSession.from_session(Path('single.har'), single),
+                                HarvestedSession.from_session(Path('mixed.har'), mixed)])
+        
+        assert [h.source_path.name for h in ranked] == ['mixed.har']
+        assert ranked[0].remaining_seconds > 7000
+    
+    def test_find_sources_skips_unrelated_json(self, tmp_path):
+        """Test only analysis JSON files are picked up next to HAR captures"""
+        for name in ('capture.har', 'capture.har.gz', 'godcapture_analysis.json', 'notes.json', 'package.json'):
+            (tmp_path / name).write_text('{}')
+        
+        assert [path.name for path in find_session_sources(tmp_path)] == [
+            'capture.har', 'capture.har.gz', 'godcapture_analysis.json'
+        ]
+    
+    def test_rank_sessions_empty(self):
+        """Test ranking with nothing harvested"""
+        assert rank_sessions([]) == []
+        assert harvest_session_sources([]) == ([], [])
+
+
+class TestSessionPool:
+    """Test session rotation across identities"""
+    
+    def test_rotates_across_identities(self):
+        """Test each identity is spaced on its own so requests alternate without waiting"""
+        pool = SessionPool([create_identity_session("a@example.com"), create_identity_session("b@example.com")],
+                           min_request_interval=10)
+        
+        leases = [pool.acquire() for _ in range(2)]
+        third, delay = pool.acquire()
+        
+        assert {pooled.user_email for pooled, _ in leases} == {"a@example.com", "b@example.com"}
+        assert all(wait == 0 for _, wait in leases)
+        assert 9 < delay <= 10
+    
+    def test_rate_limited_identity_cools_down(self):
+        """Test a 429 moves traffic to the other identity for Retry-After seconds"""
+        pool = SessionPool([create_identity_session("a@example.com"), create_identity_session("b@example.com")],
+                           min_request_interval=0)
+        
+        pooled, _ = pool.acquire()
+        pool.record(pooled, 429, {'Retry-After': '60'})
+        
+        for _ in range(3):
+            other, delay = pool.acquire()
+            pool.record(other, 200, {'X-RateLimit-Remaining': '50'})
+            assert other.user_email != pooled.user_email and delay == 0
+        
+        health = {entry['user_email']: entry for entry in pool.stats()}
+        assert health[pooled.user_email]['recent_failures'] == 1
+        assert health[pooled.user_email]['cooldown_seconds'] > 55
+        assert health[other.user_email]['rate_limit_remaining'] == 50
+    
+    def test_unauthorized_identity_removed(self):
+        """Test a 401 takes an identity out of rotation"""
+        pool = SessionPool([create_identity_session("a@example.com")])
+        
+        pooled, _ = pool.acquire()
+        pool.record(pooled, 401)
+        
+        assert pool.usable_count() == 0
+        with pytest.raises(GongAuthenticationError, match="No usable session"):
+            pool.acquire()
+    
+    def test_rejects_other_cell(self):
+        """Test sessions must share the pool's cell"""
+        pool = SessionPool([create_identity_session("a@example.com")])
+        
+        with pytest.raises(GongAuthenticationError, match="pool is on us-14496"):
+            pool.add(create_identity_session("b@example.com", cell="eu-20001"))
+        assert len(pool) == 1
+
+
+class TestSessionCache:
+    """Test the bounded, expiry-aware session cache"""
+    
+    def test_lru_eviction_and_metrics(self):
+        """Test the least recently used session is evicted past max_sessions"""
+        cache = SessionCache(max_sessions=2)
+        cache["a"] = create_identity_session("a@example.com")
+        cache["b"] = create_identity_session("b@example.com")
+        assert cache["a"].user_email == "a@example.com"
+        cache["c"] = create_identity_session("c@example.com")
+        
+        assert set(cache) == {"a", "c"}
+        assert cache.get("b") is None
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+        assert cache.stats()['evictions'] == 1
+    
+    def test_expired_sessions_evicted_eagerly(self):
+        """Test sessions whose tokens have all expired are dropped on insert and on read"""
+        cache = SessionCache(max_sessions=10)
+        cache["old"] = create_identity_session("old@example.com", expires_in=-60)
+        cache["new"] = create_identity_session("new@example.com")
+        
+        assert "old" not in cache
+        assert cache.stats()['expired_evictions'] == 1
+        
+        cache["soon"] = create_identity_session("soon@example.com", expires_in=3600)
+        with patch('authentication.session_cache.datetime') as mock_datetime:
+            mock_datetime.now.return_value = datetime.fromtimestamp(datetime.now().timestamp() + 7200)
+            assert cache.get("soon") is None
+        assert cache.stats()['expired_evictions'] == 2
+    
+    def test_manager_cache_is_bounded(self):
+        """Test the manager's session_cache honours max_cached_sessions"""
+        auth_manager = GongAuthenticationManager(max_cached_sessions=3)
+        for index in range(10):
+            auth_manager.session_cache[f"s{index}"] = create_identity_session(f"user{index}@example.com")
+        
+        assert len(auth_manager.session_cache) == 3
+
+
+class TestSessionStore:
+    """Test the on-disk session store shared across processes"""
+    
+    def test_put_visible_to_sibling_store(self, tmp_path):
+        """Test a session stored by one instance is read by another after the file changes"""
+        writer = SessionStore(tmp_path / "sessions.json", key="")
+        reader = SessionStore(tmp_path / "sessions.json", key="")
+        assert reader.get("a@example.com", "us-14496") is None
+        
+        writer.put(create_identity_session("a@example.com"))
+        stored = reader.get("a@example.com", "us-14496")
+        assert stored.user_email == "a@example.com"
+        assert stored.has_valid_token()
+        
+        # Unchanged file: served from memory without re-reading
+        reloads = reader.reloads
+        assert reader.get("a@example.com", "us-14496") is stored
+        assert reader.reloads == reloads
+        
+        writer.put(create_identity_session("b@example.com"))
+        assert {session.user_email for session in reader.sessions()} == {"a@example.com", "b@example.com"}
+        assert reader.remove("a@example.com", "us-14496")
+        assert writer.get("a@example.com", "us-14496") is None
+    
+    def test_refresh_runs_once_across_stores(self, tmp_path):
+        """Test a second process adopts the sibling's refresh instead of refreshing again"""
+        first = SessionStore(tmp_path / "sessions.json", key="")
+        second = SessionStore(tmp_path / "sessions.json", key="")
+        refresher = Mock(side_effect=lambda session: create_identity_session(session.user_email))
+        
+        refreshed = first.refresh(create_identity_session("a@example.com", expires_in=-60), refresher)
+        adopted = second.refresh(create_identity_session("a@example.com", expires_in=-60), refresher)
+        
+        assert refresher.call_count == 1
+        assert adopted.latest_expiry == refreshed.latest_expiry
+        assert second.adopted == 1
+    
+    def test_manager_refresh_and_sync_through_store(self, tmp_path):
+        """Test managers sharing a store refresh once and pick up each other's sessions"""
+        first = GongAuthenticationManager(session_store=SessionStore(tmp_path / "sessions.json", key=""))
+        second = GongAuthenticationManager(session_store=SessionStore(tmp_path / "sessions.json", key=""))
+        first.current_session = create_identity_session("a@example.com", expires_in=-60)
+        second.current_session = create_identity_session("a@example.com", expires_in=-60)
+        
+        with patch.object(second, '_extend_token_expiry') as mock_extend:
+            refreshed = first.refresh_session()
+            assert refreshed.has_valid_token()
+            assert second.auto_refresh_if_needed().has_valid_token()
+            mock_extend.assert_not_called()
+        assert second.current_session.latest_expiry == refreshed.latest_expiry
+    
+    def test_unreadable_store_treated_as_empty(self, tmp_path):
+        """Test a corrupt plaintext store is ignored and overwritten on the next put"""
+        path = tmp_path / "sessions.json"
+        path.write_text("not json")
+        store = SessionStore(path, key="")
+        assert store.sessions() == []
+        store.put(create_identity_session("a@example.com"))
+        assert json.loads(path.read_text())['version'] == 1
+    
+    @pytest.mark.skipif(not CRYPTOGRAPHY_AVAILABLE, reason="cryptography not installed")
+    def test_encrypted_store(self, tmp_path):
+        """Test encrypted stores round-trip and reject the wrong key"""
+        path = tmp_path / "sessions.json"
+        store = SessionStore(path, key=generate_store_key())
+        store.put(create_identity_session("a@example.com"))
+        
+        assert b"a@example.com" not in path.read_bytes()
+        with pytest.raises(SessionStoreError):
+            SessionStore(path, key=generate_store_key()).sessions()
+    
+    @pytest.mark.skipif(CRYPTOGRAPHY_AVAILABLE, reason="cryptography installed")
+    def test_key_requires_cryptography(self, tmp_path):
+        """Test configuring a key without cryptography fails loudly"""
+        with pytest.raises(SessionStoreError, match="requires cryptography"):
+            SessionStore(tmp_path / "sessions.json", key="not-a-real-key")
 
 
 class TestAnalysisSessionExtraction:
@@ -303,6 +770,39 @@ class TestJWTProcessing:
         token = auth_manager._process_jwt_cookie(cookie)
         assert token is None
     
+    def test_jwt_decoded_once_per_distinct_token(self, synthetic_data):
+        """Test repeated JWT cookies are deduped before decoding and memoized across calls"""
+        auth_manager = GongAuthenticationManager()
+        cookies = synthetic_data.jwt_cookies(0, issued_at=int(datetime.now().timestamp()))
+        entries = [{'request': {'cookies': cookies}, 'response': {'cookies': cookies}} for _ in range(50)]
+        payloads = {cookie['value']: {'payload': {'gp': 'Okta', 'exp': int(datetime.now().timestamp()) + 3600,
+                                                  'iat': int(datetime.now().timestamp()), 'jti': cookie['name'],
+                                                  'gu': 'test@example.com', 'cell': 'us-14496'}}
+                    for cookie in cookies}
+        
+        with patch.object(auth_manager.jwt_decoder, 'decode', side_effect=payloads.get) as mock_decode:
+            first = auth_manager._scan_har_stream(entries, early_exit=False).tokens
+            second = auth_manager._scan_har_stream(entries, early_exit=False).tokens
+        
+        assert mock_decode.call_count == 2
+        assert len(first) == len(second) == 2
+        assert auth_manager.jwt_cache.hits == 2
+    
+    def test_jwt_decode_cache_is_bounded(self):
+        """Test the decode LRU evicts the least recently used token"""
+        cache = JWTDecodeCache(maxsize=2)
+        decoder = Mock(side_effect=lambda token: {'payload': {'jti': token}})
+        
+        cache.decode('a', decoder)
+        cache.decode('b', decoder)
+        cache.decode('a', decoder)
+        cache.decode('c', decoder)
+        cache.decode('a', decoder)
+        cache.decode('b', decoder)
+        
+        assert len(cache) == 2
+        assert [call.args[0] for call in decoder.call_args_list] == ['a', 'b', 'c', 'b']
+    
     def test_process_jwt_artifact_valid(self):
         """Test processing valid JWT artifact"""
         auth_manager = GongAuthenticationManager()
@@ -327,6 +827,45 @@ class TestJWTProcessing:
         assert token is not None
         assert token.token_type == 'last_login_jwt'
         assert token.user_email == 'test@example.com'
+    
+    def test_cookie_classifier(self):
+        """Test cookie names and artifact types are classified like the name lists describe"""
+        auth_manager = GongAuthenticationManager()
+        classifier = CookieClassifier(auth_manager.jwt_cookie_names, auth_manager.session_cookie_names)
+        
+        assert classifier.classify('cell_jwt') == JWT_COOKIE
+        assert classifier.classify('g-session') == SESSION_COOKIE
+        assert classifier.classify('AWSALBCORS') == SESSION_COOKIE
+        assert classifier.classify('cell_jwt_legacy') is None
+        assert classifier.classify('_ga') is None
+        assert classifier.classify_artifact('cookie_last_login_jwt') == JWT_COOKIE
+        assert classifier.classify_artifact('cookie_aws_albtg') == SESSION_COOKIE
+        assert classifier.classify_artifact('local_storage_token') is None
+    
+    def test_analysis_artifacts_scanned_once(self):
+        """Test analysis artifacts yield deduplicated tokens and session cookies in one pass"""
+        now = int(datetime.now().timestamp())
+        jwt_artifact = {
+            'type': 'cookie_cell_jwt',
+            'name': 'cell_jwt',
+            'value': 'eyJhbGciOiJIUzI1NiJ9.cell.signature',
+            'decoded_value': {'payload': {'gp': 'Okta', 'exp': now + 3600, 'iat': now, 'jti': 'cell',
+                                          'gu': 'test@example.com', 'cell': 'us-14496'}}
+        }
+        artifacts = [jwt_artifact, dict(jwt_artifact),
+                     {'type': 'cookie_aws_alb', 'value': 'alb'},
+                     {'type': 'cookie_gong_session', 'name': 'g-session', 'value': 'session'},
+                     {'type': 'local_storage', 'name': 'cell_jwt', 'value': 'ignored'}]
+        auth_manager = GongAuthenticationManager()
+        
+        with patch.object(auth_manager, '_process_jwt_artifact',
+                          wraps=auth_manager._process_jwt_artifact) as mock_process:
+            session = auth_manager.extract_session_from_analysis_data({'artifacts': artifacts})
+        
+        assert mock_process.call_count == 1
+        assert len(session.authentication_tokens) == 1
+        assert session.session_cookies == {'aws_alb': 'alb', 'g-session': 'session'}
+        assert session.session_id.startswith('gong_artifacts_')
 
 
 class TestSessionValidation:
@@ -0,0 +1,238 @@
+"""
+Module: test_benchmarks
+Type: Test
+
+Purpose:
+Unit tests for the synthetic data generator, offline benchmark backends, scenario runner
+and baseline comparison.
+
+Data Flow:
+- Input: Synthetic and recorded backends, mock API clients
+- Processing: Benchmark measurement
+- Output: Test assertions
+
+Critical Because:
+Regression detection is only trustworthy if backends and measurements are repeatable.
+
+Dependencies:
+- Requires: pytest, json, tempfile, unittest.mock, benchmarks
+- Used By: app_backend.ingestion.orchestrator, app_backend.api_bridge.server
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import json
+import pytest
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import Mock
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks import (
+    BenchmarkBackend,
+    BenchmarkScenario,
+    BenchmarkSuite,
+    RecordedBackend,
+    SyntheticBackend,
+    SyntheticGongData,
+    compare_to_baseline,
+    measure
+)
+from benchmarks.suite import summarize_durations
+
+BASE_URL = 'https://us-00000.app.gong.io'
+
+
+class TestBackends:
+    """Test offline HTTP backends"""
+
+    def test_backend_requires_respond(self):
+        """Test the base backend is abstract"""
+        with pytest.raises(TypeError):
+            BenchmarkBackend()
+
+    def test_synthetic_calls_pagination(self):
+        """Test my-calls pages are windowed by limit and offset"""
+        backend = SyntheticBackend(calls=25)
+
+        response = backend.request('GET', f'{BASE_URL}/ajax/home/calls/my-calls', params={'limit': 10, 'offset': 20})
+
+        assert response.status_code == 200
+        assert [call['id'] for call in response.json()['calls']] == [f'call_{i}' for i in range(20, 25)]
+
+    def test_synthetic_post_body_and_unknown_route(self):
+        """Test JSON bodies are honoured and unknown endpoints return 404"""
+        backend = SyntheticBackend(deals=3)
+
+        deals = backend.request('POST', f'{BASE_URL}/dealswebapi/ajax/deals/get-board-deals',
+                                json={'limit': 50, 'offset': 0}).json()['deals']
+        missing = backend.request('GET', f'{BASE_URL}/nope')
+
+        assert len(deals) == 3
+        assert missing.status_code == 404
+
+    def test_rate_limit_injection_is_seeded(self):
+        """Test the same seed throttles the same requests"""
+        def throttled(seed):
+            backend = SyntheticBackend(rate_limit_rate=0.3, seed=seed)
+            return [backend.request('GET', f'{BASE_URL}/ajax/stats/get-users').status_code for _ in range(50)]
+
+        first = throttled(7)
+
+        assert first == throttled(7)
+        assert 0 < first.count(429) < 50
+
+    def test_latency_injection(self):
+        """Test injected latency delays responses"""
+        backend = SyntheticBackend(latency_seconds=0.05)
+
+        start = time.perf_counter()
+        backend.request('GET', f'{BASE_URL}/ajax/stats/get-users')
+
+        assert time.perf_counter() - start >= 0.05
+
+    def test_recorded_backend_replays_har(self):
+        """Test HAR responses are matched on method and path"""
+        har = {'log': {'entries': [
+            {'request': {'method': 'GET', 'url': f'{BASE_URL}/ajax/stats/get-users?x=1'},
+             'response': {'status': 200, 'content': {'text': '{"users": [{"id": "u1"}]}'}}},
+            {'request': {'method': 'GET', 'url': f'{BASE_URL}/static/app.js'},
+             'response': {'status': 200, 'content': {}}}
+        ]}}
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            har_path = Path(temp_dir) / 'session.har'
+            har_path.write_text(json.dumps(har))
+            backend = RecordedBackend.from_har(har_path)
+
+        assert backend.request('GET', f'{BASE_URL}/ajax/stats/get-users').json() == {'users': [{'id': 'u1'}]}
+        assert backend.request('GET', f'{BASE_URL}/static/app.js').status_code == 404
+        assert backend.request_count == 2
+
+
+class TestMeasurement:
+    """Test timing, scenarios and baseline comparison"""
+
+    def test_measure_warmup_and_repeats(self):
+        """Test warmup runs are excluded from timings"""
+        operation = Mock(return_value='done')
+
+        result = measure(operation, warmup=2, repeats=3)
+
+        assert operation.call_count == 5
+        assert result['runs'] == 3
+        assert len(result['durations']) == 3
+        assert result['last_result'] == 'done'
+        assert result['p50_seconds'] is not None
+
+    def test_summary_median_and_p50(self):
+        """Test the median averages the middle runs while p50 is nearest-rank"""
+        summary = summarize_durations([4.0, 1.0, 3.0, 2.0])
+
+        assert summary['median_seconds'] == 2.5
+        assert summary['p50_seconds'] == 2.0
+        assert summary['min_seconds'] == 1.0
+
+    def test_run_scenario(self):
+        """Test a scenario runs its object mix and reports counters"""
+        agent = Mock()
+        agent.extract_calls.side_effect = lambda limit: [{'id': i} for i in range(min(limit, 30))]
+        agent.extract_users.return_value = [{'id': 'u1'}]
+        agent.extract_deals.side_effect = Exception("boom")
+        suite = BenchmarkSuite(agent_factory=lambda backend, scenario: agent, warmup=1, repeats=2)
+        scenario = BenchmarkScenario('mix', object_types=['calls', 'users', 'deals'], limit=100, page_size=10)
+
+        results = suite.run([scenario])
+        result = results['scenarios']['mix']
+
+        assert result['runs'] == 2
+        assert result['items'] == 31
+        agent.extract_calls.assert_called_with(limit=100)
+        agent.extract_deals.assert_called_with(limit=100)
+        assert result['object_types_succeeded'] == 2
+        assert result['errors'] == ['deals: boom']
+        assert result['scenario']['page_size'] == 10
+        json.dumps(results)
+
+    def test_compare_to_baseline(self):
+        """Test only slowdowns beyond tolerance are flagged"""
+        baseline = {'scenarios': {'smoke': {'p50_seconds': 1.0}, 'calls': {'p50_seconds': 2.0}}}
+        results = {'scenarios': {'smoke': {'p50_seconds': 1.05}, 'calls': {'p50_seconds': 3.0},
+                                 'new': {'p50_seconds': 9.0}}}
+
+        regressions = compare_to_baseline(results, baseline, tolerance=0.10)
+
+        assert [regression['scenario'] for regression in regressions] == ['calls']
+        assert regressions[0]['change'] == 0.5
+
+
+class TestSyntheticGongData:
+    """Test the seeded synthetic data generator"""
+
+    def test_deterministic_for_seed(self):
+        """Test the same seed produces identical payloads"""
+        first = SyntheticGongData(seed=3, calls=100)
+        second = SyntheticGongData(seed=3, calls=100)
+
+        assert first.calls_page(limit=20, offset=40) == second.calls_page(limit=20, offset=40)
+        assert first.transcript('call_5', segments=50) == second.transcript('call_5', segments=50)
+        assert first.call(5) != SyntheticGongData(seed=4).call(5)
+
+    def test_random_access_matches_iteration(self):
+        """Test a page can be generated without generating earlier records"""
+        data = SyntheticGongData(seed=1, calls=1000000)
+
+        page = data.calls_page(limit=5, offset=999998)
+
+        assert [call['id'] for call in page['calls']] == ['call_999998', 'call_999999']
+        assert page['hasMore'] is False
+        assert page['calls'][0] == next(data.iter_calls(start=999998))
+
+    def test_payloads_match_models(self):
+        """Test generated calls and deals validate against the data models"""
+        from data_models.models import DealStageEnum, GongUser
+        from storage.records import get_field
+
+        data = SyntheticGongData(seed=2, deals=50)
+
+        deal = data.deals_page(limit=1)['deals'][0]
+        call = data.call(0)
+
+        assert DealStageEnum(deal['stage'])
+        assert GongUser(email=data.user(0)['email'])
+        assert get_field(call, 'call_id') == 'call_0'
+        assert any(participant['isHost'] for participant in call['participants'])
+
+    def test_transcript_scale(self):
+        """Test detailed transcripts with thousands of ordered segments"""
+        transcript = SyntheticGongData(transcript_segments=5000).transcript('call_7')
+        segments = transcript['segments']
+
+        assert len(segments) == 5000
+        assert all(a['end'] <= b['start'] for a, b in zip(segments, segments[1:]))
+
+    def test_har_with_jwt_cookies(self):
+        """Test HAR captures carry decodable JWT cookies and support gzip"""
+        import base64
+        import gzip
+
+        data = SyntheticGongData(seed=5, cell_id='us-12345')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            har_path = data.write_har(Path(temp_dir) / 'session.har.gz', entries=20, expires_in=600)
+            with gzip.open(har_path, 'rt') as f:
+                har = json.load(f)
+
+        cookies = {cookie['name']: cookie['value']
+                   for entry in har['log']['entries'] for cookie in entry['request']['cookies']}
+        payload_segment = cookies['last_login_jwt'].split('.')[1]
+        payload = json.loads(base64.urlsafe_b64decode(payload_segment + '=' * (-len(payload_segment) % 4)))
+
+        assert len(har['log']['entries']) == 20
+        assert {'last_login_jwt', 'cell_jwt', 'g-session'} <= set(cookies)
+        assert payload['cell'] == 'us-12345'
+        assert payload['exp'] - payload['iat'] == 600
@@ -39,6 +39,27 @@ from data_models import (
 )
 
 
+def create_token(token_type: str, expires_at: datetime) -> GongAuthenticationToken:
+    """Token expiring at expires_at"""
+    issued_at = expires_at - timedelta(days=30)
+    payload = GongJWTPayload(
+        exp=int(expires_at.timestamp()),
+        iat=int(issued_at.timestamp()),
+        jti=token_type,
+        gu="test@example.com",
+        cell="us-14496"
+    )
+    return GongAuthenticationToken(
+        token_type=token_type,
+        raw_token="eyJhbGciOiJIUzI1NiJ9...",
+        payload=payload,
+        expires_at=expires_at,
+        issued_at=issued_at,
+        cell_id="us-14496",
+        user_email="test@example.com"
+    )
+
+
 class TestGongJWTPayload:
     """Test GongJWTPayload model"""
     
@@ -137,6 +158,73 @@ class TestGongSession:
                 authentication_tokens=[],
                 session_cookies={}
             )
+    
+    def test_expiry_bounds(self):
+        """Test earliest/latest expiry and validity checks"""
+        now = datetime.now()
+        session = GongSession(
+            session_id="test_session",
+            user_email="test@example.com",
+            cell_id="us-14496",
+            authentication_tokens=[
+                create_token("last_login_jwt", now + timedelta(hours=2)),
+                create_token("cell_jwt", now - timedelta(hours=1)),
+                create_token("session_jwt", now + timedelta(hours=1))
+            ],
+            session_cookies={}
+        )
+        
+        assert abs(session.earliest_expiry - (now - timedelta(hours=1))) < timedelta(seconds=1)
+        assert abs(session.latest_expiry - (now + timedelta(hours=2))) < timedelta(seconds=1)
+        assert session.has_valid_token()
+        assert session.expired_token_count() == 1
+        assert session.expired_token_count(now + timedelta(minutes=90)) == 2
+        assert not session.has_valid_token(now + timedelta(hours=3))
+    
+    def test_expiry_bounds_follow_token_changes(self):
+        """Test bounds track appended tokens and refresh after in-place edits"""
+        now = datetime.now()
+        session = GongSession(
+            session_id="test_session",
+            user_email="test@example.com",
+            cell_id="us-14496",
+            authentication_tokens=[],
+            session_cookies={}
+        )
+        assert session.earliest_expiry is None
+        assert not session.has_valid_token()
+        
+        token = create_token("last_login_jwt", now - timedelta(hours=1))
+        session.authentication_tokens.append(token)
+        assert session.expired_token_count() == 1
+        assert not session.has_valid_token()
+        
+        token.expires_at = now + timedelta(hours=1)
+        session.refresh_expiry_bounds()
+        assert session.expired_token_count() == 0
+        assert session.has_valid_token()
+        assert not token.is_expired
+    
+    def test_expiry_bounds_follow_in_place_mutation(self):
+        """Test bounds stay correct when tokens are replaced or edited without a refresh call"""
+        now = datetime.now()
+        session = GongSession(
+            session_id="test_session",
+            user_email="test@example.com",
+            cell_id="us-14496",
+            authentication_tokens=[create_token("cell_jwt", now + timedelta(hours=1))],
+            session_cookies={}
+        )
+        assert session.has_valid_token()
+        
+        session.authentication_tokens[0] = create_token("cell_jwt", now - timedelta(hours=1))
+        assert not session.has_valid_token()
+        assert session.expired_token_count() == 1
+        
+        session.authentication_tokens[0].expires_at = now + timedelta(hours=2)
+        assert session.has_valid_token()
+        assert session.expired_token_count() == 0
+        assert abs((session.latest_expiry - (now + timedelta(hours=2))).total_seconds()) < 1
 
 
 class TestGongUser:
@@ -0,0 +1,639 @@
+"""
+Module: test_extraction
+Type: Test
+
+Purpose:
+Unit tests for the bulk extraction helpers (pipelines, scheduling, statistics).
+
+Data Flow:
+- Input: Mock API clients
+- Processing: Data extraction
+- Output: Test assertions
+
+Critical Because:
+Bulk extraction must stay correct while running requests concurrently.
+
+Dependencies:
+- Requires: pytest, unittest.mock, extraction
+- Used By: app_backend.ingestion.orchestrator, app_backend.api_bridge.server
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import pytest
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import Mock
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from extraction import Deadline, ExtractionPipeline, ExtractionPipelineError, ExtractionStatsTracker
+from extraction import ShardedBackfill, account_shards, date_window_shards, offset_shards
+from extraction import StatsCache, StatsFanout, StatsRequest, plan_stats_requests
+
+
+def create_mock_client(total_calls=25):
+    """Create a mock API client serving paginated calls"""
+    client = Mock()
+
+    def get_my_calls(limit=50, offset=0):
+        return [{'id': f'call_{i}'} for i in range(offset, min(offset + limit, total_calls))]
+
+    client.get_my_calls.side_effect = get_my_calls
+    client.get_call_details.side_effect = lambda call_id: {'id': call_id, 'title': f'Title {call_id}'}
+    client.get_call_transcript.side_effect = lambda call_id: {'segments': [{'text': call_id}]}
+    return client
+
+
+class TestExtractionPipeline:
+    """Test calls → details → transcripts pipeline"""
+
+    def test_hydrates_all_calls(self):
+        """Test every call gets details and transcript"""
+        client = create_mock_client(total_calls=25)
+
+        result = ExtractionPipeline(client, max_calls=None, page_size=10).run()
+
+        assert len(result['calls']) == 25
+        assert {item['call']['id'] for item in result['calls']} == {f'call_{i}' for i in range(25)}
+        assert all(item['details']['title'] == f"Title {item['call']['id']}" for item in result['calls'])
+        assert all(item['transcript']['segments'] for item in result['calls'])
+        assert result['stats']['pages_fetched'] == 3
+        assert result['stats']['pagination_complete'] is True
+        assert result['errors'] == []
+
+    def test_respects_max_calls(self):
+        """Test pagination stops at max_calls"""
+        client = create_mock_client(total_calls=100)
+
+        result = ExtractionPipeline(client, max_calls=15, page_size=10).run()
+
+        assert len(result['calls']) == 15
+        client.get_my_calls.assert_any_call(limit=5, offset=10)
+
+    def test_downstream_starts_before_pagination_finishes(self):
+        """Test detail fetches overlap with later page fetches"""
+        client = create_mock_client(total_calls=30)
+        events = []
+        lock = threading.Lock()
+        get_page = client.get_my_calls.side_effect
+
+        def slow_page(limit=50, offset=0):
+            with lock:
+                events.append(('page', offset))
+            time.sleep(0.05)
+            return get_page(limit=limit, offset=offset)
+
+        def details(call_id):
+            with lock:
+                events.append(('details', call_id))
+            return {}
+
+        client.get_my_calls.side_effect = slow_page
+        client.get_call_details.side_effect = details
+
+        ExtractionPipeline(client, max_calls=None, page_size=10, include_transcripts=False).run()
+
+        first_detail = events.index(('details', 'call_0'))
+        last_page = events.index(('page', 30))
+        assert first_detail < last_page
+
+    def test_item_failures_recorded(self):
+        """Test a failing detail fetch doesn't stop the pipeline"""
+        client = create_mock_client(total_calls=5)
+
+        def details(call_id):
+            if call_id == 'call_2':
+                raise Exception("boom")
+            return {}
+
+        client.get_call_details.side_effect = details
+
+        result = ExtractionPipeline(client, max_calls=None, page_size=10).run()
+
+        assert len(result['calls']) == 5
+        assert len(result['errors']) == 1
+        assert 'call_2' in result['errors'][0]
+
+    def test_first_page_failure_raises(self):
+        """Test failing to fetch any calls raises"""
+        client = create_mock_client()
+        client.get_my_calls.side_effect = Exception("Authentication failed - session may be expired")
+
+        with pytest.raises(ExtractionPipelineError, match="Authentication failed"):
+            ExtractionPipeline(client).run()
+
+    def test_sink_receives_calls_and_transcripts(self):
+        """Test hydrated calls are written to the sink in batches"""
+        client = create_mock_client(total_calls=12)
+        sink = Mock()
+
+        ExtractionPipeline(client, max_calls=None, page_size=5, sink=sink, sink_batch_size=5).run()
+
+        written_calls = [record for call in sink.write.call_args_list
+                         if call.args[0] == 'calls' for record in call.args[1]]
+        written_transcripts = [record for call in sink.write.call_args_list
+                               if call.args[0] == 'transcripts' for record in call.args[1]]
+        assert len(written_calls) == 12
+        assert len(written_transcripts) == 12
+        assert all('details' in record for record in written_calls)
+        assert all(record['call_id'].startswith('call_') for record in written_transcripts)
+
+    def test_stop_early(self):
+        """Test stopping iteration winds the stages down"""
+        client = create_mock_client(total_calls=1000)
+        pipeline = ExtractionPipeline(client, max_calls=None, page_size=10, queue_size=5)
+
+        stream = pipeline.stream()
+        next(stream)
+        stream.close()
+
+        assert pipeline.stop_event.is_set()
+
+    def test_deadline_returns_partial_results(self):
+        """Test the pipeline stops at its deadline and reports a partial result"""
+        client = create_mock_client(total_calls=1000)
+        get_page = client.get_my_calls.side_effect
+
+        def slow_page(limit=50, offset=0):
+            time.sleep(0.05)
+            return get_page(limit=limit, offset=offset)
+
+        client.get_my_calls.side_effect = slow_page
+
+        start = time.time()
+        result = ExtractionPipeline(client, max_calls=None, page_size=10, deadline=Deadline(0.3)).run()
+
+        assert time.time() - start < 1.5
+        assert result['status'] == 'partial'
+        assert result['stats']['deadline_expired'] is True
+        assert 0 < len(result['calls']) < 1000
+        client.set_request_deadline.assert_called()
+
+    def test_memory_budget_spills_calls(self):
+        """Test hydrated calls past the memory budget are returned as a lazy view"""
+        from storage import SpilledRecords
+
+        client = create_mock_client(total_calls=30)
+
+        result = ExtractionPipeline(client, max_calls=None, page_size=10, memory_budget_records=10).run()
+
+        assert isinstance(result['calls'], SpilledRecords)
+        assert len(result['calls']) == 30
+        assert {item['call']['id'] for item in result['calls']} == {f'call_{i}' for i in range(30)}
+        assert result['stats']['spilled'] is True
+
+    def test_complete_status_without_deadline(self):
+        """Test a fully drained pipeline reports complete"""
+        result = ExtractionPipeline(create_mock_client(total_calls=5), max_calls=None).run()
+
+        assert result['status'] == 'complete'
+        assert result['stats']['deadline_expired'] is False
+
+
+class TestDeadline:
+    """Test extraction time budgets"""
+
+    def test_remaining_and_expiry(self):
+        """Test remaining time counts down to zero"""
+        deadline = Deadline(0.05)
+
+        assert 0 < deadline.remaining() <= 0.05
+        assert deadline.expired() is False
+        time.sleep(0.06)
+        assert deadline.remaining() == 0.0
+        assert deadline.expired() is True
+
+    def test_from_options_earliest_wins(self):
+        """Test the earlier of an absolute deadline and a budget applies"""
+        deadline = Deadline.from_options(deadline=time.time() + 60, time_budget_seconds=5)
+
+        assert 4 < deadline.remaining() <= 5
+        assert Deadline.from_options() is None
+
+    def test_clamp(self):
+        """Test timeouts are clamped to the remaining budget"""
+        deadline = Deadline(2)
+
+        assert deadline.clamp(30) <= 2
+        assert deadline.clamp(0.5) == 0.5
+
+
+class TestExtractionStatsTracker:
+    """Test per-object-type extraction statistics"""
+
+    def test_counters_and_percentiles(self):
+        """Test counts, items, bytes and nearest-rank percentiles"""
+        tracker = ExtractionStatsTracker(window_size=100)
+        for i in range(1, 101):
+            tracker.record('calls', duration=i / 100, items=10, bytes_received=1000)
+        tracker.record('deals', duration=2.0, error=True)
+
+        summary = tracker.summary()
+
+        assert summary['calls']['count'] == 100
+        assert summary['calls']['items'] == 1000
+        assert summary['calls']['bytes'] == 100000
+        assert summary['calls']['p50_seconds'] == 0.5
+        assert summary['calls']['p90_seconds'] == 0.9
+        assert summary['calls']['p99_seconds'] == 0.99
+        assert summary['deals']['errors'] == 1
+
+    def test_sliding_window(self):
+        """Test percentiles only cover the most recent durations"""
+        tracker = ExtractionStatsTracker(window_size=5)
+        for _ in range(20):
+            tracker.record('users', duration=0.1)
+        for _ in range(5):
+            tracker.record('users', duration=3.0)
+
+        summary = tracker.summary()['users']
+
+        assert summary['count'] == 25
+        assert summary['window'] == 5
+        assert summary['p50_seconds'] == 3.0
+        assert tracker.percentile('users', 50) == 3.0
+        assert tracker.percentile('library', 50) is None
+
+
+class _NoopRateLimiter:
+    """Picklable stand-in for the shared cell limiter"""
+
+    def wait(self):
+        pass
+
+
+class _BackfillClient:
+    """Picklable client created in each backfill worker process"""
+
+    def __init__(self, session):
+        self.session = session
+        self.rate_limiter = None
+
+    def set_rate_limiter(self, rate_limiter):
+        self.rate_limiter = rate_limiter
+
+    def get_my_calls(self, limit, offset):
+        assert self.rate_limiter is not None
+        return [{'id': f'call_{i}'} for i in range(offset, min(offset + limit, 250))]
+
+    def get_conversations(self, filters, limit):
+        if filters['fromDate'] == '2025-01-08':
+            raise RuntimeError("search failed")
+        return [{'id': f"conv_{filters['fromDate']}"}]
+
+    def get_account_details(self, account_id):
+        return {'accountId': account_id, 'name': account_id.upper()}
+
+    def get_account_people(self, account_id):
+        return [{'email': f'buyer@{account_id}.com'}]
+
+    def get_account_opportunities(self, account_id):
+        return []
+
+
+class _DenseConversationClient(_BackfillClient):
+    """Client whose conversation search caps each window at the page size"""
+
+    def get_conversations(self, filters, limit):
+        start = date.fromisoformat(filters['fromDate'])
+        days = (date.fromisoformat(filters['toDate']) - start).days
+        # 3 conversations a day, except 10 on 2025-01-03
+        conversations = [{'id': f"conv_{start + timedelta(days=day)}_{i}"}
+                         for day in range(days)
+                         for i in range(10 if start + timedelta(days=day) == date(2025, 1, 3) else 3)]
+        return conversations[:limit]
+
+
+class TestShardedBackfill:
+    """Test the multi-process sharded backfill"""
+
+    def test_shard_planning(self):
+        """Test offset ranges and date windows cover the requested span"""
+        from datetime import date
+
+        calls = offset_shards('calls', total=250, shard_size=100)
+        windows = date_window_shards(date(2025, 1, 1), date(2025, 1, 20), window_days=7)
+
+        assert [(shard.start, shard.end) for shard in calls] == [(0, 100), (100, 200), (200, 250)]
+        assert [shard.filters for shard in windows][-1] == {'fromDate': '2025-01-15', 'toDate': '2025-01-20'}
+        assert len(windows) == 3
+        with pytest.raises(ValueError):
+            offset_shards('users', total=10, shard_size=5)
+
+    def test_shards_merged_across_processes(self):
+        """Test shard results from worker processes are merged and failures isolated"""
+        from datetime import date
+
+        shards = (offset_shards('calls', total=300, shard_size=100)
+                  + date_window_shards(date(2025, 1, 1), date(2025, 1, 15), window_days=7)
+                  + account_shards(['acme']))
+        sink = Mock()
+        backfill = ShardedBackfill(Mock(cell_id='us-12345'), shards, workers=2, sink=sink, page_size=40,
+                                   client_factory=_BackfillClient, rate_limiter=_NoopRateLimiter())
+
+        result = backfill.run()
+        metadata = result['metadata']
+        written = {}
+        for call in sink.write.call_args_list:
+            written.setdefault(call.args[0], []).extend(call.args[1])
+
+        assert metadata['successful_shards'] == 5
+        assert metadata['failed_shards'] == 1
+        assert 'search failed' in metadata['errors'][0]
+        assert sorted(record['id'] for record in written['calls']) == sorted(f'call_{i}' for i in range(250))
+        assert written['accounts'][0]['people'] == [{'email': 'buyer@acme.com'}]
+        assert metadata['records_by_type'] == {'calls': 250, 'conversations': 1, 'accounts': 1}
+        assert 'data' not in result
+
+    def test_conversation_windows_split_until_exhausted(self):
+        """Test full conversation pages are split by date and one-day overflow marked truncated"""
+        shards = (date_window_shards(date(2025, 1, 1), date(2025, 1, 3), window_days=2)
+                  + date_window_shards(date(2025, 1, 3), date(2025, 1, 8), window_days=5))
+        backfill = ShardedBackfill(Mock(cell_id='us-12345'), shards, workers=1, page_size=5,
+                                   client_factory=_DenseConversationClient, rate_limiter=_NoopRateLimiter())
+
+        result = backfill.run()
+        ids = [record['id'] for record in result['data']['conversations']]
+
+        assert len(ids) == len(set(ids)) == 6 + 5 + 4 * 3
+        assert sum(record_id.startswith('conv_2025-01-07') for record_id in ids) == 3
+        assert result['metadata']['truncated_shards'] == ['conversations[2025-01-03..2025-01-08]']
+        assert result['metadata']['successful_shards'] == 2
+
+    def test_without_sink_returns_data(self):
+        """Test records are returned when no sink is given"""
+        backfill = ShardedBackfill(Mock(cell_id='us-12345'), offset_shards('calls', 50, 25), workers=1,
+                                   client_factory=_BackfillClient, rate_limiter=_NoopRateLimiter())
+
+        result = backfill.run()
+
+        assert len(result['data']['calls']) == 50
+
+
+class _ThreadContextClient:
+    """Stats client with per-thread deadline and byte counter, like GongAPIClient"""
+
+    def __init__(self):
+        self._context = threading.local()
+        self.deadlines_seen = []
+
+    def set_request_deadline(self, deadline):
+        self._context.deadline = deadline
+
+    def get_request_deadline(self):
+        return getattr(self._context, 'deadline', None)
+
+    def get_bytes_received(self):
+        return getattr(self._context, 'bytes_received', 0)
+
+    def add_bytes_received(self, count):
+        self._context.bytes_received = self.get_bytes_received() + count
+
+    def get_team_stats(self, metric, period):
+        self.deadlines_seen.append(self.get_request_deadline())
+        self.add_bytes_received(100)
+        return {'value': 1}
+
+
+class TestStatsFanout:
+    """Test concurrent stats fan-out and its TTL cache"""
+
+    def test_requests_run_concurrently(self):
+        """Test metric requests overlap instead of running one by one"""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def get_team_stats(metric, period):
+            with lock:
+                active.append(metric)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(metric)
+            return {'value': 1}
+
+        client = Mock()
+        client.get_team_stats.side_effect = get_team_stats
+        requests = plan_stats_requests(periods=['week', 'month', 'quarter'])
+
+        records = StatsFanout(client, max_workers=8).records(requests)
+
+        assert len(records) == 12
+        assert 'avgWeeklyDuration' not in {record['metric'] for record in records}
+        assert max(peak) > 1
+        assert {record['period'] for record in records} == {'week', 'month', 'quarter'}
+
+    def test_endpoint_kinds_and_record_shape(self):
+        """Test user stats, topics and trackers share the fan-out with unique metric keys"""
+        client = Mock()
+        client.get_team_stats.return_value = {'value': 1}
+        client.get_user_stats.return_value = {'users': []}
+        client.get_topic_models.return_value = {'topics': []}
+        client.get_trackers.return_value = {'trackers': []}
+        client.get_user_trackers.return_value = {'users': []}
+        requests = plan_stats_requests(metrics=['avgWeeklyDuration'], include_user_stats=True,
+                                       include_topics=True, include_trackers=True)
+
+        records = StatsFanout(client).records(requests)
+
+        assert [(record['metric'], record['unit'], record['scope']) for record in records] == [
+            ('avgWeeklyDuration', 'seconds', 'team'),
+            ('users.avgWeeklyDuration', 'seconds', 'user'),
+            ('topicModels', None, 'team'),
+            ('trackers.all', None, 'team'),
+            ('trackers.users', None, 'user')
+        ]
+        client.get_user_stats.assert_called_once_with('avgWeeklyDuration', None, period='week')
+
+    def test_workers_use_caller_deadline(self):
+        """Test worker threads run under the calling thread's request deadline"""
+        client = _ThreadContextClient()
+        deadline = Deadline(60)
+        client.set_request_deadline(deadline)
+
+        StatsFanout(client, max_workers=4).fetch(plan_stats_requests())
+
+        assert len(client.deadlines_seen) == 4
+        assert all(seen is deadline for seen in client.deadlines_seen)
+
+    def test_worker_bytes_credited_to_caller(self):
+        """Test bytes received on worker threads count toward the calling thread"""
+        client = _ThreadContextClient()
+        client.add_bytes_received(10)
+
+        StatsFanout(client, max_workers=4).fetch(plan_stats_requests())
+
+        assert client.get_bytes_received() == 410
+
+    def test_cache_ttl(self, monkeypatch):
+        """Test cached responses are reused until the TTL passes"""
+        now = [1000.0]
+        monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+        client = Mock()
+        client.get_team_stats.return_value = {'value': 1}
+        fanout = StatsFanout(client, cache=StatsCache(ttl_seconds=60))
+        request = StatsRequest('team', 'totalCalls', 'week')
+
+        fanout.fetch([request])
+        fanout.fetch([request])
+        now[0] += 61
+        fanout.fetch([request])
+
+        assert client.get_team_stats.call_count == 2
+        assert fanout.cache.hits == 1
+
+    def test_failed_requests_skipped(self):
+        """Test one failing metric doesn't fail the others and isn't cached"""
+        def get_team_stats(metric, period):
+            if metric == 'totalCalls':
+                raise RuntimeError("boom")
+            return {'value': 1}
+
+        client = Mock()
+        client.get_team_stats.side_effect = get_team_stats
+        fanout = StatsFanout(client)
+
+        records = fanout.records(plan_stats_requests(metrics=['totalCalls', 'totalDuration']))
+
+        assert [record['metric'] for record in records] == ['totalDuration']
+        assert len(fanout.cache) == 1
+
+
+class TestUserStatsMatrix:
+    """Test the bulk users × metrics stats matrix"""
+
+    def test_one_request_per_metric(self):
+        """Test the matrix is filled from per-metric all-user responses"""
+        from extraction import build_user_stats_matrix
+
+        client = Mock()
+        client.get_users.return_value = [{'id': 'u1'}, {'id': 'u2'}, {'id': 'u3'}]
+        client.get_user_stats.side_effect = lambda metric, user_id, period: {'users': [
+            {'userId': 'u1', 'value': 10 if metric == 'totalCalls' else 600},
+            {'userId': 'u2', 'value': 20 if metric == 'totalCalls' else 'n/a'},
+            {'userId': 'outsider', 'value': 99}
+        ]}
+
+        matrix = build_user_stats_matrix(client, metrics=['totalCalls', 'avgCallDuration'], period='month')
+
+        assert client.get_user_stats.call_count == 2
+        assert matrix.shape == (3, 2)
+        assert matrix.get('u2', 'totalCalls') == 20.0
+        assert list(matrix.column('totalCalls'))[:2] == [10.0, 20.0]
+        assert matrix.column_summary('avgCallDuration') == {'count': 1, 'mean': 600.0, 'min': 600.0, 'max': 600.0}
+        assert matrix.to_records()[2] == {'user_id': 'u3', 'totalCalls': None, 'avgCallDuration': None}
+
+    def test_array_backed(self):
+        """Test values live in a flat float array"""
+        from array import array
+        from extraction import UserStatsMatrix
+
+        matrix = UserStatsMatrix(['u1', 'u2'], ['a', 'b', 'c'])
+        matrix.set('u2', 'b', 4.5)
+
+        assert isinstance(matrix.values, array)
+        assert matrix.values.itemsize * len(matrix.values) == 48
+        assert list(matrix.row('u2'))[1] == 4.5
+
+    def test_to_numpy_view(self):
+        """Test the numpy view shares the matrix buffer"""
+        np = pytest.importorskip('numpy')
+        from extraction import UserStatsMatrix
+
+        matrix = UserStatsMatrix(['u1', 'u2'], ['a', 'b'])
+        matrix.set('u1', 'a', 1.0)
+        matrix.set('u2', 'a', 3.0)
+
+        assert np.nanmean(matrix.to_numpy(), axis=0)[0] == 2.0
+
+
+class TestAccount360Crawler:
+    """Test the concurrent account 360 crawler"""
+
+    def _client(self):
+        client = Mock()
+        client.get_account_details.side_effect = lambda account_id: {'accountId': account_id}
+        client.get_account_people.side_effect = lambda account_id: [
+            {'contactId': f'{account_id}_buyer'}, {'contactId': 'shared'}, {'contactId': 'shared'}
+        ]
+        client.get_account_opportunities.return_value = [{'opportunityId': 'o1'}]
+        client.get_day_activities.return_value = []
+        client.get_contact_details.side_effect = lambda contact_id: {'id': contact_id}
+        client.get_contact_engagements.return_value = [{'type': 'email'}]
+        return client
+
+    def test_shared_contacts_fetched_once(self):
+        """Test contacts on several accounts are fetched once and attached to each"""
+        from extraction import Account360Crawler
+
+        client = self._client()
+        crawler = Account360Crawler(client, max_workers=4)
+
+        accounts = {account['account_id']: account for account in crawler.crawl(['a1', 'a2', 'a3'])}
+
+        assert set(accounts) == {'a1', 'a2', 'a3'}
+        assert client.get_contact_details.call_count == 4
+        assert sorted(contact['contact_id'] for contact in accounts['a2']['contacts']) == ['a2_buyer', 'shared']
+        assert accounts['a1']['contacts'][0]['engagements'] == [{'type': 'email'}]
+        assert accounts['a3']['opportunities'] == [{'opportunityId': 'o1'}]
+        assert crawler.stats['contacts_fetched'] == 4
+
+    def test_streams_in_completion_order(self):
+        """Test a fast account is yielded before a slow one finishes"""
+        from extraction import Account360Crawler
+
+        client = self._client()
+        release = threading.Event()
+
+        def get_account_details(account_id):
+            if account_id == 'slow':
+                release.wait(5)
+            return {'accountId': account_id}
+
+        client.get_account_details.side_effect = get_account_details
+        stream = Account360Crawler(client, max_workers=8, include_contacts=False).crawl(['slow', 'fast'])
+
+        first = next(stream)
+        release.set()
+        rest = list(stream)
+
+        assert first['account_id'] == 'fast'
+        assert [account['account_id'] for account in rest] == ['slow']
+
+    def test_part_failures_recorded(self):
+        """Test a failing endpoint is recorded without dropping the account"""
+        from extraction import Account360Crawler
+
+        client = self._client()
+        client.get_account_opportunities.side_effect = RuntimeError("boom")
+        client.get_contact_engagements.side_effect = RuntimeError("nope")
+
+        account = next(Account360Crawler(client, include_activities=False).crawl(['a1']))
+
+        assert account['errors'] == ['opportunities: boom']
+        assert account['contacts'][0]['errors'] == ['engagements: nope']
+        client.get_day_activities.assert_not_called()
+
+    def test_failed_contacts_not_cached(self):
+        """Test a contact with a failed part is fetched again by the next crawl"""
+        from extraction import Account360Crawler
+
+        client = self._client()
+        client.get_account_people.side_effect = lambda account_id: [{'contactId': 'c1'}]
+        client.get_contact_details.side_effect = [RuntimeError("401"), {'id': 'c1'}]
+        crawler = Account360Crawler(client, include_activities=False)
+
+        first = next(crawler.crawl(['a1']))
+        second = next(crawler.crawl(['a1']))
+
+        assert first['contacts'][0]['details'] is None
+        assert second['contacts'][0] == {'contact_id': 'c1', 'details': {'id': 'c1'},
+                                         'engagements': [{'type': 'email'}], 'errors': []}
+        assert client.get_contact_details.call_count == 2
+        assert 'c1' in crawler.contacts
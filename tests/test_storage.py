@@ -0,0 +1,486 @@
+"""
+Module: test_storage
+Type: Test
+
+Purpose:
+Unit tests for the storage sinks and exporters used to persist extracted Gong data.
+
+Data Flow:
+- Input: Raw record dictionaries
+- Processing: Data transformation, Persistence
+- Output: Test assertions
+
+Critical Because:
+Downstream analytics depends on extraction output being written completely and with stable schemas.
+
+Dependencies:
+- Requires: pytest, tempfile, storage
+- Used By: app_backend.ingestion.orchestrator, app_backend.api_bridge.server
+
+Author: Julia Evans
+Date: 2025-06-20
+"""
+import pytest
+import tempfile
+from datetime import datetime
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from storage.records import get_field
+
+
+class TestRecordFields:
+    """Test raw record field resolution"""
+
+    def test_get_field_prefers_model_name(self):
+        """Test model field name wins over aliases"""
+        record = {'call_id': 'a', 'id': 'b'}
+        assert get_field(record, 'call_id') == 'a'
+
+    def test_get_field_alias(self):
+        """Test alias resolution for camelCase payloads"""
+        record = {'id': 'call_1', 'startTime': '2025-06-20T10:00:00Z'}
+        assert get_field(record, 'call_id') == 'call_1'
+        assert get_field(record, 'start_time') == '2025-06-20T10:00:00Z'
+
+    def test_get_field_default(self):
+        """Test default when field is absent"""
+        assert get_field({}, 'host_email', 'none') == 'none'
+
+
+class TestColumnarExport:
+    """Test Parquet / Arrow export"""
+
+    @pytest.fixture(autouse=True)
+    def _require_pyarrow(self):
+        pytest.importorskip('pyarrow')
+
+    def test_schema_derived_from_model(self):
+        """Test schema columns and types follow GongCall"""
+        import pyarrow as pa
+        from storage import schema_for_object_type
+
+        schema = schema_for_object_type('calls')
+
+        assert schema.field('call_id').type == pa.string()
+        assert schema.field('duration_seconds').type == pa.int64()
+        assert schema.field('start_time').type == pa.timestamp('us')
+        assert schema.field('is_private').type == pa.bool_()
+        assert schema.field('participants').type == pa.string()
+        assert 'extra_fields' in schema.names
+
+    def test_team_stats_schema_has_metric_columns(self):
+        """Test team_stats schema includes extract_team_stats row fields"""
+        from storage import schema_for_object_type
+
+        schema = schema_for_object_type('team_stats')
+
+        assert 'total_calls' in schema.names
+        assert 'metric' in schema.names
+        assert 'period' in schema.names
+
+    def test_parquet_row_groups(self):
+        """Test records are written in row groups"""
+        import pyarrow.parquet as pq
+        from storage import ColumnarExporter
+
+        calls = [
+            {'id': f'call_{i}', 'title': f'Call {i}', 'duration': 60 * i,
+             'startTime': 1750413600000 + i, 'customField': i}
+            for i in range(25)
+        ]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with ColumnarExporter(Path(temp_dir), row_group_size=10) as exporter:
+                exporter.write('calls', calls[:12])
+                exporter.write('calls', calls[12:])
+
+            parquet_file = pq.ParquetFile(Path(temp_dir) / 'calls.parquet')
+            table = parquet_file.read()
+
+        assert parquet_file.num_row_groups == 3
+        assert table.num_rows == 25
+        assert table.column('call_id').to_pylist()[3] == 'call_3'
+        assert table.column('duration_seconds').to_pylist()[3] == 180
+        assert table.column('start_time').to_pylist()[0] == datetime(2025, 6, 20, 10, 0)
+        assert '"customField": 3' in table.column('extra_fields').to_pylist()[3]
+
+    def test_arrow_format(self):
+        """Test Arrow IPC output"""
+        import pyarrow as pa
+        from storage import ColumnarExporter
+
+        users = [{'id': 'user_1', 'name': 'John Doe', 'email': 'john@example.com'}]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with ColumnarExporter(Path(temp_dir), output_format='arrow') as exporter:
+                exporter.write('users', users)
+
+            with pa.OSFile(str(Path(temp_dir) / 'users.arrow'), 'rb') as source:
+                table = pa.ipc.open_file(source).read_all()
+
+        assert table.column('email').to_pylist() == ['john@example.com']
+        assert table.column('full_name').to_pylist() == ['John Doe']
+
+    def test_unsupported_object_type_ignored(self):
+        """Test object types without a schema are skipped"""
+        from storage import ColumnarExporter
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with ColumnarExporter(Path(temp_dir)) as exporter:
+                exporter.write('library', [{'id': 'folder_1'}])
+                paths = exporter.close()
+
+        assert paths == {}
+
+    def test_uncoercible_values_become_null(self):
+        """Test bad values are written as null instead of failing the file"""
+        import pyarrow.parquet as pq
+        from storage import ColumnarExporter
+
+        deals = [{'id': 'deal_1', 'name': 'Deal', 'amount': 'n/a', 'probability': 40}]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with ColumnarExporter(Path(temp_dir)) as exporter:
+                exporter.write('deals', deals)
+
+            table = pq.read_table(Path(temp_dir) / 'deals.parquet')
+
+        assert table.column('amount').to_pylist() == [None]
+        assert table.column('probability').to_pylist() == [40.0]
+
+    def test_string_flags_parsed(self):
+        """Test string booleans are parsed rather than tested for truthiness"""
+        import pyarrow.parquet as pq
+        from storage import ColumnarExporter
+
+        calls = [{'id': f'call_{i}', 'isPrivate': flag} for i, flag in enumerate(['false', 'True', '0', 'maybe'])]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with ColumnarExporter(Path(temp_dir)) as exporter:
+                exporter.write('calls', calls)
+
+            table = pq.read_table(Path(temp_dir) / 'calls.parquet')
+
+        assert table.column('is_private').to_pylist() == [False, True, False, None]
+
+
+class TestSQLiteSink:
+    """Test the SQLite warehouse sink"""
+
+    def create_sink(self):
+        """Create an in-memory sink"""
+        from storage import GongSQLiteSink
+        return GongSQLiteSink(':memory:', batch_size=2)
+
+    def test_tables_and_indexes_created(self):
+        """Test schema creation"""
+        sink = self.create_sink()
+
+        tables = {row['name'] for row in sink.query("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        indexes = {row['name'] for row in sink.query("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+        assert {'calls', 'call_participants', 'deals', 'users', 'accounts', 'transcripts', 'team_stats'} <= tables
+        assert {'idx_calls_start_time', 'idx_calls_account_id', 'idx_calls_host_email'} <= indexes
+
+    def test_calls_upsert_is_idempotent(self):
+        """Test repeated writes update rows in place"""
+        sink = self.create_sink()
+        calls = [
+            {'id': 'call_1', 'title': 'Discovery', 'startTime': '2025-06-20T10:00:00Z',
+             'participants': [{'email': 'Rep@Example.com', 'name': 'Rep', 'isHost': True}]},
+            {'id': 'call_2', 'title': 'Demo', 'accountId': 'acct_1'},
+            {'id': 'call_3', 'title': 'Negotiation'}
+        ]
+
+        sink.write('calls', calls)
+        calls[0]['title'] = 'Discovery (updated)'
+        sink.write('calls', calls)
+
+        assert sink.count('calls') == 3
+        assert sink.count('call_participants') == 1
+        row = sink.query("SELECT * FROM calls WHERE call_id = ?", ['call_1'])[0]
+        assert row['title'] == 'Discovery (updated)'
+        assert row['start_time'] == '2025-06-20T10:00:00'
+        participant = sink.query("SELECT * FROM call_participants")[0]
+        assert participant['email'] == 'rep@example.com'
+        assert participant['is_host'] == 1
+
+    def test_conversations_keep_call_columns(self):
+        """Test conversations merged into calls don't null columns they don't carry"""
+        sink = self.create_sink()
+        sink.write('calls', [{'id': 'call_1', 'title': 'Discovery', 'hostEmail': 'rep@example.com',
+                              'callType': 'video', 'opportunityId': 'opp_1',
+                              'participants': [{'email': 'rep@example.com', 'isHost': True}]}])
+
+        sink.write('conversations', [{'id': 'call_1', 'title': 'Discovery call',
+                                      'participants': [{'email': 'rep@example.com'}]}])
+
+        row = sink.query("SELECT * FROM calls WHERE call_id = ?", ['call_1'])[0]
+        assert row['title'] == 'Discovery call'
+        assert (row['host_email'], row['call_type'], row['opportunity_id']) == ('rep@example.com', 'video', 'opp_1')
+        assert '"opportunityId"' in row['raw_json']
+        assert sink.query("SELECT is_host FROM call_participants")[0]['is_host'] == 1
+
+    def test_users_keyed_by_email(self):
+        """Test users upsert on lower-cased email"""
+        sink = self.create_sink()
+
+        sink.write('users', [{'id': 'user_1', 'name': 'John Doe', 'email': 'John@Example.com'}])
+        sink.write('users', [{'id': 'user_1', 'name': 'John D.', 'email': 'john@example.com'}])
+
+        rows = sink.query("SELECT email, full_name FROM users")
+        assert rows == [{'email': 'john@example.com', 'full_name': 'John D.'}]
+
+    def test_records_without_key_skipped(self):
+        """Test records missing a natural key are counted and skipped"""
+        sink = self.create_sink()
+
+        written = sink.write('deals', [{'id': 'deal_1', 'name': 'Deal 1', 'amount': 50000}, {'name': 'No id'}])
+
+        assert written == 1
+        assert sink.skipped_records == 1
+        assert sink.query("SELECT amount FROM deals")[0]['amount'] == 50000.0
+
+    def test_team_stats_and_unsupported_types(self):
+        """Test team stats rows and ignored object types"""
+        sink = self.create_sink()
+
+        sink.write('team_stats', [{'metric': 'totalCalls', 'value': {'value': 150}, 'unit': 'count', 'period': 'week'}])
+        assert sink.write('library', [{'folders': []}]) == 0
+
+        row = sink.query("SELECT * FROM team_stats")[0]
+        assert row['metric'] == 'totalCalls'
+        assert row['value_json'] == '{"value": 150}'
+
+
+class TestSpill:
+    """Test memory-bounded record spilling"""
+
+    def test_buffer_spills_past_budget(self):
+        """Test records move to disk once the shared budget is used up"""
+        from storage import SpillStore, SpilledRecords
+
+        with SpillStore(max_records=5) as store:
+            small = store.buffer('users')
+            small.extend({'id': i} for i in range(3))
+            large = store.buffer('calls')
+            large.extend({'id': i} for i in range(10))
+
+            users = small.result()
+            calls = large.result()
+
+            assert users == [{'id': 0}, {'id': 1}, {'id': 2}]
+            assert isinstance(calls, SpilledRecords)
+            assert len(calls) == 10
+            assert [record['id'] for record in calls] == list(range(10))
+            assert list(calls) == list(calls)  # Re-iterable
+            assert store.spilled_object_types == ['calls']
+            assert store.budget.in_memory == 3
+
+    def test_admit_whole_lists(self):
+        """Test extracted lists are kept or spilled as a whole"""
+        from storage import SpillStore, SpilledRecords, materialize
+
+        with SpillStore(max_records=4) as store:
+            kept = store.admit('users', [{'id': 1}, {'id': 2}])
+            spilled = store.admit('deals', [{'id': i} for i in range(3)])
+            library = store.admit('library', {'folders': []})
+
+            assert isinstance(kept, list)
+            assert isinstance(spilled, SpilledRecords)
+            assert materialize(spilled) == [{'id': 0}, {'id': 1}, {'id': 2}]
+            assert library == {'folders': []}
+
+    def test_cleanup_removes_files(self):
+        """Test spill files are removed with the store"""
+        from storage import SpillError, SpillStore
+
+        store = SpillStore(max_records=0)
+        spilled = store.spill('calls', [{'id': 1}])
+        directory = store.directory
+        store.cleanup()
+
+        assert not directory.exists()
+        with pytest.raises(SpillError):
+            list(spilled)
+
+    def test_dump_results_json_streams_spilled(self):
+        """Test JSON output matches a plain dump of the same data"""
+        import json
+        import io
+        from storage import SpillStore
+        from storage.spill import dump_results_json
+
+        with SpillStore(max_records=0) as store:
+            results = {
+                'metadata': {'successful_objects': 2},
+                'data': {'calls': store.spill('calls', [{'id': 'c1'}, {'id': 'c2'}]),
+                         'library': {'folders': []}}
+            }
+            output = io.StringIO()
+            dump_results_json(results, output)
+
+        assert json.loads(output.getvalue()) == {
+            'metadata': {'successful_objects': 2},
+            'data': {'calls': [{'id': 'c1'}, {'id': 'c2'}], 'library': {'folders': []}}
+        }
+
+
+class TestContentHashIndex:
+    """Test content-hash dedupe of unchanged records"""
+
+    def test_unchanged_records_skipped(self):
+        """Test only new and changed records pass once hashes are committed"""
+        from storage import ContentHashIndex
+
+        with ContentHashIndex() as index:
+            first = index.filter_changed('calls', [{'id': 'c1', 'title': 'A'}, {'id': 'c2', 'title': 'B'}])
+            index.commit('calls')
+            second = index.filter_changed('calls', [{'id': 'c1', 'title': 'A'}, {'id': 'c2', 'title': 'B2'},
+                                                    {'title': 'no key'}])
+
+            assert len(first) == 2
+            assert second == [{'id': 'c2', 'title': 'B2'}, {'title': 'no key'}]
+            assert index.skipped == {'calls': 1}
+
+    def test_hash_ignores_key_order_and_ignored_fields(self):
+        """Test field order and ignored fields don't change the hash"""
+        from storage import ContentHashIndex, content_hash
+
+        assert content_hash({'a': 1, 'b': 2}) == content_hash({'b': 2, 'a': 1})
+
+        with ContentHashIndex(ignore_fields={'deals': ['fetchedAt']}) as index:
+            index.filter_changed('deals', [{'id': 'd1', 'fetchedAt': 1}])
+            index.commit()
+
+            assert index.filter_changed('deals', [{'id': 'd1', 'fetchedAt': 2}]) == []
+
+    def test_discard_reemits_records(self):
+        """Test discarded hashes leave records marked as changed"""
+        from storage import ContentHashIndex
+
+        with ContentHashIndex() as index:
+            index.filter_changed('users', [{'email': 'A@x.com'}])
+            index.discard('users')
+
+            assert index.filter_changed('users', [{'email': 'a@x.com'}]) == [{'email': 'a@x.com'}]
+
+    def test_index_persists(self):
+        """Test committed hashes survive reopening the index file"""
+        from storage import ContentHashIndex
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / 'hashes.db'
+            with ContentHashIndex(path) as index:
+                index.filter_changed('calls', [{'id': 'c1'}])
+                index.commit('calls')
+
+            with ContentHashIndex(path) as index:
+                assert index.filter_changed('calls', [{'id': 'c1'}]) == []
+                assert index.keys('calls') == {'c1'}
+
+
+class TestChangeFeed:
+    """Test change-data-capture events between extraction runs"""
+
+    def test_created_updated_deleted(self):
+        """Test a second run emits only the deltas"""
+        from storage import ChangeFeed
+
+        feed = ChangeFeed()
+        first = list(feed.changes('deals', [{'id': 'd1', 'stage': 'proposal'}, {'id': 'd2', 'stage': 'proposal'}]))
+        second = list(feed.changes('deals', [{'id': 'd1', 'stage': 'closed_won'}, {'id': 'd3', 'stage': 'proposal'}],
+                                   detect_deletes=True))
+
+        assert [event['op'] for event in first] == ['created', 'created']
+        assert [(event['op'], event['key']) for event in second] == [
+            ('updated', 'd1'), ('created', 'd3'), ('deleted', 'd2')
+        ]
+        assert feed.counts['deals'] == {'created': 1, 'updated': 1, 'deleted': 1}
+        assert feed.index.keys('deals') == {'d1', 'd3'}
+
+    def test_partial_iteration_replays(self):
+        """Test the snapshot only advances once a diff is fully consumed"""
+        from storage import ChangeFeed
+
+        feed = ChangeFeed()
+        records = [{'id': 'c1'}, {'id': 'c2'}]
+        next(feed.changes('calls', records))
+
+        assert len(list(feed.changes('calls', records))) == 2
+
+    def test_results_to_ndjson(self):
+        """Test results diffing skips unkeyed types and deletes for incomplete types"""
+        import io
+        import json
+        from storage import ChangeFeed, write_ndjson
+
+        feed = ChangeFeed()
+        list(feed.changes('users', [{'email': 'a@x.com'}, {'email': 'b@x.com'}]))
+        results = {
+            'metadata': {'extraction_id': 'run_2', 'object_status': {'users': 'failed'}},
+            'data': {'users': [{'email': 'c@x.com'}], 'library': {'folders': []}}
+        }
+
+        output = io.StringIO()
+        count = write_ndjson(feed.iter_results(results, detect_deletes=True), output)
+        events = [json.loads(line) for line in output.getvalue().splitlines()]
+
+        assert count == 1
+        assert events == [{'op': 'created', 'object_type': 'users', 'key': 'c@x.com',
+                           'record': {'email': 'c@x.com'}, 'extraction_id': 'run_2'}]
+
+
+    def test_deletes_only_for_complete_types(self):
+        """Test deletes are opt-in and limited to fully extracted object types"""
+        from storage import ChangeFeed
+
+        feed = ChangeFeed()
+        for object_type in ('calls', 'deals'):
+            list(feed.changes(object_type, [{'id': '1'}, {'id': '2'}]))
+        list(feed.changes('users', [{'email': 'a@x.com'}, {'email': 'b@x.com'}]))
+        results = {
+            'metadata': {'object_status': {'calls': 'complete', 'deals': 'partial'}},
+            'data': {'calls': [{'id': '1'}], 'deals': [{'id': '1'}], 'users': [{'email': 'a@x.com'}]}
+        }
+
+        assert list(feed.iter_results(results)) == []
+        events = list(feed.iter_results(results, detect_deletes=True))
+
+        assert [(event['op'], event['object_type'], event['key']) for event in events] == [('deleted', 'calls', '2')]
+
+
+class TestSnapshotStore:
+    """Test persisted extraction snapshots"""
+
+    def test_save_and_load(self):
+        """Test snapshots round-trip with their save time"""
+        import time
+        from storage import SnapshotStore
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SnapshotStore(temp_dir)
+            results = {'metadata': {'extraction_id': 'run_1'}, 'data': {'calls': [{'id': 'c1'}]}}
+
+            assert store.load('quick_us-1_a@x.com') is None
+            store.save('quick_us-1_a@x.com', results)
+            loaded, saved_at = store.load('quick_us-1_a@x.com')
+
+            assert loaded == results
+            assert abs(time.time() - saved_at) < 60
+            assert store.age('quick_us-1_a@x.com') < 60
+            assert [path.name for path in Path(temp_dir).iterdir()] == ['quick_us-1_a@x.com.json']
+
+    def test_unreadable_snapshot_ignored(self):
+        """Test a corrupt snapshot reads as missing"""
+        from storage import SnapshotStore
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SnapshotStore(temp_dir)
+            store.path('quick').write_text('{"metadata":')
+
+            assert store.load('quick') is None